@@ -31,32 +31,39 @@ except ImportError:
     print("❌ NumPy not installed. Install with: pip install numpy")
     sys.exit(1)
 
+from baselines import get_baseline, relative_intensity, week_start
+from event_resolution import resolve_events
+from init_database import apply_migrations
+from rollups import rollup_totals
+from search_articles import FAMINE_QUERY, match_condition
+from timeseries import EARTHQUAKE_METRICS, load_weekly_series
+from tracing import span
+
 DB_PATH = Path("data/prophecy_tracking.db")
 
+# Fallback when there is not enough history for a data-derived baseline
+DEFAULT_QUAKE_BASELINE = 68  # ~68 magnitude 4.0+ quakes/week
+
 
 def get_j0_wars_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
     """Calculate J0 (wars/conflicts) intensity from UN data."""
-    cursor = conn.cursor()
     cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
     
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN conflict_type = 'Active Conflict' THEN 1 ELSE 0 END) as active,
-               SUM(CASE WHEN conflict_type = 'Casualties' THEN 1 ELSE 0 END) as casualties,
-               SUM(COALESCE(casualties, 0)) as total_casualties
-        FROM conflicts
-        WHERE date >= ?
-    """, (cutoff_date,))
-    
-    result = cursor.fetchone()
-    if not result or result[0] == 0:
+    # Per conflict type: report count and summed casualties
+    totals = rollup_totals(conn, 'conflicts', cutoff_date)
+    if not totals:
         return {'intensity': 0, 'description': 'No data', 'confidence': 'Low'}
     
-    total, active, casualties_events, total_deaths = result
+    active = sum(row['count'] for row in totals if row['category'] == 'Active Conflict')
+    casualties_events = sum(row['count'] for row in totals if row['category'] == 'Casualties')
+    total_deaths = sum(row['value'] for row in totals)
     
     # Intensity calculation (0-100)
     # More active conflicts + casualties = higher intensity
-    base_intensity = min(active * 10, 60)  # Up to 60 for active conflicts
+    # Active conflicts are scored against their rolling baseline when available
+    base_intensity = relative_intensity(active / weeks, get_baseline(conn, 'active_conflicts_per_week'), normal=30, cap=60)
+    if base_intensity is None:
+        base_intensity = min(active * 10, 60)  # Up to 60 for active conflicts
     casualty_bonus = min(casualties_events * 10, 30)  # Up to 30 for casualty reports
     death_bonus = min(total_deaths / 1000, 10)  # Up to 10 for death tolls
     
@@ -71,27 +78,26 @@ def get_j0_wars_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
 
 
 def get_j0_earthquakes_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
-    """Calculate J0 (earthquakes) intensity from USGS data."""
-    cursor = conn.cursor()
-    cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
-    
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN magnitude >= 6.0 THEN 1 ELSE 0 END) as major,
-               AVG(magnitude) as avg_mag
-        FROM earthquakes
-        WHERE date_utc >= ?
-    """, (cutoff_date,))
+    """Calculate J0 (earthquakes) intensity from unique earthquake events (USGS + GDACS)."""
+    # The last `weeks` complete calendar weeks, like the baseline (a partial
+    # current week would drag the weekly average down early in the week)
+    current_week = datetime.strptime(week_start(datetime.utcnow()), '%Y-%m-%d')
+    series = load_weekly_series(
+        conn, EARTHQUAKE_METRICS,
+        start=(current_week - timedelta(weeks=weeks)).strftime('%Y-%m-%d'),
+        end=(current_week - timedelta(weeks=1)).strftime('%Y-%m-%d')
+    )
     
-    result = cursor.fetchone()
-    if not result or result[0] == 0:
+    total = int(series['total'].sum())
+    if total == 0:
         return {'intensity': 0, 'description': 'No data', 'confidence': 'Low'}
     
-    total, major, avg_mag = result
+    major = int(series['major'].sum())
     weekly_avg = total / weeks
     
-    # Historical baseline: ~68/week
-    baseline = 68
+    # Historical baseline: rolling mean of stored weeks (fallback ~68/week)
+    stats = get_baseline(conn, 'earthquakes_per_week')
+    baseline = round(stats['mean']) if stats and stats['mean'] > 0 else DEFAULT_QUAKE_BASELINE
     deviation = (weekly_avg - baseline) / baseline * 100
     
     # Intensity calculation
@@ -113,11 +119,11 @@ def get_j0_famines_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
     cursor = conn.cursor()
     cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
     
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT COUNT(*) as total,
                SUM(CASE WHEN category = 'Disaster/Famine' THEN 1 ELSE 0 END) as disasters
         FROM worldbank_news
-        WHERE date >= ? AND (category = 'Disaster/Famine' OR keywords LIKE '%famine%' OR keywords LIKE '%poverty%')
+        WHERE date >= ? AND (category = 'Disaster/Famine' OR {match_condition('worldbank_news', FAMINE_QUERY)})
     """, (cutoff_date,))
     
     result = cursor.fetchone()
@@ -126,8 +132,10 @@ def get_j0_famines_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
     
     total, disasters = result
     
-    # Intensity based on frequency of reports
-    intensity = min(total * 15, 100)  # Each report = +15 intensity
+    # Intensity based on frequency of reports relative to the rolling baseline
+    intensity = relative_intensity(total / weeks, get_baseline(conn, 'famine_reports_per_week'))
+    if intensity is None:
+        intensity = min(total * 15, 100)  # No baseline yet: each report = +15 intensity
     
     if intensity >= 60:
         return {'intensity': intensity, 'description': f'HIGH - {total} reports in {weeks} weeks', 'confidence': 'Med'}
@@ -147,24 +155,15 @@ def get_j6_cosmic_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
 
 def get_h0_economic_intensity(conn: sqlite3.Connection, weeks: int = 4) -> dict:
     """Calculate H0 (economic collapse) intensity from FRED data."""
-    cursor = conn.cursor()
     cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
     
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN status = 'Crisis' THEN 1 ELSE 0 END) as crisis,
-               SUM(CASE WHEN status = 'Concern' THEN 1 ELSE 0 END) as concern
-        FROM economic_indicators
-        WHERE date >= ?
-        ORDER BY date DESC
-        LIMIT 1
-    """, (cutoff_date,))
-    
-    result = cursor.fetchone()
-    if not result or result[0] == 0:
+    # Indicator readings per status (the rollup band)
+    totals = rollup_totals(conn, 'economic_indicators', cutoff_date)
+    if not totals:
         return {'intensity': 20, 'description': 'NORMAL - Stable economic indicators', 'confidence': 'Low'}
     
-    total, crisis, concern = result
+    crisis = sum(row['count'] for row in totals if row['band'] == 'Crisis')
+    concern = sum(row['count'] for row in totals if row['band'] == 'Concern')
     
     # Intensity based on crisis indicators
     intensity = 20  # Baseline (normal)
@@ -259,15 +258,21 @@ def main():
     conn = sqlite3.connect(DB_PATH)
     
     try:
+        # Link any reports ingested since the last resolution run
+        apply_migrations(conn)
+        with span('resolve_events', 'ingest'):
+            resolve_events(conn)
+        
         # Get intensity for each node
-        intensities = {
-            'j0_wars': get_j0_wars_intensity(conn, weeks),
-            'j0_quakes': get_j0_earthquakes_intensity(conn, weeks),
-            'j0_famines': get_j0_famines_intensity(conn, weeks),
-            'j6_cosmic': get_j6_cosmic_intensity(conn, weeks),
-            'h0_economic': get_h0_economic_intensity(conn, weeks),
-            'b2_digital': get_b2_digital_intensity(conn, weeks)
-        }
+        with span('node_intensities', 'analysis', weeks=weeks):
+            intensities = {
+                'j0_wars': get_j0_wars_intensity(conn, weeks),
+                'j0_quakes': get_j0_earthquakes_intensity(conn, weeks),
+                'j0_famines': get_j0_famines_intensity(conn, weeks),
+                'j6_cosmic': get_j6_cosmic_intensity(conn, weeks),
+                'h0_economic': get_h0_economic_intensity(conn, weeks),
+                'b2_digital': get_b2_digital_intensity(conn, weeks)
+            }
         
         # Calculate overall pattern
         overall = calculate_overall_pattern_strength(intensities)
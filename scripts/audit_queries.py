@@ -0,0 +1,650 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Query Plan Auditor & Index Advisor
+Collects every SQL query written inline in the scripts, runs EXPLAIN QUERY PLAN
+on each against a scaled database and reports queries that will get slow as
+the tables grow:
+
+    full-scan            reads every row of a large table
+    temp-btree           sorts/groups in a temporary B-tree (ORDER BY, GROUP BY, DISTINCT)
+    function-on-column   date()/strftime()/lower()... around a column in a filter (no index can help)
+    leading-wildcard     LIKE '%...' (no index can help)
+    order-on-aggregate   ORDER BY/LIMIT on a single-row aggregate (orders nothing)
+
+For each full scan / temp B-tree, candidate indexes are built in the audit
+database and the query re-planned; the smallest index that removes the finding
+is proposed as a CREATE INDEX statement.
+
+By default the audit database is the current schema (all migrations) with
+planner statistics (sqlite_stat1) describing --rows rows per data table, so
+plans match a large database without generating data. --db audits a copy of
+a real (or synthetic) database after ANALYZE instead.
+
+--strict compares findings with the accepted baseline (query_audit_baseline.json)
+and exits 1 when a query has a new finding, so slow queries can't slip in.
+Each accepted finding maps to the reason it is acceptable; --strict also fails
+while any reason is missing. Fix findings with a proposed index rather than
+accepting them.
+
+Usage:
+    python audit_queries.py [scripts/generate_newsletter.py ...] [--rows 1000000] [--verbose]
+    python audit_queries.py --db data/prophecy_tracking.db
+    python audit_queries.py --strict                 # CI check against the baseline
+    python audit_queries.py --update-baseline        # Accept the current findings (then write their reasons)
+"""
+
+import sys
+import io
+import ast
+import re
+import json
+import shutil
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+import importlib
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from init_database import apply_migrations
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+SCRIPTS_DIR = Path(__file__).parent
+BASELINE_PATH = SCRIPTS_DIR / 'query_audit_baseline.json'
+
+# Rows per data table described to the planner (override with --rows)
+DEFAULT_ROWS = 1_000_000
+
+# Bookkeeping tables that stay small however long the pipeline runs
+SMALL_TABLE_ROWS = {
+    'schema_version': 20,
+    'metric_baselines': 50,
+    'backfill_checkpoints': 500,
+    'weekly_assessments': 500,
+    'metric_weekly': 5_000,
+    'pipeline_timings': 5_000,
+    'weekly_rollups': 30_000,
+}
+
+# Scans of tables smaller than this are not worth an index
+MIN_SCAN_ROWS = 10_000
+
+# Columns with a handful of distinct values (type/status/category fields)
+LOW_CARDINALITY_COLUMNS = {
+    'event_type', 'category', 'status', 'alert_level', 'conflict_type', 'confidence',
+    'disaster_type', 'indicator_name', 'metric', 'source', 'node', 'run_name', 'stage',
+    'band', 'trend_direction', 'period',
+}
+
+AUDITED_STATEMENTS = ('SELECT', 'WITH', 'UPDATE', 'DELETE')
+
+PLAN_KINDS = ('full-scan', 'temp-btree')
+
+FUNCTION_ON_COLUMN = re.compile(
+    r"\b(date|datetime|julianday|strftime|substr|lower|upper|trim|cast)\s*\(\s*(?:'[^']*'\s*,\s*)?((?:\w+\.)?\w+)",
+    re.IGNORECASE,
+)
+LEADING_WILDCARD = re.compile(r"\bLIKE\s+'%|\bLIKE\s+'%'\s*\|\|", re.IGNORECASE)
+AGGREGATE = re.compile(r'\b(COUNT|SUM|AVG|MIN|MAX|TOTAL|GROUP_CONCAT)\s*\(', re.IGNORECASE)
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NAMED_PARAM = re.compile(r'[:@$]([A-Za-z_]\w*)')
+SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?(?: USING (COVERING )?INDEX (\w+))?')
+SEARCH = re.compile(r'^SEARCH (\w+)')
+LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+
+
+# ---------------------------------------------------------------------------
+# Collecting queries
+# ---------------------------------------------------------------------------
+
+def _metric_group_locals() -> List[Dict]:
+    """timeseries._query_group: one query per (table, date column, filter) group."""
+    from baselines import METRICS, week_expression
+    from timeseries import EARTHQUAKE_METRICS
+
+    groups: Dict[Tuple[str, str, str], List[str]] = {}
+    for table, date_column, condition, aggregate in EARTHQUAKE_METRICS.values():
+        groups.setdefault((table, date_column, condition), []).append(aggregate)
+    for table, date_column, condition in METRICS.values():
+        groups.setdefault((table, date_column, condition), []).append('COUNT(*)')
+    return [
+        {'table': table, 'date_column': date_column, 'condition': condition,
+         'week_expr': week_expression(date_column), 'aggregates': ', '.join(aggregates)}
+        for (table, date_column, condition), aggregates in groups.items()
+    ]
+
+
+def _baseline_locals() -> List[Dict]:
+    """baselines.py: one query per weekly count metric."""
+    from baselines import METRICS, week_expression
+    return [
+        {'table': table, 'date_column': date_column, 'condition': condition,
+         'week_expr': week_expression(date_column)}
+        for table, date_column, condition in METRICS.values()
+    ]
+
+
+def _geo_locals() -> List[Dict]:
+    """geo_index.py: one query per spatially indexed table."""
+    from geo_index import INDEXED_TABLES
+    return [
+        {'table': table, 'magnitude': 'MAX(t.magnitude)' if table == 'earthquakes' else 'NULL'}
+        for table in INDEXED_TABLES
+    ]
+
+
+def _rollup_locals() -> List[Dict]:
+    """rollups._raw_totals: one query per rolled-up table."""
+    from rollups import ROLLUP_SOURCES, rollup_expressions
+    return [
+        {'source': source, 'date_column': date_column, 'e': rollup_expressions(source)}
+        for source, (date_column, _, _, _) in ROLLUP_SOURCES.items()
+    ]
+
+
+# Queries assembled from definitions at run time: (script, function) -> example
+# local values to render them with (the AST alone can't know the table/filter)
+DYNAMIC_LOCALS = {
+    ('timeseries.py', '_query_group'): _metric_group_locals,
+    ('baselines.py', 'refresh_weekly_values'): _baseline_locals,
+    ('baselines.py', 'refresh_baseline'): _baseline_locals,
+    ('geo_index.py', 'assign_geohashes'): _geo_locals,
+    ('geo_index.py', 'count_in_region'): _geo_locals,
+    ('geo_index.py', 'hotspots'): _geo_locals,
+    ('rollups.py', '_raw_totals'): _rollup_locals,
+}
+
+
+class _QueryCollector(ast.NodeVisitor):
+    """Finds string SQL passed to .execute()/.executemany() in one module."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.module_globals = None
+        self.imported = False
+        self.scopes: List[Tuple[str, Dict[str, ast.AST]]] = [('<module>', {})]
+        self.queries: List[Dict] = []
+
+    def _visit_scope(self, node):
+        assignments = {}
+        for child in ast.walk(node):
+            if isinstance(child, ast.Assign) and len(child.targets) == 1 and isinstance(child.targets[0], ast.Name):
+                assignments[child.targets[0].id] = child.value
+        name = node.name if self.scopes[-1][0] == '<module>' else f"{self.scopes[-1][0]}.{node.name}"
+        self.scopes.append((name, assignments))
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_FunctionDef = _visit_scope
+    visit_AsyncFunctionDef = _visit_scope
+    visit_ClassDef = _visit_scope
+
+    def _text(self, node, local_values: Dict, depth: int = 0) -> Tuple[Optional[str], bool]:
+        """SQL text of an expression, and whether parts had to be guessed."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value, False
+        if isinstance(node, ast.JoinedStr):
+            parts, guessed = [], False
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(value.value)
+                    continue
+                resolved = self._evaluate(value.value, local_values)
+                if resolved is None:
+                    parts.append('?')  # e.g. IN ({placeholders}); a table name will not prepare
+                    guessed = True
+                else:
+                    parts.append(str(resolved))
+            return ''.join(parts), guessed
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+            left, left_guessed = self._text(node.left, local_values, depth)
+            right, right_guessed = self._text(node.right, local_values, depth)
+            if left is None or right is None:
+                return None, False
+            return left + right, left_guessed or right_guessed
+        if isinstance(node, ast.Name) and depth < 3:
+            for _, assignments in reversed(self.scopes):
+                if node.id in assignments:
+                    return self._text(assignments[node.id], local_values, depth + 1)
+        return None, False
+
+    def _evaluate(self, node, local_values: Dict) -> Optional[object]:
+        """Value of an f-string field from module globals (constants, helpers) and example locals."""
+        if not self.imported:
+            self.module_globals = _module_globals(self.path)
+            self.imported = True
+        try:
+            return eval(compile(ast.Expression(node), '<sql>', 'eval'),
+                        {**(self.module_globals or {}), **local_values})
+        except Exception:
+            return None
+
+    def visit_Call(self, node):
+        if (isinstance(node.func, ast.Attribute) and node.func.attr in ('execute', 'executemany')
+                and node.args):
+            function = self.scopes[-1][0]
+            provider = DYNAMIC_LOCALS.get((self.path.name, function))
+            seen = set()
+            for local_values in (_quietly(provider) or [{}]) if provider else [{}]:
+                sql, guessed = self._text(node.args[0], local_values)
+                if sql is None or not is_audited(sql) or sql in seen:
+                    continue
+                seen.add(sql)
+                self.queries.append({
+                    'function': function,
+                    'line': node.lineno,
+                    'sql': sql.strip(),
+                    'guessed': guessed,
+                })
+        self.generic_visit(node)
+
+
+def is_audited(sql: str) -> bool:
+    """Reads and row-selecting writes (INSERT ... SELECT, UPDATE, DELETE); not DDL or plain inserts."""
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+    if keyword in ('INSERT', 'REPLACE'):
+        return re.search(r'\bSELECT\b', sql, re.IGNORECASE) is not None
+    return keyword in AUDITED_STATEMENTS
+
+
+def _quietly(function):
+    """Call function with its (and its imports') console output discarded; None on failure."""
+    sink = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    try:
+        with redirect_stdout(sink), redirect_stderr(sink):
+            return function()
+    except (Exception, SystemExit):
+        return None
+
+
+def _module_globals(path: Path) -> Optional[Dict]:
+    """Globals of a script (to resolve helpers in f-strings); None if it can't be imported.
+
+    Some fetchers print warnings or exit at import when API keys are missing.
+    """
+    module = _quietly(lambda: importlib.import_module(path.stem))
+    return vars(module) if module is not None else None
+
+
+def collect_queries(paths: List[Path]) -> List[Dict]:
+    """Every auditable query in the given scripts, with file/function/line."""
+    queries = []
+    for path in paths:
+        tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+        collector = _QueryCollector(path)
+        collector.visit(tree)
+        for query in collector.queries:
+            query['file'] = path.name
+            queries.append(query)
+    return queries
+
+
+def normalize_sql(sql: str) -> str:
+    return ' '.join(sql.split())
+
+
+def fingerprint(query: Dict, finding: Dict) -> str:
+    """Stable id of a finding: survives line moves, changes when the query text changes."""
+    digest = hashlib.sha1(normalize_sql(query['sql']).encode('utf-8')).hexdigest()[:10]
+    subject = finding.get('subject') or finding.get('table') or '-'
+    return f"{query['file']}:{query['function']}:{finding['kind']}:{subject}:{digest}"
+
+
+# ---------------------------------------------------------------------------
+# Audit database
+# ---------------------------------------------------------------------------
+
+def _index_stat(conn: sqlite3.Connection, table: str, index: str, rows: int) -> str:
+    """sqlite_stat1 'stat' for an index: rows, then average rows per distinct prefix."""
+    unique = any(row[1] == index and row[2] for row in conn.execute(f'PRAGMA index_list("{table}")'))
+    columns = [row[2] for row in conn.execute(f'PRAGMA index_info("{index}")')]
+    stat, per_value = [rows], rows
+    for position, column in enumerate(columns):
+        if column in LOW_CARDINALITY_COLUMNS:
+            per_value = max(1, per_value // 10)
+        else:
+            per_value = max(1, min(per_value, 10) if position == 0 else 1)
+        if unique and position == len(columns) - 1:
+            per_value = 1
+        stat.append(per_value)
+    return ' '.join(str(value) for value in stat)
+
+
+def table_rows(table: str, rows: int) -> int:
+    return SMALL_TABLE_ROWS.get(table, rows)
+
+
+def describe_scale(conn: sqlite3.Connection, rows: int):
+    """Write planner statistics describing `rows` rows per data table (no data needed)."""
+    conn.execute("ANALYZE")  # Creates sqlite_stat1
+    conn.execute("DELETE FROM sqlite_stat1")
+    tables = [row[0] for row in conn.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'
+    """)]
+    for table in tables:
+        count = table_rows(table, rows)
+        conn.execute("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, NULL, ?)", (table, str(count)))
+        for (index,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,)):
+            conn.execute("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, ?, ?)",
+                         (table, index, _index_stat(conn, table, index, count)))
+    conn.commit()
+    conn.execute("ANALYZE sqlite_schema")  # Reload the statistics
+
+
+def open_audit_db(work_dir: Path, source_db: Optional[Path], rows: int) -> Tuple[sqlite3.Connection, Dict[str, int]]:
+    """Audit database (never the live one) and its row count per table."""
+    path = work_dir / 'audit.db'
+    if source_db is not None:
+        shutil.copyfile(source_db, path)
+    conn = sqlite3.connect(path)
+    apply_migrations(conn)
+
+    if source_db is not None:
+        conn.execute("ANALYZE")
+        conn.commit()
+        sizes = {}
+        for table, stat in conn.execute("SELECT tbl, stat FROM sqlite_stat1 WHERE idx IS NULL"):
+            sizes[table] = int(stat.split()[0])
+    else:
+        describe_scale(conn, rows)
+        sizes = {row[0]: int(row[1]) for row in conn.execute("SELECT tbl, stat FROM sqlite_stat1 WHERE idx IS NULL")}
+    return conn, sizes
+
+
+# ---------------------------------------------------------------------------
+# Planning and findings
+# ---------------------------------------------------------------------------
+
+def _bindings(sql: str):
+    """Placeholder values for EXPLAIN (the plan does not depend on them)."""
+    code = STRING_LITERAL.sub("''", sql)
+    names = NAMED_PARAM.findall(code)
+    if names:
+        return {name: None for name in names}
+    return [None] * code.count('?')
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """EXPLAIN QUERY PLAN details, indented by depth."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", _bindings(sql)).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def plan_findings(plan: List[str], sizes: Dict[str, int], sql: str, covering_ok: bool = True) -> List[Dict]:
+    """Full scans and temp B-trees in a plan (covering_ok: a covering-index scan is not a finding)."""
+    details = [line.strip() for line in plan]
+    tables = {match.group(1) for match in map(SCAN.match, details) if match}
+    tables |= {match.group(1) for match in map(SEARCH.match, details) if match}
+    large = {table for table in tables if sizes.get(table, 0) >= MIN_SCAN_ROWS}
+    # Walking an index in ORDER BY order stops after LIMIT rows
+    limited = LIMIT.search(sql) is not None and 'USE TEMP B-TREE FOR ORDER BY' not in details
+
+    findings = []
+    for detail in details:
+        match = SCAN.match(detail)
+        if match:
+            table, covering, index = match.groups()
+            if table not in large or (covering and covering_ok) or (index and limited):
+                continue  # Subqueries, CTEs, virtual tables, small tables, covering or LIMITed index scans
+            how = f"every row via {index}" if index else "every row"
+            findings.append({'kind': 'full-scan', 'table': table,
+                             'detail': f"{table}: {how} (~{sizes[table]:,} rows)"})
+        elif detail.startswith('USE TEMP B-TREE') and large:
+            findings.append({'kind': 'temp-btree', 'table': None, 'subject': detail[len('USE TEMP B-TREE FOR '):].lower(),
+                             'detail': f"{detail.lower()} ({', '.join(sorted(large))})"})
+    return findings
+
+
+def lint_findings(sql: str, columns: Dict[str, List[str]]) -> List[Dict]:
+    """Index-defeating patterns visible in the SQL text."""
+    findings = []
+    upper = sql.upper()
+    where_at = upper.find('WHERE')
+    known_columns = {column for table_columns in columns.values() for column in table_columns}
+
+    if where_at >= 0:
+        for function, column in FUNCTION_ON_COLUMN.findall(sql[where_at:]):
+            if column.split('.')[-1] in known_columns:
+                findings.append({'kind': 'function-on-column', 'table': None,
+                                 'detail': f"{function}({column}) in a filter"})
+                break
+
+    if LEADING_WILDCARD.search(sql):
+        findings.append({'kind': 'leading-wildcard', 'table': None, 'detail': "LIKE '%...'"})
+
+    if (upper.count('SELECT') == 1 and 'GROUP BY' not in upper and 'ORDER BY' in upper
+            and AGGREGATE.search(sql[:upper.find('FROM')] if 'FROM' in upper else sql)):
+        findings.append({'kind': 'order-on-aggregate', 'table': None,
+                         'detail': "aggregate returns one row; ORDER BY/LIMIT does nothing"})
+    return findings
+
+
+def table_columns(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return {table: [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')] for table in tables}
+
+
+# ---------------------------------------------------------------------------
+# Index advisor
+# ---------------------------------------------------------------------------
+
+def _clause(sql: str, keyword: str) -> str:
+    """Text following keyword up to the next clause keyword (all occurrences joined)."""
+    pattern = re.compile(rf'\b{keyword}\b(.*?)(?=\bWHERE\b|\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|\bHAVING\b|\)|$)',
+                         re.IGNORECASE | re.DOTALL)
+    return ' '.join(match.group(1) for match in pattern.finditer(sql))
+
+
+def candidate_indexes(sql: str, table: str, columns: List[str]) -> List[List[str]]:
+    """Column lists to try for table, smallest first."""
+    code = STRING_LITERAL.sub("''", sql)
+    filters = _clause(code, 'WHERE') + ' ' + _clause(code, 'ON')
+    ordering = _clause(code, 'GROUP BY') + ' ' + _clause(code, 'ORDER BY')
+
+    def mentioned(text: str, pattern: str) -> List[str]:
+        return [column for column in columns
+                if re.search(rf'(?<![\w.])(?:\w+\.)?{column}\b\s*{pattern}', text, re.IGNORECASE)]
+
+    equality = mentioned(filters, r'(?:=|\bIN\b|\bIS\b)')
+    ranged = [column for column in mentioned(filters, r'(?:[<>]|\bBETWEEN\b)') if column not in equality]
+    ordered = [column for column in mentioned(ordering, '') if column not in equality]
+    referenced = [column for column in mentioned(code, '')
+                  if column not in equality + ranged + ordered and column != 'id']
+
+    candidates = []
+    for key in (equality + ranged[:1], equality + ordered, equality + ranged[:1] + ordered):
+        if key and key not in candidates:
+            candidates.append(key)
+    for key in list(candidates):
+        covering = key + [column for column in ranged + ordered + referenced if column not in key]
+        if covering != key and covering not in candidates:
+            candidates.append(covering)
+    return candidates
+
+
+def advise(conn: sqlite3.Connection, query: Dict, finding: Dict, sizes: Dict[str, int],
+           columns: Dict[str, List[str]]) -> Optional[str]:
+    """Smallest CREATE INDEX that makes the finding disappear from the plan, if any."""
+    tables = [finding['table']] if finding['table'] else [
+        table for table in columns if table in sizes and re.search(rf'\b{table}\b', query['sql'])
+    ]
+
+    def remaining() -> set:
+        # An index that only turns a table scan into a covering-index scan still reads every row
+        plan = explain(conn, query['sql'])
+        return {fingerprint(query, f) for f in plan_findings(plan, sizes, query['sql'], covering_ok=False)}
+
+    before = remaining()
+    target = fingerprint(query, finding)
+
+    for table in tables:
+        for key in candidate_indexes(query['sql'], table, columns[table]):
+            name = f"idx_{table}_{'_'.join(key)}"
+            statement = f"CREATE INDEX {name} ON {table}({', '.join(key)})"
+            conn.execute("SAVEPOINT advise")
+            try:
+                conn.execute(statement)
+                conn.execute("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, ?, ?)",
+                             (table, name, _index_stat(conn, table, name, sizes[table])))
+                conn.execute("ANALYZE sqlite_schema")
+                after = remaining()
+            except sqlite3.Error:
+                after = before
+            finally:
+                conn.execute("ROLLBACK TO advise")
+                conn.execute("RELEASE advise")
+                conn.execute("ANALYZE sqlite_schema")
+            if target not in after and len(after) <= len(before):
+                return statement + ';'
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def audit(conn: sqlite3.Connection, queries: List[Dict], sizes: Dict[str, int]) -> Tuple[List[Dict], List[Dict]]:
+    """Findings (with proposed index) per query, and the queries that could not be planned."""
+    columns = table_columns(conn)
+    findings, skipped = [], []
+    for query in queries:
+        try:
+            query['plan'] = explain(conn, query['sql'])
+        except sqlite3.Error as e:
+            query['error'] = 'dynamic SQL' if query['guessed'] else str(e)
+            skipped.append(query)
+            continue
+
+        for finding in plan_findings(query['plan'], sizes, query['sql']) + lint_findings(query['sql'], columns):
+            finding['query'] = query
+            finding['id'] = fingerprint(query, finding)
+            finding['index'] = advise(conn, query, finding, sizes, columns) if finding['kind'] in PLAN_KINDS else None
+            findings.append(finding)
+    return findings, skipped
+
+
+def load_baseline() -> Dict[str, str]:
+    """Accepted finding id -> reason it is acceptable ('' if not written yet)."""
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding='utf-8'))['accepted']
+
+
+def save_baseline(findings: List[Dict], previous: Dict[str, str]):
+    """Accept the current findings, keeping the reasons already written."""
+    accepted = {finding['id']: previous.get(finding['id'], '') for finding in findings}
+    BASELINE_PATH.write_text(json.dumps({'accepted': dict(sorted(accepted.items()))}, indent=2, ensure_ascii=False) + '\n',
+                             encoding='utf-8')
+
+
+def print_report(queries: List[Dict], findings: List[Dict], skipped: List[Dict], accepted: Dict[str, str],
+                 verbose: bool):
+    print(f"## Query audit: {len(queries)} queries, {len(findings)} findings\n")
+
+    if findings:
+        print("| Location | Finding | Detail | Proposed Index | Status |")
+        print("|----------|---------|--------|----------------|--------|")
+        for finding in findings:
+            query = finding['query']
+            if finding['id'] not in accepted:
+                status = '🆕 new'
+            else:
+                status = 'accepted' if accepted[finding['id']] else '⚠️ accepted, no reason'
+            if finding['index']:
+                index = f"`{finding['index']}`"
+            else:
+                index = 'none helps' if finding['kind'] in PLAN_KINDS else '—'
+            print(f"| {query['file']}:{query['line']} {query['function']}() | {finding['kind']} | "
+                  f"{finding['detail']} | {index} | {status} |")
+        print()
+
+    proposals: Dict[str, List[str]] = {}
+    for finding in findings:
+        if finding['index']:
+            query = finding['query']
+            proposals.setdefault(finding['index'], []).append(f"{query['file']}:{query['line']}")
+    if proposals:
+        print("### Proposed indexes\n")
+        print("```sql")
+        for statement, locations in proposals.items():
+            print(f"{statement}  -- {', '.join(sorted(set(locations)))}")
+        print("```\n")
+
+    if skipped:
+        print(f"ℹ️  Not planned ({len(skipped)}): " +
+              ', '.join(f"{q['file']}:{q['line']} ({q['error']})" for q in skipped))
+        print()
+
+    if verbose:
+        print("### Plans\n")
+        for query in queries:
+            if 'plan' not in query:
+                continue
+            print(f"{query['file']}:{query['line']} {query['function']}()")
+            print("```")
+            print(normalize_sql(query['sql']))
+            print('\n'.join(query['plan']))
+            print("```\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit query plans of inline SQL and propose indexes.")
+    parser.add_argument("paths", nargs='*', type=Path, help="Scripts to audit (default: every script).")
+    parser.add_argument("--db", type=Path, help="Audit a copy of this database (after ANALYZE) instead of a scaled schema.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS,
+                        help=f"Rows per data table described to the planner (default: {DEFAULT_ROWS:,}).")
+    parser.add_argument("--verbose", action='store_true', help="Print every query plan.")
+    parser.add_argument("--strict", action='store_true', help="Exit 1 if there are findings not in the baseline.")
+    parser.add_argument("--update-baseline", action='store_true', help="Accept all current findings.")
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(path for path in SCRIPTS_DIR.glob('*.py') if path.name != Path(__file__).name)
+    if args.db is not None and not args.db.exists():
+        print(f"❌ Database not found: {args.db}")
+        sys.exit(1)
+
+    queries = collect_queries(paths)
+    with tempfile.TemporaryDirectory() as work_dir:
+        conn, sizes = open_audit_db(Path(work_dir), args.db, args.rows)
+        try:
+            findings, skipped = audit(conn, queries, sizes)
+        finally:
+            conn.close()
+
+    accepted = load_baseline()
+    if args.update_baseline:
+        save_baseline(findings, accepted)
+        unexplained = sum(1 for finding in findings if not accepted.get(finding['id']))
+        print(f"✅ Baseline updated: {len(findings)} accepted findings → {BASELINE_PATH}")
+        if unexplained:
+            print(f"⚠️  Write the reason for {unexplained} finding(s) with an empty entry")
+        return
+
+    print_report(queries, findings, skipped, accepted, args.verbose)
+
+    new = [finding for finding in findings if finding['id'] not in accepted]
+    unexplained = [finding for finding in findings if finding['id'] in accepted and not accepted[finding['id']]]
+    if new:
+        print(f"⚠️  {len(new)} new finding(s) not in the baseline")
+    if unexplained:
+        print(f"⚠️  {len(unexplained)} accepted finding(s) without a reason in {BASELINE_PATH.name}")
+    if not new and not unexplained:
+        print("✅ No new findings")
+    elif args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Forecast Backtesting
+Walk-forward backtest of the predict_trends.py forecasters on weekly earthquake history.
+
+For each fold the series is cut at a past week, every backend is fitted on the
+weeks before the cut and asked for the next --horizon weeks, and its forecast is
+scored against what actually happened. Folds run in parallel in a process pool.
+Reports MAE/MAPE and mean fit/predict wall time per backend, so the cheapest
+model that is accurate enough can be chosen. Also scores the forecasts
+predict_trends.py has already stored in `trends` against the actual counts.
+
+Usage:
+    python backtest_trends.py [--metric total|major] [--horizon 4] [--folds 26] [--workers 4]
+    python backtest_trends.py --backends naive,moving_average
+"""
+
+import sys
+import io
+import os
+import time
+import sqlite3
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import numpy as np
+
+from predict_trends import HAS_TF, _init_training_worker, fit_lstm, forecast_lstm, simple_moving_average
+from timeseries import EARTHQUAKE_METRICS, load_weekly_series, week_labels
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# A backend counts as "accurate enough" within this fraction of the best MAE
+ACCURACY_TOLERANCE = 0.10
+
+ROLLING_MEAN_WEEKS = 12
+
+
+def fit_naive(history: np.ndarray, horizon: int) -> float:
+    """Last observed week."""
+    return history[-1]
+
+
+def fit_moving_average(history: np.ndarray, horizon: int) -> float:
+    """3-week moving average (the predict_trends.py fallback)."""
+    return simple_moving_average(history, window=3)[-1]
+
+
+def fit_rolling_mean(history: np.ndarray, horizon: int) -> float:
+    """Mean of the last ROLLING_MEAN_WEEKS weeks."""
+    return np.mean(history[-ROLLING_MEAN_WEEKS:])
+
+
+def predict_constant(level: float, horizon: int) -> np.ndarray:
+    """Flat forecast at a fitted level."""
+    return np.full(horizon, level, dtype=float)
+
+
+def predict_lstm(fitted: dict, horizon: int) -> np.ndarray:
+    """Direct multi-horizon LSTM forecast."""
+    return forecast_lstm(fitted)
+
+
+# Backend name -> (fit(history, horizon) -> state or None, predict(state, horizon) -> forecast)
+BACKENDS = {
+    'naive': (fit_naive, predict_constant),
+    'moving_average': (fit_moving_average, predict_constant),
+    'rolling_mean': (fit_rolling_mean, predict_constant),
+    'lstm': (fit_lstm, predict_lstm),
+}
+
+
+def available_backends() -> List[str]:
+    """Backends whose dependencies are installed."""
+    return [name for name in BACKENDS if name != 'lstm' or HAS_TF]
+
+
+def plan_folds(length: int, horizon: int, folds: int, step: int, min_train: int) -> List[int]:
+    """Cut points (index of the first forecast week) for the most recent folds, oldest first."""
+    last_origin = length - horizon
+    origins = list(range(last_origin, min_train - 1, -step))[:folds]
+    return sorted(origins)
+
+
+def run_fold(task: tuple) -> tuple:
+    """Fit and forecast one backend on one fold (runs in a worker process)."""
+    backend, origin, history, horizon = task
+    fit, predict = BACKENDS[backend]
+
+    started = time.perf_counter()
+    state = fit(history, horizon)
+    fit_seconds = time.perf_counter() - started
+
+    if state is None:
+        return backend, origin, None, fit_seconds, 0.0
+
+    started = time.perf_counter()
+    forecast = predict(state, horizon)
+    predict_seconds = time.perf_counter() - started
+
+    return backend, origin, forecast, fit_seconds, predict_seconds
+
+
+def error_metrics(forecasts: np.ndarray, actuals: np.ndarray) -> Dict:
+    """MAE and MAPE (%) over all folds and horizons; MAPE skips zero-count weeks."""
+    errors = np.abs(forecasts - actuals)
+    nonzero = actuals != 0
+    return {
+        'mae': float(errors.mean()),
+        'mape': float((errors[nonzero] / actuals[nonzero]).mean() * 100) if nonzero.any() else float('nan'),
+        'mae_by_week': errors.mean(axis=0)
+    }
+
+
+def backtest(series: np.ndarray, backends: List[str], horizon: int, folds: int,
+             step: int, min_train: int, workers: int) -> Dict[str, Dict]:
+    """Walk-forward backtest of each backend; returns accuracy and timing per backend."""
+    origins = plan_folds(len(series), horizon, folds, step, min_train)
+    tasks = [
+        (backend, origin, series[:origin], horizon)
+        for backend in backends
+        for origin in origins
+    ]
+
+    collected = {backend: {'forecasts': [], 'actuals': [], 'fit': [], 'predict': [], 'skipped': 0}
+                 for backend in backends}
+
+    # CPU-bound: spread folds over processes. spawn: TensorFlow is not
+    # fork-safe once initialised; LSTM workers share the cores' TF threads
+    pool_options = {'mp_context': multiprocessing.get_context('spawn')}
+    if 'lstm' in backends:
+        pool_options.update(initializer=_init_training_worker,
+                            initargs=(max(1, (os.cpu_count() or 1) // workers),))
+    with ProcessPoolExecutor(max_workers=workers, **pool_options) as executor:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        for backend, origin, forecast, fit_seconds, predict_seconds in executor.map(run_fold, tasks, chunksize=chunksize):
+            stats = collected[backend]
+            stats['fit'].append(fit_seconds)
+            if forecast is None:
+                stats['skipped'] += 1
+                continue
+            stats['forecasts'].append(forecast)
+            stats['actuals'].append(series[origin:origin + horizon])
+            stats['predict'].append(predict_seconds)
+
+    results = {}
+    for backend, stats in collected.items():
+        if not stats['forecasts']:
+            results[backend] = {'folds': 0, 'skipped': stats['skipped']}
+            continue
+        results[backend] = {
+            'folds': len(stats['forecasts']),
+            'skipped': stats['skipped'],
+            'fit_ms': float(np.mean(stats['fit']) * 1000),
+            'predict_ms': float(np.mean(stats['predict']) * 1000),
+            **error_metrics(np.array(stats['forecasts']), np.array(stats['actuals']))
+        }
+    return results
+
+
+def recommend_backend(results: Dict[str, Dict]) -> str:
+    """Cheapest backend (fit + predict time) whose MAE is within tolerance of the best."""
+    scored = {name: r for name, r in results.items() if r['folds']}
+    if not scored:
+        return None
+    best_mae = min(r['mae'] for r in scored.values())
+    good_enough = [name for name, r in scored.items() if r['mae'] <= best_mae * (1 + ACCURACY_TOLERANCE)]
+    return min(good_enough, key=lambda name: scored[name]['fit_ms'] + scored[name]['predict_ms'])
+
+
+def score_stored_forecasts(conn: sqlite3.Connection, series: np.ndarray) -> List[Dict]:
+    """Compare stored predicted_earthquakes_week_N rows with actual weekly totals."""
+    actual_by_week = dict(zip(week_labels(series), series['total']))
+
+    cursor = conn.execute("""
+        SELECT metric_name, period_start, value, lower_bound, upper_bound
+        FROM trends
+        WHERE metric_name GLOB 'predicted_earthquakes_week_*'
+    """)
+
+    by_horizon = {}
+    for metric_name, period_start, value, lower, upper in cursor.fetchall():
+        actual = actual_by_week.get(period_start)
+        if actual is None:
+            continue  # Week not complete yet
+        rows = by_horizon.setdefault(int(metric_name.rsplit('_', 1)[1]), [])
+        rows.append((value, actual, lower, upper))
+
+    report = []
+    for horizon in sorted(by_horizon):
+        values, actuals, lowers, uppers = (np.array(column, dtype=float) for column in zip(*by_horizon[horizon]))
+        has_bounds = ~np.isnan(lowers) & ~np.isnan(uppers)
+        covered = (actuals[has_bounds] >= lowers[has_bounds]) & (actuals[has_bounds] <= uppers[has_bounds])
+        report.append({
+            'horizon': horizon,
+            'forecasts': len(values),
+            **error_metrics(values[:, np.newaxis], actuals[:, np.newaxis]),
+            'coverage': float(covered.mean()) if has_bounds.any() else None
+        })
+    return report
+
+
+def format_mape(value: float) -> str:
+    return '—' if np.isnan(value) else f"{value:.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the trend forecasters.")
+    parser.add_argument("--metric", choices=['total', 'major'], default='total',
+                        help="Weekly series to forecast (default: total).")
+    parser.add_argument("--horizon", type=int, default=4, help="Weeks forecast per fold (default: 4).")
+    parser.add_argument("--folds", type=int, default=26, help="Most recent folds to run (default: 26).")
+    parser.add_argument("--step", type=int, default=1, help="Weeks between fold cut points (default: 1).")
+    parser.add_argument("--min-train", type=int, default=12, help="Minimum training weeks (default: 12).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count).")
+    parser.add_argument("--backends", type=str, default=None,
+                        help=f"Comma-separated backends (default: all available of {', '.join(BACKENDS)}).")
+    args = parser.parse_args()
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        print(f"❌ Unknown backend(s): {', '.join(unknown)}")
+        sys.exit(1)
+    if 'lstm' in backends and not HAS_TF:
+        print("❌ The lstm backend needs TensorFlow: pip install tensorflow")
+        sys.exit(1)
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        series = load_weekly_series(conn, EARTHQUAKE_METRICS)
+        if len(series) < args.min_train + args.horizon:
+            print(f"⚠️  Insufficient data: {len(series)} weeks available, need {args.min_train + args.horizon}.")
+            print("   Import history with: python scripts/backfill_earthquakes.py")
+            return
+
+        print(f"🧪 Backtesting {args.metric} earthquakes/week: {len(series)} weeks of history")
+        print(f"   Horizon: {args.horizon} weeks, folds: up to {args.folds}, workers: {args.workers}\n")
+
+        started = time.monotonic()
+        results = backtest(series[args.metric], backends, args.horizon, args.folds,
+                           args.step, args.min_train, args.workers)
+        elapsed = time.monotonic() - started
+
+        print("| Backend | Folds | MAE | MAPE | Fit (ms) | Predict (ms) |")
+        print("|---------|-------|-----|------|----------|--------------|")
+        for name, r in results.items():
+            if not r['folds']:
+                print(f"| {name} | 0 ({r['skipped']} skipped) | — | — | — | — |")
+                continue
+            print(f"| {name} | {r['folds']} | {r['mae']:.2f} | {format_mape(r['mape'])} | "
+                  f"{r['fit_ms']:.2f} | {r['predict_ms']:.2f} |")
+
+        print(f"\nMAE by forecast week:")
+        for name, r in results.items():
+            if r['folds']:
+                print(f"   {name}: " + ', '.join(f"W{i + 1} {mae:.2f}" for i, mae in enumerate(r['mae_by_week'])))
+
+        choice = recommend_backend(results)
+        if choice:
+            print(f"\n💡 Cheapest backend within {ACCURACY_TOLERANCE:.0%} of the best MAE: {choice}")
+        print(f"⏱️  Backtest wall time: {elapsed:.1f}s")
+
+        stored = score_stored_forecasts(conn, series)
+        if stored:
+            print("\n📋 Stored forecasts (trends) vs actual totals\n")
+            print("| Forecast Week | Scored | MAE | MAPE | Interval Coverage |")
+            print("|---------------|--------|-----|------|-------------------|")
+            for row in stored:
+                coverage = f"{row['coverage']:.0%}" if row['coverage'] is not None else '—'
+                print(f"| {row['horizon']} | {row['forecasts']} | {row['mae']:.2f} | {format_mape(row['mape'])} | {coverage} |")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Database Backup
+Takes a consistent, compressed snapshot of prophecy_tracking.db while other
+scripts keep writing to it.
+
+The copy uses SQLite's online backup API in batches of pages, sleeping briefly
+between batches so ingest_data.py and the analyses are never blocked for long.
+The snapshot is checked with PRAGMA integrity_check (on the copy, not the live
+database), gzip-compressed, and moved into place atomically. Old snapshots are
+rotated: the newest --keep-recent are kept, plus the newest of each of the last
+--keep-months months.
+
+Snapshots: data/backups/prophecy_tracking_YYYY-MM-DD_HHMMSS.db.gz
+
+Usage:
+    python backup_database.py                  # One snapshot, then rotate
+    python backup_database.py --every 24       # Keep running, one snapshot a day
+    python backup_database.py --verify         # Check the newest snapshot restores cleanly
+    python backup_database.py --restore data/backups/prophecy_tracking_2026-01-05_030000.db.gz
+"""
+
+import sys
+import io
+import os
+import gzip
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+BACKUP_DIR = Path("data/backups")
+
+SNAPSHOT_PREFIX = "prophecy_tracking_"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+# Online backup: pages copied per step, and the pause that lets writers in between steps
+PAGES_PER_STEP = 1024
+STEP_PAUSE_SECONDS = 0.005
+
+# SQLite restarts a batched copy whenever another connection writes. After
+# MAX_RESTARTS the copy starts over with the next, longer pause between steps;
+# when every pause has been tried the backup fails rather than lock writers out
+MAX_RESTARTS = 3
+RETRY_PAUSES_SECONDS = (STEP_PAUSE_SECONDS, 0.1, 1.0)
+
+KEEP_RECENT = 8
+KEEP_MONTHS = 12
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def integrity_check(path: Path) -> str:
+    """Run PRAGMA integrity_check on a database file; returns 'ok' or the first problem."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class BackupRestarted(Exception):
+    """Writers kept changing the source during a batched copy."""
+
+
+def snapshot(source: Path, destination: Path) -> int:
+    """Copy a live database to destination with the online backup API; returns pages copied."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(destination)
+    state = {'remaining': None, 'restarts': 0, 'total': 0}
+
+    def progress(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > MAX_RESTARTS:
+                raise BackupRestarted()
+        state['remaining'] = remaining
+        state['total'] = total
+
+    try:
+        for pause in RETRY_PAUSES_SECONDS:
+            state.update(remaining=None, restarts=0)
+            try:
+                # Each step holds a read lock only while it copies PAGES_PER_STEP pages
+                src.backup(dst, pages=PAGES_PER_STEP, progress=progress, sleep=pause)
+                return state['total']
+            except BackupRestarted:
+                continue
+    finally:
+        dst.close()
+        src.close()
+    raise RuntimeError(f"Writers restarted the copy more than {MAX_RESTARTS} times at every pause; "
+                       f"try again when ingest is quieter")
+
+
+def backup_database(db_path: Path = DB_PATH, backup_dir: Path = BACKUP_DIR) -> Dict:
+    """Snapshot, verify and compress the database into backup_dir.
+
+    Raises RuntimeError if the snapshot fails its integrity check (nothing is kept).
+    """
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    # Date and time, so --every with an interval under a day keeps each snapshot
+    target = backup_dir / f"{SNAPSHOT_PREFIX}{datetime.now().strftime('%Y-%m-%d_%H%M%S')}{SNAPSHOT_SUFFIX}"
+    started = time.monotonic()
+
+    with tempfile.TemporaryDirectory(dir=backup_dir) as work_dir:
+        raw_copy = Path(work_dir) / 'snapshot.db'
+        pages = snapshot(db_path, raw_copy)
+        copy_seconds = time.monotonic() - started
+
+        result = integrity_check(raw_copy)
+        if result != 'ok':
+            raise RuntimeError(f"Snapshot failed integrity check: {result}")
+
+        compressed = Path(work_dir) / target.name
+        with open(raw_copy, 'rb') as src, gzip.open(compressed, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+
+        raw_bytes = raw_copy.stat().st_size
+        os.replace(compressed, target)
+
+    return {
+        'path': target,
+        'pages': pages,
+        'raw_bytes': raw_bytes,
+        'compressed_bytes': target.stat().st_size,
+        'copy_seconds': copy_seconds,
+        'total_seconds': time.monotonic() - started
+    }
+
+
+def list_snapshots(backup_dir: Path = BACKUP_DIR) -> List[Path]:
+    """Snapshot files, newest first (names sort by date and time)."""
+    return sorted(backup_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"), reverse=True)
+
+
+def rotate_snapshots(backup_dir: Path = BACKUP_DIR, keep_recent: int = KEEP_RECENT,
+                     keep_months: int = KEEP_MONTHS) -> List[Path]:
+    """Delete snapshots outside the retention policy; returns the deleted paths."""
+    snapshots = list_snapshots(backup_dir)
+    keep = set(snapshots[:keep_recent])
+
+    months_seen = []
+    for path in snapshots:
+        month = path.name[len(SNAPSHOT_PREFIX):len(SNAPSHOT_PREFIX) + 7]  # YYYY-MM
+        if month not in months_seen:
+            months_seen.append(month)
+            if len(months_seen) <= keep_months:
+                keep.add(path)
+
+    deleted = [path for path in snapshots if path not in keep]
+    for path in deleted:
+        path.unlink()
+    return deleted
+
+
+def restore_to(archive: Path, destination: Path):
+    """Decompress a snapshot to destination."""
+    with gzip.open(archive, 'rb') as src, open(destination, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+
+
+def verify_snapshot(archive: Path) -> str:
+    """Decompress a snapshot to a temporary file and integrity-check it."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        restored = Path(work_dir) / 'restored.db'
+        restore_to(archive, restored)
+        return integrity_check(restored)
+
+
+def format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def run_backup(args) -> bool:
+    """One backup + rotation cycle with a report; returns True on success."""
+    print(f"💾 Backing up {DB_PATH} → {args.output}/")
+    try:
+        stats = backup_database(DB_PATH, args.output)
+    except (sqlite3.Error, OSError, RuntimeError) as e:
+        print(f"❌ Backup failed: {e}", file=sys.stderr)
+        return False
+
+    ratio = stats['compressed_bytes'] / stats['raw_bytes'] if stats['raw_bytes'] else 0
+    print(f"   ✅ {stats['path']}")
+    print(f"   Pages: {stats['pages']}, size: {format_size(stats['raw_bytes'])} → "
+          f"{format_size(stats['compressed_bytes'])} ({ratio:.0%})")
+    print(f"   Integrity: ok")
+    print(f"   Time: {stats['copy_seconds']:.2f}s copy, {stats['total_seconds']:.2f}s total")
+
+    deleted = rotate_snapshots(args.output, args.keep_recent, args.keep_months)
+    if deleted:
+        print(f"   🧹 Rotated out {len(deleted)} old snapshot(s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Online, compressed, verified backups of the tracking database.")
+    parser.add_argument("--output", type=Path, default=BACKUP_DIR,
+                        help=f"Backup directory (default: {BACKUP_DIR}).")
+    parser.add_argument("--keep-recent", type=int, default=KEEP_RECENT,
+                        help=f"Newest snapshots always kept (default: {KEEP_RECENT}).")
+    parser.add_argument("--keep-months", type=int, default=KEEP_MONTHS,
+                        help=f"Also keep the newest snapshot of this many months (default: {KEEP_MONTHS}).")
+    parser.add_argument("--every", type=float, default=None,
+                        help="Keep running and take a snapshot every N hours.")
+    parser.add_argument("--verify", action='store_true',
+                        help="Integrity-check the newest snapshot instead of taking one.")
+    parser.add_argument("--restore", type=Path, default=None,
+                        help="Decompress a snapshot to data/prophecy_tracking.restored.db.")
+    args = parser.parse_args()
+
+    if args.verify:
+        snapshots = list_snapshots(args.output)
+        if not snapshots:
+            print(f"❌ No snapshots in {args.output}")
+            sys.exit(1)
+        result = verify_snapshot(snapshots[0])
+        print(f"{'✅' if result == 'ok' else '❌'} {snapshots[0]}: {result}")
+        sys.exit(0 if result == 'ok' else 1)
+
+    if args.restore:
+        destination = DB_PATH.with_suffix('.restored.db')
+        restore_to(args.restore, destination)
+        print(f"✅ Restored {args.restore} → {destination} (integrity: {integrity_check(destination)})")
+        print(f"   Review it, then replace {DB_PATH} while no scripts are running.")
+        return
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    if args.every is None:
+        sys.exit(0 if run_backup(args) else 1)
+
+    print(f"⏰ Taking a snapshot every {args.every:g} hours (Ctrl+C to stop)\n")
+    try:
+        while True:
+            run_backup(args)
+            time.sleep(args.every * 3600)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+
+
+if __name__ == '__main__':
+    main()
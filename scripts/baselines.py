@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rolling Metric Baselines
+Maintains per-metric weekly values and rolling statistics (mean, std, percentiles)
+so intensity scoring compares against observed history instead of fixed constants.
+
+Weekly values live in `metric_weekly`; the summary for each metric lives in
+`metric_baselines` (one row per metric, read with a primary-key lookup).
+Ingestion calls update_baselines() with the earliest date it touched, so only
+the affected weeks are re-counted.
+
+Usage:
+    python baselines.py [--rebuild]
+"""
+
+import sys
+import io
+import math
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from search_articles import FAMINE_QUERY, match_condition
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# Rolling window for baseline statistics
+BASELINE_WINDOW_WEEKS = 52
+
+# Fewer complete weeks than this and callers fall back to their defaults
+MIN_BASELINE_WEEKS = 4
+
+# Weekly count metrics: (table, date column, filter)
+# Earthquakes are counted as resolved events so USGS and GDACS reports of one quake count once
+METRICS = {
+    'earthquakes_per_week': ('events', 'date_utc', "event_type = 'Earthquake'"),
+    'major_earthquakes_per_week': ('events', 'date_utc', "event_type = 'Earthquake' AND magnitude >= 6.0"),
+    'conflicts_per_week': ('conflicts', 'date', '1 = 1'),
+    'active_conflicts_per_week': ('conflicts', 'date', "conflict_type = 'Active Conflict'"),
+    'famine_reports_per_week': (
+        'worldbank_news', 'date',
+        f"(category = 'Disaster/Famine' OR {match_condition('worldbank_news', FAMINE_QUERY)})"
+    ),
+}
+
+
+def week_start(day: datetime) -> str:
+    """Return the Monday (YYYY-MM-DD) of the week containing day."""
+    return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+
+
+def week_expression(date_column: str) -> str:
+    """SQL expression mapping a date column to its week's Monday.
+
+    Dates are stored as 'YYYY-MM-DD...' text (sometimes with a ' UTC' suffix
+    that date() rejects), so only the date prefix is used.
+    """
+    return f"date(substr({date_column}, 1, 10), 'weekday 0', '-6 days')"
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linear-interpolated percentile (q in 0-100) of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(sorted_values[lower])
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def refresh_weekly_values(conn: sqlite3.Connection, metric: str, since: Optional[str] = None):
+    """Re-count weekly values for a metric from `since` (YYYY-MM-DD) onwards."""
+    table, date_column, condition = METRICS[metric]
+    week_expr = week_expression(date_column)
+    since_week = week_start(datetime.strptime(since[:10], '%Y-%m-%d')) if since else '0000-00-00'
+
+    cursor = conn.cursor()
+
+    # Drop stale rows for the affected weeks, then re-count them
+    cursor.execute(
+        "DELETE FROM metric_weekly WHERE metric_name = ? AND week_start >= ?",
+        (metric, since_week)
+    )
+    cursor.execute(f"""
+        INSERT INTO metric_weekly (metric_name, week_start, value)
+        SELECT ?, {week_expr} AS week, COUNT(*)
+        FROM {table}
+        WHERE {date_column} >= ? AND {condition}
+        GROUP BY week
+        HAVING week IS NOT NULL
+    """, (metric, since_week))
+
+
+def recount_sql(metric: str) -> str:
+    """SQL replacing a metric's weekly values with a recount over full history.
+
+    For migrations that change a metric's definition: paste its output into the
+    migration as text, since the definition may change again later. The
+    summary row is dropped and rebuilt by the next update_baselines().
+    """
+    table, date_column, condition = METRICS[metric]
+    return f"""
+DELETE FROM metric_weekly WHERE metric_name = '{metric}';
+INSERT INTO metric_weekly (metric_name, week_start, value)
+SELECT '{metric}', {week_expression(date_column)} AS week, COUNT(*)
+FROM {table}
+WHERE {condition}
+GROUP BY week
+HAVING week IS NOT NULL;
+DELETE FROM metric_baselines WHERE metric_name = '{metric}';
+"""
+
+
+def refresh_baseline(conn: sqlite3.Connection, metric: str, window_weeks: int = BASELINE_WINDOW_WEEKS):
+    """Recompute the rolling statistics row for a metric from its weekly values."""
+    table, date_column, _ = METRICS[metric]
+    cursor = conn.cursor()
+
+    # Only complete weeks count; weeks with no rows are real zeros once the source has data
+    current_week = week_start(datetime.utcnow())
+    cursor.execute(f"SELECT MIN(substr({date_column}, 1, 10)) FROM {table}")
+    first_date = cursor.fetchone()[0]
+    if not first_date:
+        cursor.execute("DELETE FROM metric_baselines WHERE metric_name = ?", (metric,))
+        return
+
+    first_week = datetime.strptime(week_start(datetime.strptime(first_date, '%Y-%m-%d')), '%Y-%m-%d')
+    window_start = datetime.strptime(current_week, '%Y-%m-%d') - timedelta(weeks=window_weeks)
+    start = max(first_week, window_start)
+
+    cursor.execute("""
+        SELECT week_start, value FROM metric_weekly
+        WHERE metric_name = ? AND week_start >= ? AND week_start < ?
+    """, (metric, start.strftime('%Y-%m-%d'), current_week))
+    observed = dict(cursor.fetchall())
+
+    # Gap-fill the calendar between the window start and the current week
+    values = []
+    week = start
+    while week.strftime('%Y-%m-%d') < current_week:
+        values.append(observed.get(week.strftime('%Y-%m-%d'), 0.0))
+        week += timedelta(weeks=1)
+
+    if not values:
+        cursor.execute("DELETE FROM metric_baselines WHERE metric_name = ?", (metric,))
+        return
+
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+    ordered = sorted(values)
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO metric_baselines
+        (metric_name, window_weeks, sample_weeks, mean, std, p10, p50, p90, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """, (
+        metric, window_weeks, len(values), mean, std,
+        percentile(ordered, 10), percentile(ordered, 50), percentile(ordered, 90)
+    ))
+
+
+def update_baselines(conn: sqlite3.Connection, since: Optional[str] = None) -> int:
+    """Refresh weekly values touched since `since` and every metric's baseline row.
+
+    Pass since=None to rebuild from all history. Returns the number of metrics updated.
+    """
+    for metric in METRICS:
+        refresh_weekly_values(conn, metric, since)
+        refresh_baseline(conn, metric)
+
+    conn.commit()
+    return len(METRICS)
+
+
+def get_baseline(conn: sqlite3.Connection, metric: str) -> Optional[Dict]:
+    """Look up a metric's rolling baseline (None if missing or too little history)."""
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT sample_weeks, mean, std, p10, p50, p90
+            FROM metric_baselines
+            WHERE metric_name = ?
+        """, (metric,))
+    except sqlite3.OperationalError:
+        return None  # Table not created yet (run init_database.py)
+
+    row = cursor.fetchone()
+    if not row or row[0] < MIN_BASELINE_WEEKS:
+        return None
+
+    sample_weeks, mean, std, p10, p50, p90 = row
+    return {
+        'sample_weeks': sample_weeks,
+        'mean': mean,
+        'std': std,
+        'p10': p10,
+        'p50': p50,
+        'p90': p90
+    }
+
+
+def relative_intensity(weekly_value: float, baseline: Optional[Dict], normal: float = 50,
+                       cap: float = 100) -> Optional[float]:
+    """Scale a weekly value against its baseline mean (baseline mean = `normal`).
+
+    Returns None when there is no usable baseline, so callers keep their fixed fallback.
+    """
+    if not baseline or baseline['mean'] <= 0:
+        return None
+    return min(weekly_value / baseline['mean'] * normal, cap)
+
+
+def main():
+    """Main execution."""
+    rebuild = '--rebuild' in sys.argv
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        if rebuild:
+            print("🔄 Rebuilding baselines from full history...")
+            update_baselines(conn)
+
+        print(f"\n📏 Rolling baselines (last {BASELINE_WINDOW_WEEKS} complete weeks)\n")
+        print("| Metric | Weeks | Mean | Std | P10 | P50 | P90 |")
+        print("|--------|-------|------|-----|-----|-----|-----|")
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT metric_name, sample_weeks, mean, std, p10, p50, p90
+            FROM metric_baselines
+            ORDER BY metric_name
+        """)
+        for name, weeks, mean, std, p10, p50, p90 in cursor.fetchall():
+            print(f"| {name} | {weeks} | {mean:.1f} | {std:.1f} | {p10:.1f} | {p50:.1f} | {p90:.1f} |")
+
+        print(f"\nℹ️  Baselines need {MIN_BASELINE_WEEKS}+ complete weeks before intensity scoring uses them.")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
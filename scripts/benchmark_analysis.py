@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analysis Scale Benchmarks
+Times each analysis entry point (trend series, fig tree intensities, newsletter
+queries, baselines, event resolution, search) against synthetic databases at
+several multiples of live data volume, to show which queries stop scaling.
+
+Databases are built by generate_synthetic_data.py on first use and reused
+from data/synthetic/ afterwards. Entry points that write (trends, baselines,
+event resolution) are idempotent once caught up; each is called once to warm
+up, then timed as the best of --repeat calls.
+
+Usage:
+    python benchmark_analysis.py [--scales 1 10 100] [--years 2] [--repeat 3] [--only earthquake]
+"""
+
+import sys
+import io
+import time
+import sqlite3
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+import analyze_fig_tree_pattern as fig_tree
+import generate_newsletter as newsletter
+from baselines import update_baselines
+from event_resolution import resolve_events
+from generate_synthetic_data import generate, synthetic_db_path
+from init_database import apply_migrations
+from ingest_data import calculate_trends
+from predict_trends import get_earthquake_time_series
+from search_articles import FAMINE_QUERY, search
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+TABLES = ['earthquakes', 'disasters', 'conflicts', 'worldbank_news', 'economic_indicators', 'events']
+
+
+def _last_week() -> str:
+    return (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+
+
+# Entry points as the pipeline calls them: label -> function(conn)
+ENTRY_POINTS: Dict[str, Callable[[sqlite3.Connection], object]] = {
+    'predict_trends.get_earthquake_time_series': get_earthquake_time_series,
+    'fig_tree.get_j0_wars_intensity': fig_tree.get_j0_wars_intensity,
+    'fig_tree.get_j0_earthquakes_intensity': fig_tree.get_j0_earthquakes_intensity,
+    'fig_tree.get_j0_famines_intensity': fig_tree.get_j0_famines_intensity,
+    'fig_tree.get_h0_economic_intensity': fig_tree.get_h0_economic_intensity,
+    'newsletter.get_fig_tree_data': newsletter.get_fig_tree_data,
+    'newsletter.get_earthquake_summary': newsletter.get_earthquake_summary,
+    'newsletter.get_conflicts_summary': newsletter.get_conflicts_summary,
+    'newsletter.get_economic_status': newsletter.get_economic_status,
+    'newsletter.get_last_week_comparison': newsletter.get_last_week_comparison,
+    'search_articles.search (famine)': lambda conn: search(conn, FAMINE_QUERY),
+    'ingest_data.calculate_trends': calculate_trends,
+    'baselines.update_baselines (last week)': lambda conn: update_baselines(conn, _last_week()),
+    'event_resolution.resolve_events': resolve_events,
+}
+
+
+def time_entry_point(conn: sqlite3.Connection, func: Callable, repeat: int) -> float:
+    """Best of repeat calls in seconds, after one warm-up call (console output discarded)."""
+    sink = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    best = float('inf')
+    with redirect_stdout(sink):
+        func(conn)
+        conn.commit()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(conn)
+            conn.commit()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def open_dataset(scale: float, years: float, regenerate: bool) -> sqlite3.Connection:
+    """Connection to the synthetic database for a scale, generating it if needed.
+
+    Databases built by an older schema are migrated first.
+    """
+    path = synthetic_db_path(scale, years)
+    if regenerate or not path.exists():
+        generate(path, scale, years)
+        print()
+    conn = sqlite3.connect(path)
+    apply_migrations(conn)
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time analysis entry points against synthetic data at several scales.")
+    parser.add_argument("--scales", type=float, nargs='+', default=[1, 10, 100],
+                        help="Data volume multiples (default: 1 10 100).")
+    parser.add_argument("--years", type=float, default=2, help="Years of synthetic history (default: 2).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per entry point (default: 3).")
+    parser.add_argument("--only", default=None, help="Only entry points whose name contains this text.")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild the synthetic databases first.")
+    args = parser.parse_args()
+
+    selected = [name for name in ENTRY_POINTS if not args.only or args.only in name]
+    if not selected:
+        print(f"❌ No entry point matches '{args.only}'")
+        sys.exit(1)
+
+    timings: Dict[str, List[float]] = {name: [] for name in selected}
+    rows: Dict[str, List[int]] = {table: [] for table in TABLES}
+
+    for scale in args.scales:
+        conn = open_dataset(scale, args.years, args.regenerate)
+        try:
+            for table in TABLES:
+                rows[table].append(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+            for name in selected:
+                timings[name].append(time_entry_point(conn, ENTRY_POINTS[name], args.repeat))
+                print(f"   ⏱️  {scale:g}× {name}: {timings[name][-1]:.3f}s", file=sys.stderr)
+        finally:
+            conn.close()
+
+    header = ' | '.join(f"{scale:g}×" for scale in args.scales)
+    divider = '|'.join('-' * (len(f"{scale:g}×") + 2) for scale in args.scales)
+    growth = len(args.scales) > 1
+
+    print(f"## Analysis benchmarks ({args.years:g} years of synthetic history, best of {args.repeat})\n")
+    print(f"| Table | {header} |")
+    print(f"|-------|{divider}|")
+    for table, counts in rows.items():
+        print(f"| {table} | {' | '.join(f'{count:,}' for count in counts)} |")
+
+    print(f"\n| Entry point | {header} |{' Growth |' if growth else ''}")
+    print(f"|-------------|{divider}|{'--------|' if growth else ''}")
+    for name, seconds in sorted(timings.items(), key=lambda item: item[1][-1], reverse=True):
+        cells = ' | '.join(f"{value * 1000:.1f} ms" for value in seconds)
+        # Largest vs smallest scale: matching the data growth is a full scan, far below it is index-bound
+        ratio = f" {seconds[-1] / seconds[0]:.0f}× |" if growth and seconds[0] > 0 else (' — |' if growth else '')
+        print(f"| {name} | {cells} |{ratio}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feed Parsing & Pipeline Benchmarks
+Reproducible, offline benchmarks over the pinned fixture corpus in
+data/fixtures/feeds/ (or a local recording: --fixtures data/fixtures/recorded).
+
+Default: runs each fetcher's parse_* function on its recorded feed (optionally
+scaled N× with synthetic items) and reports items/sec, MB/s and peak memory
+(tracemalloc). --pipeline instead serves the corpus from a local replay server
+with the given latency and runs the whole fetch → parse → store engine
+(sources.py) into a temporary database: once timed, once under tracemalloc.
+Dates are rebased so the corpus is as fresh as when it was recorded, and the
+same items fall inside --days on every run.
+
+Usage:
+    python benchmark_feeds.py [--scale 100] [--repeat 3]
+    python benchmark_feeds.py --pipeline [--scale 10] [--latency-ms 200] [--days 30]
+"""
+
+import sys
+import io
+import os
+import re
+import time
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from rate_limit import REPLAY_SERVER_ENV
+from replay_server import FIXTURES_DIR, ReplayStore, load_manifest, make_server, scale_feed
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Recorded feeds age; parse everything they contain
+DAYS_BACK = 36500
+MIN_MAGNITUDE = 4.0
+
+ITEM_PATTERN = re.compile(r'<(?:\w+:)?(?:item|entry)[\s>]')
+
+
+def parser_for(fixture: str) -> Optional[Callable[[str], List]]:
+    """The parse_* function that reads a fixture (None for feeds parsed inside fetch code)."""
+    if fixture.startswith('usgs_'):
+        from fetch_earthquakes import parse_earthquakes
+        return lambda content: parse_earthquakes(content, MIN_MAGNITUDE, DAYS_BACK)
+    if fixture == 'gdacs.xml':
+        from fetch_gdacs import parse_disasters
+        return lambda content: parse_disasters(content, 'Green', DAYS_BACK)
+    if fixture == 'un_peacekeeping.xml':
+        from fetch_un_peacekeeping import parse_news
+        return lambda content: parse_news(content, DAYS_BACK)
+    if fixture == 'fred_news.xml':
+        from fetch_fred_news import parse_announcements
+        return lambda content: parse_announcements(content, DAYS_BACK)
+    if fixture == 'eff_news.xml':
+        from fetch_eff_news import parse_rss
+        return lambda content: parse_rss(content, DAYS_BACK)
+    if fixture == 'worldbank_news.xml':
+        from fetch_worldbank_news import parse_news
+        return lambda content: parse_news(content, DAYS_BACK)
+    return None
+
+
+def count_items(content: str) -> int:
+    """Items in a feed body (RSS items / Atom entries / GeoJSON features)."""
+    if content.lstrip().startswith('{'):
+        return content.count('"type": "Feature"') or content.count('"type":"Feature"')
+    return len(ITEM_PATTERN.findall(content))
+
+
+def bench_parser(parse: Callable[[str], List], content: str, repeat: int) -> Dict:
+    """Best-of-repeat parse time, then one traced run for peak memory."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = parse(content)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'output': len(items), 'seconds': best, 'peak_bytes': peak}
+
+
+def run_parse_benchmarks(fixtures_dir: Path, scale: int, repeat: int):
+    print(f"## Feed parsing ({scale}× corpus, best of {repeat})\n")
+    print("| Feed | Input Items | Kept | Size (MB) | Time (ms) | Items/sec | MB/s | Peak Memory (MB) |")
+    print("|------|-------------|------|-----------|-----------|-----------|------|------------------|")
+
+    for entry in load_manifest(fixtures_dir):
+        parse = parser_for(entry['file'])
+        if parse is None:
+            continue
+        content = scale_feed((fixtures_dir / entry['file']).read_bytes(), scale).decode('utf-8')
+        size_mb = len(content.encode('utf-8')) / 1e6
+        inputs = count_items(content)
+
+        r = bench_parser(parse, content, repeat)
+        rate = inputs / r['seconds'] if r['seconds'] > 0 else float('inf')
+        print(f"| {entry['file']} | {inputs:,} | {r['output']:,} | {size_mb:.2f} | {r['seconds'] * 1000:.1f} | "
+              f"{rate:,.0f} | {size_mb / r['seconds']:.1f} | {r['peak_bytes'] / 1e6:.1f} |")
+
+
+def pipeline_once(days: int, traced: bool = False) -> tuple:
+    """One fetch → parse → store run into a fresh database and HTTP cache.
+
+    Returns (results, wall seconds, peak traced bytes or None).
+    """
+    import sources
+    from init_database import apply_migrations
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        sources.CACHE_DIR = Path(work_dir) / 'http'
+        conn = sqlite3.connect(Path(work_dir) / 'bench.db')
+        apply_migrations(conn)
+
+        if traced:
+            tracemalloc.start()
+        started = time.perf_counter()
+        results = asyncio.run(sources.run_sources(conn, sources.SOURCES.values(), days))
+        elapsed = time.perf_counter() - started
+        peak = None
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        conn.close()
+
+    return results, elapsed, peak
+
+
+def run_pipeline_benchmark(fixtures_dir: Path, scale: int, latency_ms: float, days: int):
+    store = ReplayStore(fixtures_dir, scale, rebase=True)
+    server = make_server(store, port=0, latency_ms=latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ[REPLAY_SERVER_ENV] = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"## Pipeline ({scale}× corpus, {latency_ms:g} ms latency, past {days} days)\n")
+    try:
+        # Timed run first; tracing slows Python down, so peak memory comes from a second run
+        results, elapsed, _ = pipeline_once(days)
+        _, _, peak = pipeline_once(days, traced=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("| Source | Items | Stored | Time (s) | Status |")
+    print("|--------|-------|--------|----------|--------|")
+    for key, r in results.items():
+        status = f"❌ {r['error']}" if r['error'] else '✅'
+        print(f"| {key} | {r['items']:,} | {r['inserted']:,} | {r['seconds']:.2f} | {status} |")
+
+    total = sum(r['items'] for r in results.values())
+    print(f"\n⏱️  Wall time: {elapsed:.2f}s, {total / elapsed:,.0f} items/sec, peak memory {peak / 1e6:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feed parsers and the ingest pipeline on recorded fixtures.")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR,
+                        help=f"Fixture directory (default: {FIXTURES_DIR}).")
+    parser.add_argument("--scale", type=int, default=1, help="Make every feed N× larger (default: 1).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per parser (default: 3).")
+    parser.add_argument("--pipeline", action='store_true',
+                        help="Benchmark fetch → parse → store through a local replay server.")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Replay server latency (default: 0).")
+    parser.add_argument("--days", type=int, default=30, help="Days requested in --pipeline mode (default: 30).")
+    args = parser.parse_args()
+
+    if not load_manifest(args.fixtures):
+        print(f"❌ No fixtures in {args.fixtures}. Run: python scripts/replay_server.py record")
+        sys.exit(1)
+
+    if args.pipeline:
+        run_pipeline_benchmark(args.fixtures, args.scale, args.latency_ms, args.days)
+    else:
+        run_parse_benchmarks(args.fixtures, args.scale, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
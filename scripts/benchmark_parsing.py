@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parsing Micro-Benchmarks
+Times the shared parsing helpers against the per-script code they replaced,
+on large batches of synthetic articles (no network needed).
+
+Usage:
+    python benchmark_parsing.py [--articles 10000] [--only classifier|html|dates]
+"""
+
+import sys
+import io
+import time
+import random
+import re
+import argparse
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from date_parsing import parse_feed_date
+from keyword_matcher import KeywordMatcher
+from text_cleaning import clean_html
+import fetch_un_peacekeeping
+import fetch_worldbank_news
+import fetch_fred_news
+import fetch_eff_news
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+FILLER_WORDS = [
+    'the', 'united', 'nations', 'mission', 'reported', 'on', 'tuesday', 'that', 'local',
+    'officials', 'in', 'region', 'have', 'said', 'talks', 'will', 'continue', 'next',
+    'week', 'with', 'partners', 'according', 'to', 'statement', 'from', 'office', 'of',
+    'district', 'council', 'members', 'program', 'support', 'community', 'training'
+]
+
+# Every keyword list used by the article classifiers
+KEYWORD_LISTS = {
+    'war': fetch_un_peacekeeping.WAR_KEYWORDS,
+    'casualty': fetch_un_peacekeeping.CASUALTY_KEYWORDS,
+    'humanitarian': fetch_un_peacekeeping.HUMANITARIAN_KEYWORDS,
+    'poverty': fetch_worldbank_news.POVERTY_KEYWORDS,
+    'disaster': fetch_worldbank_news.DISASTER_KEYWORDS,
+    'economic_crisis': fetch_worldbank_news.ECONOMIC_KEYWORDS,
+    'economic_data': fetch_fred_news.RELEVANT_KEYWORDS,
+    'b2': fetch_eff_news.B2_KEYWORDS,
+}
+
+ALL_KEYWORDS = [kw for keywords in KEYWORD_LISTS.values() for kw in keywords]
+
+
+def make_articles(count: int, words: int = 80, seed: int = 42) -> List[str]:
+    """Build synthetic article texts with a sprinkling of tracked keywords."""
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        tokens = [rng.choice(FILLER_WORDS) for _ in range(words)]
+        for _ in range(rng.randint(0, 4)):
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(ALL_KEYWORDS))
+        articles.append(' '.join(tokens))
+    return articles
+
+
+def time_call(func: Callable, items: List) -> float:
+    """Return seconds taken to call func on every item."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return time.perf_counter() - start
+
+
+def bench_classifier(count: int) -> List[Dict]:
+    """Per-keyword substring scans vs. one compiled pass, for one feed's lists and for all lists."""
+    articles = make_articles(count)
+    rows = []
+
+    scenarios = {
+        'UN lists': {k: KEYWORD_LISTS[k] for k in ('war', 'casualty', 'humanitarian')},
+        'all lists': KEYWORD_LISTS,
+    }
+
+    for label, categories in scenarios.items():
+        def legacy(text, categories=categories):
+            combined = text.lower()
+            return {name: [kw for kw in kws if kw in combined] for name, kws in categories.items()}
+
+        matcher = KeywordMatcher(categories)
+        size = sum(len(kws) for kws in categories.values())
+
+        rows.append({'name': f'classifier ({label}, {size} kw): substring scans',
+                     'seconds': time_call(legacy, articles), 'items': count})
+        rows.append({'name': f'classifier ({label}, {size} kw): KeywordMatcher',
+                     'seconds': time_call(matcher.match, articles), 'items': count})
+
+    return rows
+
+
+def legacy_clean_html(text: str) -> str:
+    """The per-script clean_html that text_cleaning.clean_html replaced."""
+    if text is None:
+        return ""
+    clean = re.sub('<.*?>', '', text)
+    clean = clean.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    clean = clean.replace('&quot;', '"').replace('&#39;', "'")
+    clean = clean.replace('&#8230;', '...').replace('&nbsp;', ' ')
+    clean = re.sub(r'\s+', ' ', clean).strip()
+    return clean
+
+
+def make_html_descriptions(count: int, seed: int = 42) -> List[str]:
+    """Wrap synthetic articles in typical feed-description markup and entities."""
+    rng = random.Random(seed)
+    entities = ['&amp;', '&nbsp;', '&#8230;', '&rsquo;', '&#x2014;', '&quot;']
+    descriptions = []
+    for text in make_articles(count, words=60, seed=seed):
+        words = text.split()
+        for _ in range(4):
+            words.insert(rng.randrange(len(words)), rng.choice(entities))
+        half = len(words) // 2
+        descriptions.append(
+            f'<p class="lead">{" ".join(words[:half])}</p>\n'
+            f'<p>{" ".join(words[half:])} <a href="https://example.org/story">Read more</a></p>'
+        )
+    return descriptions
+
+
+def bench_html(count: int) -> List[Dict]:
+    """Uncompiled regex + chained str.replace vs. precompiled regex + html.unescape."""
+    descriptions = make_html_descriptions(count)
+    return [
+        {'name': 'clean_html: per-script copy', 'seconds': time_call(legacy_clean_html, descriptions), 'items': count},
+        {'name': 'clean_html: text_cleaning', 'seconds': time_call(clean_html, descriptions), 'items': count},
+    ]
+
+
+# Timestamp layouts seen in the feeds, with the strptime format each fetcher used
+DATE_FORMATS = [
+    ('%a, %d %b %Y %H:%M:%S GMT', '%a, %d %b %Y %H:%M:%S %Z'),    # GDACS, World Bank
+    ('%a, %d %b %Y %H:%M:%S +0000', '%a, %d %b %Y %H:%M:%S %z'),  # FRED, EFF
+    ('%Y-%m-%dT%H:%M:%S.000Z', None),                              # USGS Atom
+    ('%Y-%m-%d %H:%M:%S.000', '%Y-%m-%d %H:%M:%S.%f'),             # NOAA alerts
+]
+
+
+def legacy_parse_date(text: str) -> datetime:
+    """The per-script strptime calls that date_parsing.parse_feed_date replaced."""
+    if text[:4].isdigit():
+        if 'T' in text:
+            return datetime.strptime(text[:19], '%Y-%m-%dT%H:%M:%S')
+        return datetime.strptime(text, '%Y-%m-%d %H:%M:%S.%f')
+    if text.endswith('GMT'):
+        return datetime.strptime(text, '%a, %d %b %Y %H:%M:%S %Z')
+    return datetime.strptime(text, '%a, %d %b %Y %H:%M:%S %z').replace(tzinfo=None)
+
+
+def make_timestamps(count: int, distinct: int, seed: int = 42) -> List[str]:
+    """Build feed timestamps in every layout, drawn from `distinct` instants."""
+    rng = random.Random(seed)
+    base = datetime(2025, 12, 1)
+    instants = [base + timedelta(seconds=rng.randrange(30 * 86400)) for _ in range(distinct)]
+    return [rng.choice(instants).strftime(rng.choice(DATE_FORMATS)[0]) for _ in range(count)]
+
+
+def bench_dates(count: int) -> List[Dict]:
+    """strptime per item vs. the shared parser, cold (all unique) and with repeats."""
+    unique = make_timestamps(count, distinct=count)
+    repeated = make_timestamps(count, distinct=max(1, count // 20))
+    rows = []
+
+    for label, timestamps in (('unique', unique), ('5% distinct', repeated)):
+        parse_feed_date.cache_clear()
+        rows.append({'name': f'dates ({label}): strptime', 'seconds': time_call(legacy_parse_date, timestamps), 'items': count})
+        rows.append({'name': f'dates ({label}): parse_feed_date', 'seconds': time_call(parse_feed_date, timestamps), 'items': count})
+
+    return rows
+
+
+BENCHMARKS = {
+    'classifier': bench_classifier,
+    'html': bench_html,
+    'dates': bench_dates,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared parsing helpers.")
+    parser.add_argument("--articles", type=int, default=10000,
+                        help="Number of synthetic items per benchmark (default: 10000).")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), default=None,
+                        help="Run a single benchmark.")
+    args = parser.parse_args()
+
+    selected = [args.only] if args.only else list(BENCHMARKS)
+
+    print(f"## Parsing benchmarks ({args.articles:,} items each)\n")
+    print("| Benchmark | Total (s) | Per item (µs) | Items/sec |")
+    print("|-----------|-----------|---------------|-----------|")
+
+    for key in selected:
+        for row in BENCHMARKS[key](args.articles):
+            per_item = row['seconds'] / row['items'] * 1e6
+            rate = row['items'] / row['seconds'] if row['seconds'] > 0 else float('inf')
+            print(f"| {row['name']} | {row['seconds']:.3f} | {per_item:.1f} | {rate:,.0f} |")
+
+
+if __name__ == '__main__':
+    main()
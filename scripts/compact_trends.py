@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trends Table Compaction
+Keeps the `trends` table small as daily ingests and forecasts accumulate.
+
+Rows are unique per (metric_name, period_start, period_end, model_version), so
+re-runs update in place. What still grows is the history of rolling metrics
+(a new avg_earthquakes_per_week window every day). Compaction:
+    1. Drops rows whose period ended more than --retention-days ago
+    2. Beyond --detail-days, keeps only the newest row per metric, model and week
+
+Runs automatically at the end of ingest_data.py.
+
+Usage:
+    python compact_trends.py [--detail-days 90] [--retention-days 730]
+"""
+
+import sys
+import io
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from baselines import week_expression
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+DETAIL_DAYS = 90
+RETENTION_DAYS = 730
+
+
+def compact_trends(conn: sqlite3.Connection, detail_days: int = DETAIL_DAYS,
+                   retention_days: int = RETENTION_DAYS) -> Dict[str, int]:
+    """Expire and thin old trend rows. Returns counts of rows removed."""
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM trends WHERE period_end < date('now', ?)", (f'-{retention_days} days',))
+    expired = cursor.rowcount
+
+    detail_cutoff = f'-{detail_days} days'
+    cursor.execute(f"""
+        DELETE FROM trends
+        WHERE period_end < date('now', ?)
+          AND id NOT IN (
+              SELECT MAX(id) FROM trends
+              WHERE period_end < date('now', ?)
+              GROUP BY metric_name, model_version, {week_expression('period_end')}
+          )
+    """, (detail_cutoff, detail_cutoff))
+    compacted = cursor.rowcount
+
+    conn.commit()
+    return {'expired': expired, 'compacted': compacted}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expire and thin old rows in the trends table.")
+    parser.add_argument("--detail-days", type=int, default=DETAIL_DAYS,
+                        help=f"Keep every row for this many days (default: {DETAIL_DAYS}).")
+    parser.add_argument("--retention-days", type=int, default=RETENTION_DAYS,
+                        help=f"Drop rows whose period ended longer ago (default: {RETENTION_DAYS}).")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        before = conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0]
+        stats = compact_trends(conn, args.detail_days, args.retention_days)
+        after = conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0]
+
+        print("🧹 Trends compaction")
+        print(f"   Expired (older than {args.retention_days} days): {stats['expired']}")
+        print(f"   Thinned to one row per week (older than {args.detail_days} days): {stats['compacted']}")
+        print(f"   Rows: {before} → {after}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Feed Date Parser
+Parses the timestamps found in RSS, Atom and JSON feeds into naive UTC datetimes,
+the form every fetcher compares against its cutoff date.
+
+Handles RFC 822 dates ("Wed, 24 Dec 2025 12:21:47 GMT", "... +0000", "... EST")
+and ISO 8601 dates ("2025-12-26T06:25:33.040Z", "2025-12-26 12:00:00.000").
+Timezone offsets are applied rather than dropped, and results are memoized:
+feeds repeat the same timestamps across items and runs.
+
+Usage:
+    from date_parsing import parse_feed_date
+
+    pub_date = parse_feed_date(pubdate_elem.text)  # -> datetime (UTC) or None
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+UTC_ZONES = {'GMT', 'UTC', 'UT', 'Z', '+0000', '-0000'}
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC (naive values are assumed to be UTC already)."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_rfc822_fast(text: str) -> Optional[datetime]:
+    """Parse the common "Day, DD Mon YYYY HH:MM:SS ZONE" layout without strptime.
+
+    Returns None for anything else, leaving it to the general parser.
+    """
+    parts = text.split()
+    if len(parts) != 6 or parts[2] not in MONTHS:
+        return None
+
+    _, day, month, year, clock, zone = parts
+    clock_parts = clock.split(':')
+    if len(clock_parts) != 3:
+        return None
+
+    try:
+        value = datetime(int(year), MONTHS[month], int(day),
+                         int(clock_parts[0]), int(clock_parts[1]), int(clock_parts[2]))
+    except ValueError:
+        return None
+
+    if zone in UTC_ZONES:
+        return value
+
+    # Numeric offset, e.g. "-0500"
+    if len(zone) == 5 and zone[0] in '+-' and zone[1:].isdigit():
+        offset = timedelta(hours=int(zone[1:3]), minutes=int(zone[3:5]))
+        return value - offset if zone[0] == '+' else value + offset
+
+    return None  # Named zone such as "EST"
+
+
+@lru_cache(maxsize=4096)
+def parse_feed_date(text: Optional[str]) -> Optional[datetime]:
+    """Parse an RFC 822 or ISO 8601 feed timestamp into a naive UTC datetime.
+
+    Returns None if the text is empty or not a recognised date.
+    """
+    if not text:
+        return None
+    text = text.strip()
+
+    # ISO 8601 starts with the year
+    if text[:4].isdigit():
+        if text.endswith('Z'):
+            text = text[:-1] + '+00:00'
+        try:
+            return _to_naive_utc(datetime.fromisoformat(text))
+        except ValueError:
+            return None
+
+    value = _parse_rfc822_fast(text)
+    if value is not None:
+        return value
+
+    try:
+        return _to_naive_utc(parsedate_to_datetime(text))
+    except (TypeError, ValueError, IndexError):
+        return None
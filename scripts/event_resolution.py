@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cross-Source Event Resolution
+Links reports of the same real-world event (a USGS earthquake, the GDACS alert
+for it, World Bank news about it) to one canonical row in `events`, so
+aggregations count each event once.
+
+Reports are clustered by event type, time window and distance. Candidate events
+are looked up through a 1-degree spatial grid (`events.grid_cell`, indexed with
+type and date), so each report is compared only with nearby, recent events.
+News articles carry no coordinates; they are linked when they name an event's
+hazard and country within a week of it.
+
+Usage:
+    python event_resolution.py [--rebuild]
+"""
+
+import sys
+import io
+import math
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# Spatial grid cell size (degrees)
+GRID_DEGREES = 1.0
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+KM_PER_DEGREE = 111.2
+
+# Matching rules per event type: (time window, max distance in km)
+MATCH_RULES = {
+    'Earthquake': (timedelta(days=1), 150),
+}
+DEFAULT_MATCH_RULE = (timedelta(days=3), 300)
+
+# Reports of the same earthquake never differ by more than this
+MAX_MAGNITUDE_GAP = 0.5
+
+# News is linked to events from up to a week before publication
+NEWS_WINDOW = timedelta(days=7)
+
+# Words a news headline uses for each event type
+HAZARD_TERMS = {
+    'Earthquake': ('earthquake', 'quake', 'tremor'),
+    'Tropical Cyclone': ('cyclone', 'hurricane', 'typhoon', 'tropical storm'),
+    'Flood': ('flood',),
+    'Drought': ('drought',),
+    'Volcano': ('volcan', 'eruption'),
+}
+
+MAGNITUDE_RE = re.compile(r'Magnitude\s+(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+
+def parse_stored_date(text: str) -> datetime:
+    """Parse a stored 'YYYY-MM-DD HH:MM UTC' or 'YYYY-MM-DD' date."""
+    if len(text) >= 16:
+        return datetime.strptime(text[:16], '%Y-%m-%d %H:%M')
+    return datetime.strptime(text[:10], '%Y-%m-%d')
+
+
+def format_date(value: datetime) -> str:
+    """Format a datetime the way date_utc columns store it."""
+    return value.strftime('%Y-%m-%d %H:%M UTC')
+
+
+def grid_cell(latitude: float, longitude: float) -> int:
+    """Return the grid cell number containing a point."""
+    row = int(math.floor((latitude + 90) / GRID_DEGREES))
+    column = int(math.floor((longitude + 180) / GRID_DEGREES)) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def neighbor_cells(latitude: float, longitude: float, radius_km: float) -> List[int]:
+    """Return every grid cell within radius_km of a point (wrapping at the date line)."""
+    lat_span = math.ceil(radius_km / (KM_PER_DEGREE * GRID_DEGREES))
+    lon_km = KM_PER_DEGREE * GRID_DEGREES * max(math.cos(math.radians(latitude)), 0.01)
+    lon_span = min(math.ceil(radius_km / lon_km), GRID_COLUMNS // 2)
+
+    center = grid_cell(latitude, longitude)
+    center_row, center_column = divmod(center, GRID_COLUMNS)
+
+    cells = []
+    for row in range(center_row - lat_span, center_row + lat_span + 1):
+        if row < 0 or row * GRID_DEGREES >= 180:
+            continue
+        for offset in range(-lon_span, lon_span + 1):
+            cells.append(row * GRID_COLUMNS + (center_column + offset) % GRID_COLUMNS)
+    return cells
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+def region_of(location: str) -> Optional[str]:
+    """Country/region part of a location ("45 km S of Town, Indonesia" -> "Indonesia")."""
+    if not location or location == 'Unknown':
+        return None
+    return location.rsplit(',', 1)[-1].strip() or None
+
+
+def mentions_region(region: str, text: str) -> bool:
+    """Whether text names a region as a whole word.
+
+    Two-letter regions (USGS's US state codes: "CA", "NV") are skipped; they
+    match inside ordinary words and abbreviations far more often than not.
+    """
+    if len(region) < 3:
+        return False
+    return re.search(rf'\b{re.escape(region)}\b', text, re.IGNORECASE) is not None
+
+
+def load_unlinked_reports(conn: sqlite3.Connection, source_table: str) -> List[Dict]:
+    """Load earthquake/disaster rows not yet linked to an event, oldest first."""
+    cursor = conn.cursor()
+
+    if source_table == 'earthquakes':
+        cursor.execute("""
+            SELECT q.id, 'Earthquake', q.date_utc, q.magnitude, q.location, q.latitude, q.longitude
+            FROM earthquakes q
+            LEFT JOIN event_sources s ON s.source_table = 'earthquakes' AND s.source_id = q.id
+            WHERE s.source_id IS NULL
+            ORDER BY q.date_utc
+        """)
+    else:
+        cursor.execute("""
+            SELECT d.id, d.disaster_type, d.date_utc, d.severity_description, d.location, d.latitude, d.longitude
+            FROM disasters d
+            LEFT JOIN event_sources s ON s.source_table = 'disasters' AND s.source_id = d.id
+            WHERE s.source_id IS NULL
+            ORDER BY d.date_utc
+        """)
+
+    reports = []
+    for row_id, event_type, date_utc, magnitude, location, latitude, longitude in cursor.fetchall():
+        if source_table == 'disasters':
+            # GDACS severity reads "Magnitude 6.2M, Depth:10km"
+            match = MAGNITUDE_RE.search(magnitude or '')
+            magnitude = float(match.group(1)) if match else None
+
+        try:
+            date = parse_stored_date(date_utc)
+        except ValueError:
+            continue
+
+        reports.append({
+            'id': row_id,
+            'event_type': event_type,
+            'date': date,
+            'magnitude': magnitude,
+            'location': location,
+            'latitude': latitude,
+            'longitude': longitude,
+        })
+    return reports
+
+
+def find_matching_event(cursor: sqlite3.Cursor, report: Dict, source_table: str) -> Optional[int]:
+    """Return the id of the nearest existing event this report describes, if any.
+
+    Reports without coordinates can't be placed and always start their own event.
+    An event never absorbs two reports from the same source table.
+    """
+    if report['latitude'] is None or report['longitude'] is None:
+        return None
+
+    window, max_km = MATCH_RULES.get(report['event_type'], DEFAULT_MATCH_RULE)
+    cells = neighbor_cells(report['latitude'], report['longitude'], max_km)
+
+    cursor.execute(f"""
+        SELECT id, latitude, longitude, magnitude
+        FROM events
+        WHERE event_type = ?
+          AND grid_cell IN ({','.join('?' * len(cells))})
+          AND date_utc BETWEEN ? AND ?
+          AND NOT EXISTS (
+              SELECT 1 FROM event_sources
+              WHERE event_sources.event_id = events.id AND event_sources.source_table = ?
+          )
+    """, (
+        report['event_type'], *cells,
+        format_date(report['date'] - window), format_date(report['date'] + window),
+        source_table
+    ))
+
+    best_id, best_km = None, max_km
+    for event_id, latitude, longitude, magnitude in cursor.fetchall():
+        if magnitude is not None and report['magnitude'] is not None \
+                and abs(magnitude - report['magnitude']) > MAX_MAGNITUDE_GAP:
+            continue
+        distance = haversine_km(report['latitude'], report['longitude'], latitude, longitude)
+        if distance <= best_km:
+            best_id, best_km = event_id, distance
+
+    return best_id
+
+
+def link_report(cursor: sqlite3.Cursor, report: Dict, source_table: str, event_id: Optional[int]) -> bool:
+    """Attach a report to an event (creating one if event_id is None). True if a new event was created."""
+    has_point = report['latitude'] is not None and report['longitude'] is not None
+
+    if event_id is None:
+        cursor.execute("""
+            INSERT INTO events
+            (event_type, date_utc, magnitude, location, region, latitude, longitude, grid_cell, source_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+        """, (
+            report['event_type'],
+            format_date(report['date']),
+            report['magnitude'],
+            report['location'],
+            region_of(report['location']),
+            report['latitude'],
+            report['longitude'],
+            grid_cell(report['latitude'], report['longitude']) if has_point else None
+        ))
+        event_id = cursor.lastrowid
+        created = True
+    else:
+        # Keep the earliest time and the largest reported magnitude
+        cursor.execute("""
+            UPDATE events
+            SET date_utc = MIN(date_utc, ?),
+                magnitude = MAX(COALESCE(magnitude, ?), COALESCE(?, magnitude))
+            WHERE id = ?
+        """, (format_date(report['date']), report['magnitude'], report['magnitude'], event_id))
+        created = False
+
+    cursor.execute(
+        "INSERT INTO event_sources (source_table, source_id, event_id) VALUES (?, ?, ?)",
+        (source_table, report['id'], event_id)
+    )
+    cursor.execute("UPDATE events SET source_count = source_count + 1 WHERE id = ?", (event_id,))
+    return created
+
+
+def link_news(conn: sqlite3.Connection, since: Optional[str] = None) -> int:
+    """Link World Bank articles naming an event's hazard and country. Returns articles linked."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT n.id, n.date, n.headline, n.description
+        FROM worldbank_news n
+        LEFT JOIN event_sources s ON s.source_table = 'worldbank_news' AND s.source_id = n.id
+        WHERE s.source_id IS NULL AND n.date >= ?
+    """, (since[:10] if since else '0000-00-00',))
+
+    linked = 0
+    for news_id, date, headline, description in cursor.fetchall():
+        text = f"{headline} {description or ''}".lower()
+        try:
+            published = parse_stored_date(date)
+        except ValueError:
+            continue
+
+        for event_type, terms in HAZARD_TERMS.items():
+            if not any(term in text for term in terms):
+                continue
+
+            cursor.execute("""
+                SELECT id, region FROM events
+                WHERE event_type = ? AND date_utc BETWEEN ? AND ? AND region IS NOT NULL
+                ORDER BY date_utc DESC
+            """, (event_type, format_date(published - NEWS_WINDOW), format_date(published + timedelta(days=1))))
+
+            event_id = next((eid for eid, region in cursor.fetchall() if mentions_region(region, text)), None)
+            if event_id is not None:
+                cursor.execute(
+                    "INSERT INTO event_sources (source_table, source_id, event_id) VALUES (?, ?, ?)",
+                    ('worldbank_news', news_id, event_id)
+                )
+                cursor.execute("UPDATE events SET source_count = source_count + 1 WHERE id = ?", (event_id,))
+                linked += 1
+                break
+
+    return linked
+
+
+def resolve_events(conn: sqlite3.Connection, since: Optional[str] = None) -> Dict[str, int]:
+    """Link every unlinked report to a canonical event.
+
+    Earthquakes and disasters are always fully caught up; news is only scanned
+    from `since` (YYYY-MM-DD) onwards. Returns counts of reports linked and events created.
+    """
+    cursor = conn.cursor()
+    stats = {'reports': 0, 'created': 0, 'merged': 0, 'news_linked': 0}
+
+    for source_table in ('earthquakes', 'disasters'):
+        for report in load_unlinked_reports(conn, source_table):
+            event_id = find_matching_event(cursor, report, source_table)
+            if link_report(cursor, report, source_table, event_id):
+                stats['created'] += 1
+            else:
+                stats['merged'] += 1
+            stats['reports'] += 1
+
+    stats['news_linked'] = link_news(conn, since)
+    conn.commit()
+    return stats
+
+
+def rebuild_events(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Discard all events and links and resolve every report from scratch."""
+    conn.execute("DELETE FROM event_sources")
+    conn.execute("DELETE FROM events")
+    return resolve_events(conn)
+
+
+def main():
+    """Main execution."""
+    rebuild = '--rebuild' in sys.argv
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        if rebuild:
+            print("🔄 Rebuilding events from all reports...")
+            stats = rebuild_events(conn)
+        else:
+            stats = resolve_events(conn)
+
+        print(f"🔗 Linked {stats['reports']} report(s): {stats['created']} new event(s), "
+              f"{stats['merged']} merged into existing events, {stats['news_linked']} news article(s)\n")
+
+        print("| Event Type | Unique Events | Reports | Multi-Source Events |")
+        print("|------------|---------------|---------|---------------------|")
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT event_type, COUNT(*), SUM(source_count), SUM(source_count > 1)
+            FROM events
+            GROUP BY event_type
+            ORDER BY COUNT(*) DESC
+        """)
+        for event_type, events, reports, multi in cursor.fetchall():
+            print(f"| {event_type} | {events} | {reports} | {multi} |")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
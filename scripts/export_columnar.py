@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar Database Export
+Snapshots every table in prophecy_tracking.db to columnar Arrow files,
+partitioned by week, for fast analytical scans.
+
+Layout:
+    data/columnar/<table>/week=YYYY-MM-DD/part-0.arrow   (tables with a date column)
+    data/columnar/<table>/all/part-0.arrow                (everything else)
+    data/columnar/_manifest.json
+
+Arrow IPC files are uncompressed, so readers memory-map them and hand numeric
+columns to NumPy without copying or parsing rows (see load_columns). Use
+--format parquet for smaller files to share with other tools.
+
+Usage:
+    python export_columnar.py [--since YYYY-MM-DD] [--format arrow|parquet] [--output data/columnar]
+
+Requires: pip install pyarrow
+"""
+
+import sys
+import io
+import os
+import json
+import shutil
+import sqlite3
+import argparse
+import time
+from datetime import datetime
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# Try to import pyarrow (required for this script only)
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+from baselines import week_expression
+
+DB_PATH = Path("data/prophecy_tracking.db")
+EXPORT_DIR = Path("data/columnar")
+
+# Column each table is partitioned on (week of this date)
+PARTITION_COLUMNS = {
+    'earthquakes': 'date_utc',
+    'disasters': 'date_utc',
+    'events': 'date_utc',
+    'conflicts': 'date',
+    'economic_indicators': 'date',
+    'worldbank_news': 'date',
+    'trends': 'period_start',
+    'weekly_assessments': 'week_start',
+    'metric_weekly': 'week_start',
+}
+
+UNPARTITIONED = 'all'
+
+FILE_EXTENSIONS = {'arrow': 'arrow', 'parquet': 'parquet'}
+
+
+def exportable_tables(conn: sqlite3.Connection) -> List[str]:
+    """Regular tables, skipping SQLite internals and virtual tables (R*Tree, FTS) with their shadow tables."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' ORDER BY name")
+    rows = cursor.fetchall()
+
+    virtual = [name for name, sql in rows if sql and sql.upper().startswith('CREATE VIRTUAL')]
+    return [
+        name for name, sql in rows
+        if not name.startswith('sqlite_')
+        and name not in virtual
+        and not any(name.startswith(v + '_') for v in virtual)
+    ]
+
+
+def arrow_schema(conn: sqlite3.Connection, table: str) -> 'pa.Schema':
+    """Map a table's declared SQLite column types to an Arrow schema."""
+    fields = []
+    for _, name, declared, _, _, _ in conn.execute(f"PRAGMA table_info({table})").fetchall():
+        declared = (declared or '').upper()
+        if 'INT' in declared:
+            arrow_type = pa.int64()
+        elif 'REAL' in declared or 'FLOA' in declared or 'DOUB' in declared:
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_partition(rows: List[tuple], schema: 'pa.Schema', path: Path, file_format: str):
+    """Write one partition's rows as a single columnar file (atomically)."""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+
+    if file_format == 'parquet':
+        pq.write_table(table, tmp_path)
+    else:
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with ipc.new_file(sink, schema) as writer:
+                writer.write_table(table)
+
+    os.replace(tmp_path, path)
+
+
+def export_table(conn: sqlite3.Connection, table: str, output: Path, file_format: str,
+                 since_week: Optional[str] = None) -> Dict:
+    """Export one table, rewriting partitions from since_week onwards (all if None)."""
+    schema = arrow_schema(conn, table)
+    columns = ', '.join(schema.names)
+    table_dir = output / table
+    filename = f"part-0.{FILE_EXTENSIONS[file_format]}"
+    date_column = PARTITION_COLUMNS.get(table)
+
+    if date_column is None or since_week is None:
+        shutil.rmtree(table_dir, ignore_errors=True)
+
+    if date_column is None:
+        rows = conn.execute(f"SELECT {columns} FROM {table}").fetchall()
+        write_partition(rows, schema, table_dir / UNPARTITIONED / filename, file_format)
+        return {'rows': len(rows), 'partitions': 1, 'partitioned_by': None}
+
+    week_expr = week_expression(date_column)
+    cursor = conn.execute(f"""
+        SELECT COALESCE({week_expr}, 'unknown') AS week, {columns}
+        FROM {table}
+        WHERE {week_expr} >= ? OR ? IS NULL
+        ORDER BY week
+    """, (since_week, since_week))
+
+    total = 0
+    partitions = 0
+    for week, group in groupby(cursor, key=lambda row: row[0]):
+        rows = [row[1:] for row in group]
+        partition_dir = table_dir / f"week={week}"
+        shutil.rmtree(partition_dir, ignore_errors=True)
+        write_partition(rows, schema, partition_dir / filename, file_format)
+        total += len(rows)
+        partitions += 1
+
+    return {'rows': total, 'partitions': partitions, 'partitioned_by': date_column}
+
+
+def load_columns(table: str, columns: List[str], since_week: Optional[str] = None,
+                 root: Path = EXPORT_DIR) -> Dict:
+    """Load selected columns of an exported table as NumPy arrays.
+
+    Arrow files are memory-mapped and only the requested columns are read, so
+    no rows pass through Python; partitions are concatenated column by column.
+    Pass since_week (YYYY-MM-DD) to skip older week partitions entirely.
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow is required: pip install pyarrow")
+
+    tables = []
+    for path in sorted((root / table).glob('*/part-0.*')):
+        partition = path.parent.name
+        if since_week and partition.startswith('week=') and partition[5:] < since_week:
+            continue
+
+        if path.suffix == '.parquet':
+            tables.append(pq.read_table(path, columns=columns, memory_map=True))
+        else:
+            with pa.memory_map(str(path), 'r') as source:
+                tables.append(ipc.open_file(source).read_all().select(columns))
+
+    if not tables:
+        return {name: None for name in columns}
+
+    combined = pa.concat_tables(tables)
+    return {
+        name: combined.column(name).combine_chunks().to_numpy(zero_copy_only=False)
+        for name in columns
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the tracking database to week-partitioned columnar files.")
+    parser.add_argument("--since", type=str, default=None,
+                        help="Only rewrite partitions for weeks on/after this date (YYYY-MM-DD). Default: full export.")
+    parser.add_argument("--format", choices=sorted(FILE_EXTENSIONS), default='arrow',
+                        help="arrow (memory-mappable, default) or parquet (compressed).")
+    parser.add_argument("--output", type=Path, default=EXPORT_DIR,
+                        help=f"Output directory (default: {EXPORT_DIR}).")
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        print("❌ PyArrow not installed. Install with: pip install pyarrow")
+        sys.exit(1)
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    since_week = None
+    if args.since:
+        try:
+            from baselines import week_start
+            since_week = week_start(datetime.strptime(args.since, '%Y-%m-%d'))
+        except ValueError:
+            print("❌ --since must use the format YYYY-MM-DD")
+            sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        scope = f"weeks from {since_week}" if since_week else "full snapshot"
+        print(f"📦 Exporting {DB_PATH} → {args.output} ({args.format}, {scope})\n")
+        print("| Table | Rows Written | Partitions | Partitioned By |")
+        print("|-------|--------------|------------|----------------|")
+
+        started = time.monotonic()
+        manifest_path = args.output / '_manifest.json'
+        manifest = {'tables': {}}
+        if since_week and manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+
+        for table in exportable_tables(conn):
+            stats = export_table(conn, table, args.output, args.format, since_week)
+            print(f"| {table} | {stats['rows']} | {stats['partitions']} | {stats['partitioned_by'] or '—'} |")
+            total_rows = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            manifest['tables'][table] = {
+                'rows': total_rows,
+                'partitioned_by': stats['partitioned_by'],
+                'format': args.format
+            }
+
+        manifest['exported_at'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')
+        args.output.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+        print(f"\n✅ Export complete in {time.monotonic() - started:.1f}s")
+        print(f"   Manifest: {manifest_path}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
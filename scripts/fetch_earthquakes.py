@@ -6,16 +6,29 @@ Fetches and parses earthquake data from USGS ATOM feed.
 Filters for magnitude 4.0+ earthquakes for prophecy tracking (node J0).
 
 Usage:
-    python fetch_earthquakes.py [--min-mag 4.0] [--days 7]
+    python fetch_earthquakes.py [--min-mag 4.0] [--days 7] [--incremental]
+
+With --incremental, the time window starts at the newest earthquake already
+stored in the database, and the smallest USGS feed covering that gap is used.
+Gaps longer than the month feed are queried from the FDSN API in 30-day
+slices; gaps over a year only fetch the last year (backfill_earthquakes.py
+imports the rest).
 """
 
 import sys
 import io
+import json
+import sqlite3
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List, Dict
-import urllib.request
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
 import urllib.error
+import urllib.parse
+
+from date_parsing import parse_feed_date
+from rate_limit import urlopen
+from tracing import traced
 
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
@@ -29,6 +42,25 @@ FEEDS = {
     "month": "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/all_month.atom",
 }
 
+# Time span covered by each summary feed (smallest first)
+FEED_SPANS = [
+    ("hour", timedelta(hours=1)),
+    ("day", timedelta(days=1)),
+    ("week", timedelta(days=7)),
+    ("month", timedelta(days=30)),
+]
+
+# FDSN event query API (used for gaps longer than the month feed covers)
+FDSN_QUERY_URL = "https://earthquake.usgs.gov/fdsnws/event/1/query"
+
+# FDSN answers HTTP 400 above 20000 matching events, so gaps are queried in
+# slices (a month of M4+ is ~1500 events) and capped; longer gaps are backfilled
+FDSN_SLICE = timedelta(days=30)
+FDSN_LIMIT = 20000
+MAX_INCREMENTAL_GAP = timedelta(days=365)
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
 # XML namespaces
 NS = {
     'atom': 'http://www.w3.org/2005/Atom',
@@ -39,13 +71,82 @@ NS = {
 def fetch_feed(feed_url: str) -> str:
     """Fetch USGS earthquake feed."""
     try:
-        with urllib.request.urlopen(feed_url, timeout=10) as response:
+        with urlopen(feed_url, timeout=10) as response:
             return response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"Error fetching feed: {e}", file=sys.stderr)
         sys.exit(1)
 
 
+def get_high_water_mark(db_path: Path = DB_PATH) -> Optional[datetime]:
+    """Return the date of the newest earthquake stored in the database (None if unknown)."""
+    if not db_path.exists():
+        return None
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute("SELECT MAX(date_utc) FROM earthquakes").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not read high-water mark: {e}", file=sys.stderr)
+        return None
+    
+    return parse_stored_date(row[0] if row else None)
+
+
+def parse_stored_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored date_utc value like "2025-12-26 06:25 UTC" (None if missing or malformed)."""
+    if not value:
+        return None
+    
+    try:
+        return datetime.strptime(value[:16], '%Y-%m-%d %H:%M')
+    except ValueError:
+        return None
+
+
+def build_fdsn_url(start_time: datetime, end_time: datetime, min_magnitude: float) -> str:
+    """Build an FDSN event query URL for events in [start_time, end_time)."""
+    params = {
+        'format': 'geojson',
+        'starttime': start_time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'endtime': end_time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'minmagnitude': min_magnitude,
+        'orderby': 'time-asc',
+        'limit': FDSN_LIMIT,
+    }
+    return f"{FDSN_QUERY_URL}?{urllib.parse.urlencode(params)}"
+
+
+def select_feed(window: timedelta, min_magnitude: float = 4.0) -> Tuple[str, List[str]]:
+    """Choose the smallest source covering the time window.
+    
+    Returns (kind, urls) where kind is a FEEDS key (one URL), or 'fdsn' when
+    the window is longer than the month feed (one URL per FDSN_SLICE, at most
+    MAX_INCREMENTAL_GAP back).
+    """
+    for name, span in FEED_SPANS:
+        if window <= span:
+            return name, [FEEDS[name]]
+    
+    now = datetime.utcnow()
+    if window > MAX_INCREMENTAL_GAP:
+        print(f"⚠️  {window.days}-day gap: fetching the last {MAX_INCREMENTAL_GAP.days} days only. "
+              f"Import the rest with: python scripts/backfill_earthquakes.py "
+              f"--start {(now - window).strftime('%Y-%m-%d')}", file=sys.stderr)
+        window = MAX_INCREMENTAL_GAP
+    
+    urls = []
+    start = now - window
+    while start < now:
+        end = min(start + FDSN_SLICE, now)
+        urls.append(build_fdsn_url(start, end, min_magnitude))
+        start = end
+    return 'fdsn', urls
+
+
 def parse_magnitude(title: str) -> float:
     """Extract magnitude from title like 'M 4.4 - 15 km SSE of Fern Forest, Hawaii'"""
     try:
@@ -54,7 +155,8 @@ def parse_magnitude(title: str) -> float:
         return 0.0
 
 
-def parse_earthquakes(xml_content: str, min_magnitude: float = 4.0, days_back: int = 7) -> List[Dict]:
+@traced('parse:usgs_feed', 'parse')
+def parse_earthquakes(xml_content: str, min_magnitude: float = 4.0, days_back: float = 7) -> List[Dict]:
     """Parse earthquake feed and filter by magnitude and date."""
     root = ET.fromstring(xml_content)
     earthquakes = []
@@ -78,9 +180,8 @@ def parse_earthquakes(xml_content: str, min_magnitude: float = 4.0, days_back: i
             continue
         
         # Parse date
-        try:
-            event_date = datetime.strptime(updated_elem.text[:19], '%Y-%m-%dT%H:%M:%S')
-        except ValueError:
+        event_date = parse_feed_date(updated_elem.text)
+        if event_date is None:
             continue
         
         # Filter by date
@@ -110,6 +211,51 @@ def parse_earthquakes(xml_content: str, min_magnitude: float = 4.0, days_back: i
     return earthquakes
 
 
+@traced('parse:usgs_fdsn', 'parse')
+def parse_fdsn_geojson(json_content: Union[str, Dict], min_magnitude: float = 4.0, days_back: float = 7) -> List[Dict]:
+    """Parse an FDSN GeoJSON response (text or already decoded) into the same dicts as parse_earthquakes()."""
+    data = json.loads(json_content) if isinstance(json_content, str) else json_content
+    earthquakes = []
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    
+    for feature in data.get('features', []):
+        props = feature.get('properties') or {}
+        magnitude = props.get('mag')
+        event_time = props.get('time')
+        
+        if magnitude is None or event_time is None:
+            continue
+        
+        # Filter by magnitude
+        if magnitude < min_magnitude:
+            continue
+        
+        # FDSN times are epoch milliseconds (UTC)
+        event_date = datetime.utcfromtimestamp(event_time / 1000)
+        if event_date < cutoff_date:
+            continue
+        
+        # Coordinates are [longitude, latitude, depth]
+        coords = (feature.get('geometry') or {}).get('coordinates') or ['?', '?']
+        
+        earthquake = {
+            'magnitude': round(float(magnitude), 1),
+            'location': props.get('place') or 'Unknown',
+            'date': event_date.strftime('%Y-%m-%d %H:%M UTC'),
+            'latitude': str(coords[1]),
+            'longitude': str(coords[0]),
+            'depth_km': coords[2] if len(coords) > 2 else None,
+            'event_id': feature.get('id') or '',
+            'url': props.get('url') or ''
+        }
+        
+        earthquakes.append(earthquake)
+    
+    # Sort by magnitude (highest first)
+    earthquakes.sort(key=lambda x: x['magnitude'], reverse=True)
+    return earthquakes
+
+
 def format_for_daily_review(earthquakes: List[Dict]) -> str:
     """Format earthquakes for daily review markdown table."""
     if not earthquakes:
@@ -163,7 +309,7 @@ def main():
             idx = sys.argv.index('--min-mag')
             min_mag = float(sys.argv[idx + 1])
         except (IndexError, ValueError):
-            print("Usage: python fetch_earthquakes.py [--min-mag 4.0] [--days 7]")
+            print("Usage: python fetch_earthquakes.py [--min-mag 4.0] [--days 7] [--incremental]")
             sys.exit(1)
     
     if '--days' in sys.argv:
@@ -171,22 +317,32 @@ def main():
             idx = sys.argv.index('--days')
             days = int(sys.argv[idx + 1])
         except (IndexError, ValueError):
-            print("Usage: python fetch_earthquakes.py [--min-mag 4.0] [--days 7]")
+            print("Usage: python fetch_earthquakes.py [--min-mag 4.0] [--days 7] [--incremental]")
             sys.exit(1)
     
-    # Determine which feed to use
-    if days <= 1:
-        feed_url = FEEDS['day']
-    elif days <= 7:
-        feed_url = FEEDS['week']
-    else:
-        feed_url = FEEDS['month']
+    # Determine the time window (from the DB high-water mark if incremental)
+    window = timedelta(days=days)
+    if '--incremental' in sys.argv:
+        high_water = get_high_water_mark()
+        if high_water is not None:
+            window = max(datetime.utcnow() - high_water, timedelta(0))
+            print(f"Newest stored earthquake: {high_water.strftime('%Y-%m-%d %H:%M UTC')}")
+    
+    # Use the smallest feed that covers the window
+    feed_kind, feed_urls = select_feed(window, min_mag)
+    days_back = window.total_seconds() / 86400
     
-    print(f"Fetching earthquakes (magnitude {min_mag}+, past {days} days)...\n")
+    print(f"Fetching earthquakes (magnitude {min_mag}+, past {days_back:.1f} days, source: {feed_kind})...\n")
     
     # Fetch and parse
-    xml_content = fetch_feed(feed_url)
-    earthquakes = parse_earthquakes(xml_content, min_mag, days)
+    earthquakes = []
+    for feed_url in feed_urls:
+        content = fetch_feed(feed_url)
+        if feed_kind == 'fdsn':
+            earthquakes.extend(parse_fdsn_geojson(content, min_mag, days_back))
+        else:
+            earthquakes.extend(parse_earthquakes(content, min_mag, days_back))
+    earthquakes.sort(key=lambda x: x['magnitude'], reverse=True)
     
     # Output results
     print(format_for_daily_review(earthquakes))
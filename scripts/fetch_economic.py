@@ -14,13 +14,14 @@ API Key: Set FRED_API_KEY environment variable in .env file
 import sys
 import io
 import json
-import urllib.request
 import urllib.error
 import urllib.parse
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import os
 
+from rate_limit import urlopen
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -113,7 +114,7 @@ def fetch_series_data(series_id: str, months_back: int = 12) -> Optional[dict]:
     url = f"{FRED_API_BASE}/series/observations?{urllib.parse.urlencode(params)}"
     
     try:
-        with urllib.request.urlopen(url, timeout=10) as response:
+        with urlopen(url, timeout=10) as response:
             data = json.loads(response.read().decode('utf-8'))
             return data
     except urllib.error.HTTPError as e:
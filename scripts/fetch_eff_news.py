@@ -18,6 +18,13 @@ import requests
 from datetime import datetime, timedelta
 import argparse
 
+from date_parsing import parse_feed_date
+from keyword_matcher import KeywordMatcher
+from near_duplicates import NearDuplicateIndex, article_key
+import rate_limit
+from text_cleaning import clean_html
+from tracing import traced
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -35,11 +42,26 @@ B2_KEYWORDS = [
     'payment system', 'cashless', 'digital wallet'
 ]
 
+# Indicators used to classify B2-relevant articles
+HIGH_CONF_INDICATORS = ['mandate', 'requirement', 'law', 'regulation', 'government', 'federal', 'state']
+BIOMETRIC_INDICATORS = ['biometric', 'facial recognition', 'fingerprint', 'iris scan', 'palm scan']
+ID_INDICATORS = ['digital id', 'digital identity', 'age verification', 'authentication']
+PAYMENT_INDICATORS = ['cbdc', 'digital currency', 'cashless', 'payment system']
+
+# All keyword lists compiled once; one pass over the text finds every category
+KEYWORD_MATCHER = KeywordMatcher({
+    'b2': B2_KEYWORDS,
+    'high_conf': HIGH_CONF_INDICATORS,
+    'biometric': BIOMETRIC_INDICATORS,
+    'id': ID_INDICATORS,
+    'payment': PAYMENT_INDICATORS,
+})
+
 
 def fetch_eff_rss(days_ago=7):
     """Fetch EFF blog RSS feed."""
     try:
-        response = requests.get(EFF_RSS_URL, timeout=10)
+        response = rate_limit.get(EFF_RSS_URL, timeout=10)
         response.raise_for_status()
         return response.text
     except requests.exceptions.RequestException as e:
@@ -47,6 +69,7 @@ def fetch_eff_rss(days_ago=7):
         return None
 
 
+@traced('parse:eff_news', 'parse')
 def parse_rss(xml_content, days_ago=7):
     """Parse RSS XML and extract relevant articles."""
     try:
@@ -54,32 +77,30 @@ def parse_rss(xml_content, days_ago=7):
         channel = root.find('channel')
         items = channel.findall('item')
         
-        cutoff_date = datetime.now() - timedelta(days=days_ago)
+        cutoff_date = datetime.utcnow() - timedelta(days=days_ago)
         articles = []
+        duplicates = NearDuplicateIndex('eff_news')
         
         for item in items:
             title = item.find('title').text if item.find('title') is not None else 'N/A'
             link = item.find('link').text if item.find('link') is not None else 'N/A'
             pub_date_str = item.find('pubDate').text if item.find('pubDate') is not None else None
             description_elem = item.find('description')
-            description = description_elem.text if description_elem is not None else ''
+            description = clean_html(description_elem.text) if description_elem is not None else ''
             
             # Parse date (format: "Thu, 13 Nov 2025 17:38:50 +0000")
             if pub_date_str:
-                try:
-                    pub_date = datetime.strptime(pub_date_str, '%a, %d %b %Y %H:%M:%S %z')
-                    pub_date = pub_date.replace(tzinfo=None)  # Remove timezone for comparison
-                except ValueError:
+                pub_date = parse_feed_date(pub_date_str)
+                if pub_date is None:
                     continue
                 
                 if pub_date < cutoff_date:
                     continue
             
             # Check for B2 relevance
-            content_lower = (title + ' ' + description).lower()
-            matched_keywords = [kw for kw in B2_KEYWORDS if kw in content_lower]
+            matched_keywords = KEYWORD_MATCHER.match(title + ' ' + description)['b2']
             
-            if matched_keywords:
+            if matched_keywords and duplicates.add(article_key(link if link != 'N/A' else None, title), title + ' ' + description) is None:
                 articles.append({
                     'title': title,
                     'link': link,
@@ -97,18 +118,13 @@ def parse_rss(xml_content, days_ago=7):
 
 def classify_article(title, keywords, description):
     """Classify article and assign confidence level."""
-    content = (title + ' ' + description).lower()
+    hits = KEYWORD_MATCHER.match(title + ' ' + description)
     
     # High confidence: Multiple B2 keywords + explicit government/mandatory language
-    high_conf_indicators = ['mandate', 'requirement', 'law', 'regulation', 'government', 'federal', 'state']
-    biometric_indicators = ['biometric', 'facial recognition', 'fingerprint', 'iris scan', 'palm scan']
-    id_indicators = ['digital id', 'digital identity', 'age verification', 'authentication']
-    payment_indicators = ['cbdc', 'digital currency', 'cashless', 'payment system']
-    
-    has_high_conf = any(ind in content for ind in high_conf_indicators)
-    has_biometric = any(ind in content for ind in biometric_indicators)
-    has_id = any(ind in content for ind in id_indicators)
-    has_payment = any(ind in content for ind in payment_indicators)
+    has_high_conf = bool(hits['high_conf'])
+    has_biometric = bool(hits['biometric'])
+    has_id = bool(hits['id'])
+    has_payment = bool(hits['payment'])
     
     category = []
     if has_biometric:
@@ -133,6 +149,50 @@ def classify_article(title, keywords, description):
     return ', '.join(category), confidence, relevance
 
 
+def format_for_daily_review(articles, days_ago=7):
+    """Format B2-relevant articles as a daily review markdown table."""
+    output = [f"## EFF Digital Rights News — Node B2 (Commerce Control Patterns)\n"]
+    output.append(f"**Period:** Past {days_ago} days")
+    output.append(f"**B2-relevant articles:** {len(articles)}\n")
+    
+    output.append("| Date | Category | Title | Confidence | B2 Relevance |")
+    output.append("|------|----------|-------|------------|--------------|")
+    
+    for article in articles:
+        date = article['pub_date'].split(' ')[0:4]  # "Thu, 13 Nov 2025"
+        date_str = ' '.join(date)
+        
+        category, confidence, relevance = classify_article(
+            article['title'],
+            article['keywords'],
+            article['description']
+        )
+        
+        # Truncate title for table
+        title_short = article['title'][:60] + '...' if len(article['title']) > 60 else article['title']
+        
+        output.append(f"| {date_str} | {category} | [{title_short}]({article['link']}) | {confidence} | {relevance} |")
+    
+    return "\n".join(output)
+
+
+def format_for_classification_table(articles):
+    """Format Med/High confidence articles for the daily review classification table."""
+    output = ["## For classification table (copy to daily review):\n"]
+    
+    for article in articles:
+        category, confidence, relevance = classify_article(
+            article['title'],
+            article['keywords'],
+            article['description']
+        )
+        
+        if confidence in ['Med', 'High']:
+            output.append(f"| EFF: {category} — {article['title'][:50]}... | Global | B2 | Rev 13:16-17 | Digital ID/Surveillance | {confidence} | [EFF Blog]({article['link']}) Tier 1 |")
+    
+    return "\n".join(output)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch EFF blog RSS for digital rights news.")
     parser.add_argument("--days", type=int, default=7,
@@ -154,27 +214,7 @@ def main():
         print("   (EFF publishes frequently, but not all posts are B2-relevant)")
         return
     
-    print(f"## EFF Digital Rights News — Node B2 (Commerce Control Patterns)\n")
-    print(f"**Period:** Past {args.days} days")
-    print(f"**B2-relevant articles:** {len(articles)}\n")
-    
-    print("| Date | Category | Title | Confidence | B2 Relevance |")
-    print("|------|----------|-------|------------|--------------|")
-    
-    for article in articles:
-        date = article['pub_date'].split(' ')[0:4]  # "Thu, 13 Nov 2025"
-        date_str = ' '.join(date)
-        
-        category, confidence, relevance = classify_article(
-            article['title'],
-            article['keywords'],
-            article['description']
-        )
-        
-        # Truncate title for table
-        title_short = article['title'][:60] + '...' if len(article['title']) > 60 else article['title']
-        
-        print(f"| {date_str} | {category} | [{title_short}]({article['link']}) | {confidence} | {relevance} |")
+    print(format_for_daily_review(articles, args.days))
     
     print("\n## Important Disclaimers\n")
     print("1. **Not Claiming Fulfillment:**")
@@ -199,19 +239,7 @@ def main():
     print("\n" + "="*80 + "\n")
     
     # Output for classification table
-    print("## For classification table (copy to daily review):\n")
-    
-    for article in articles:
-        category, confidence, relevance = classify_article(
-            article['title'],
-            article['keywords'],
-            article['description']
-        )
-        
-        if confidence in ['Med', 'High']:
-            date = article['pub_date'].split(' ')[1:4]  # "13 Nov 2025"
-            date_str = ' '.join(date)
-            print(f"| EFF: {category} — {article['title'][:50]}... | Global | B2 | Rev 13:16-17 | Digital ID/Surveillance | {confidence} | [EFF Blog]({article['link']}) Tier 1 |")
+    print(format_for_classification_table(articles))
     
     print("\n" + "="*80)
     print("\n💡 EFF Blog RSS tracking operational!")
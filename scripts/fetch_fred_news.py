@@ -14,9 +14,13 @@ import io
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import List, Dict
-import urllib.request
 import urllib.error
-import re
+
+from date_parsing import parse_feed_date
+from keyword_matcher import KeywordMatcher
+from rate_limit import urlopen
+from text_cleaning import clean_html
+from tracing import traced
 
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
@@ -37,30 +41,26 @@ RELEVANT_KEYWORDS = [
     'wage', 'income', 'earnings'
 ]
 
+# Compiled once; one pass over the text
+KEYWORD_MATCHER = KeywordMatcher({'relevant': RELEVANT_KEYWORDS})
+
 
 def fetch_feed(feed_url: str) -> str:
     """Fetch FRED news RSS feed."""
     try:
-        with urllib.request.urlopen(feed_url, timeout=10) as response:
+        with urlopen(feed_url, timeout=10) as response:
             return response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"Error fetching feed: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def clean_html(text: str) -> str:
-    """Remove HTML tags from text."""
-    clean = re.sub('<.*?>', '', text)
-    clean = re.sub(r'\s+', ' ', clean).strip()
-    return clean
-
-
 def is_relevant(title: str, description: str) -> bool:
     """Check if announcement is relevant to economic tracking."""
-    combined = (title + ' ' + description).lower()
-    return any(keyword in combined for keyword in RELEVANT_KEYWORDS)
+    return KEYWORD_MATCHER.matches_any(title + ' ' + description)
 
 
+@traced('parse:fred_news', 'parse')
 def parse_announcements(xml_content: str, days_back: int = 30) -> List[Dict]:
     """Parse FRED news feed."""
     root = ET.fromstring(xml_content)
@@ -78,13 +78,8 @@ def parse_announcements(xml_content: str, days_back: int = 30) -> List[Dict]:
             continue
         
         # Parse date
-        try:
-            if pubdate_elem is not None:
-                pub_date = datetime.strptime(pubdate_elem.text, '%a, %d %b %Y %H:%M:%S %z')
-                pub_date = pub_date.replace(tzinfo=None)  # Remove timezone for comparison
-            else:
-                continue
-        except ValueError:
+        pub_date = parse_feed_date(pubdate_elem.text) if pubdate_elem is not None else None
+        if pub_date is None:
             continue
         
         # Filter by date
@@ -14,9 +14,12 @@ import io
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import List, Dict
-import urllib.request
 import urllib.error
 
+from date_parsing import parse_feed_date
+from rate_limit import urlopen
+from tracing import traced
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -53,13 +56,14 @@ ALERT_LEVELS = {
 def fetch_feed(feed_url: str) -> str:
     """Fetch GDACS RSS feed."""
     try:
-        with urllib.request.urlopen(feed_url, timeout=10) as response:
+        with urlopen(feed_url, timeout=10) as response:
             return response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"Error fetching feed: {e}", file=sys.stderr)
         sys.exit(1)
 
 
+@traced('parse:gdacs', 'parse')
 def parse_disasters(xml_content: str, min_alert_level: str = 'Green', days_back: int = 30) -> List[Dict]:
     """Parse GDACS RSS feed and filter by alert level and date."""
     root = ET.fromstring(xml_content)
@@ -78,12 +82,8 @@ def parse_disasters(xml_content: str, min_alert_level: str = 'Green', days_back:
             continue
         
         # Parse date
-        try:
-            if pubdate_elem is not None:
-                pub_date = datetime.strptime(pubdate_elem.text, '%a, %d %b %Y %H:%M:%S %Z')
-            else:
-                continue
-        except ValueError:
+        pub_date = parse_feed_date(pubdate_elem.text) if pubdate_elem is not None else None
+        if pub_date is None:
             continue
         
         # Filter by date
@@ -97,6 +97,9 @@ def parse_disasters(xml_content: str, min_alert_level: str = 'Green', days_back:
         country = item.find('gdacs:country', NS)
         population = item.find('gdacs:population', NS)
         fromdate = item.find('gdacs:fromdate', NS)
+        event_id = item.find('gdacs:eventid', NS)
+        lat = item.find('geo:Point/geo:lat', NS)
+        lon = item.find('geo:Point/geo:long', NS)
         
         # Get disaster type
         disaster_type = DISASTER_TYPES.get(event_type.text if event_type is not None else 'Unknown', 'Unknown')
@@ -120,14 +123,15 @@ def parse_disasters(xml_content: str, min_alert_level: str = 'Green', days_back:
         pop_value = population.get('value', '0') if population is not None else '0'
         
         # Get event date
+        event_date = parse_feed_date(fromdate.text) if fromdate is not None else None
+        event_date_str = (event_date or pub_date).strftime('%Y-%m-%d %H:%M UTC')
+        
+        # Get coordinates (used to link GDACS and USGS reports of the same event)
         try:
-            if fromdate is not None:
-                event_date = datetime.strptime(fromdate.text, '%a, %d %b %Y %H:%M:%S %Z')
-                event_date_str = event_date.strftime('%Y-%m-%d %H:%M UTC')
-            else:
-                event_date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
-        except ValueError:
-            event_date_str = pub_date.strftime('%Y-%m-%d %H:%M UTC')
+            latitude = float(lat.text) if lat is not None else None
+            longitude = float(lon.text) if lon is not None else None
+        except (TypeError, ValueError):
+            latitude = longitude = None
         
         # Build disaster dict
         disaster = {
@@ -139,6 +143,9 @@ def parse_disasters(xml_content: str, min_alert_level: str = 'Green', days_back:
             'country': country_text,
             'population_affected': f"{pop_text} ({pop_value} people)" if pop_value != '0' else 'Unknown',
             'date': event_date_str,
+            'latitude': latitude,
+            'longitude': longitude,
+            'event_id': f"{event_type.text}{event_id.text}" if event_type is not None and event_id is not None else link_elem.text,
             'url': link_elem.text
         }
         
@@ -19,6 +19,9 @@ import json
 from datetime import datetime, timedelta
 import argparse
 
+from date_parsing import parse_feed_date
+import rate_limit
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -30,22 +33,21 @@ NOAA_MAG_URL = "https://services.swpc.noaa.gov/products/solar-wind/mag-1-day.jso
 def fetch_space_weather_alerts(days_ago=7):
     """Fetch space weather alerts from NOAA."""
     try:
-        response = requests.get(NOAA_ALERTS_URL, timeout=10)
+        response = rate_limit.get(NOAA_ALERTS_URL, timeout=10)
         response.raise_for_status()
         alerts = response.json()
         
         # Filter by date
-        cutoff_date = datetime.now() - timedelta(days=days_ago)
+        cutoff_date = datetime.utcnow() - timedelta(days=days_ago)
         recent_alerts = []
         
         for alert in alerts:
             alert_date_str = alert.get('issue_datetime', '')
-            try:
-                alert_date = datetime.strptime(alert_date_str, '%Y-%m-%d %H:%M:%S.%f')
-                if alert_date >= cutoff_date:
-                    recent_alerts.append(alert)
-            except ValueError:
+            alert_date = parse_feed_date(alert_date_str)
+            if alert_date is None:
                 continue  # Skip if date parsing fails
+            if alert_date >= cutoff_date:
+                recent_alerts.append(alert)
         
         return recent_alerts
     
@@ -57,7 +59,7 @@ def fetch_space_weather_alerts(days_ago=7):
 def fetch_magnetic_field_data():
     """Fetch 24-hour magnetic field data from NOAA."""
     try:
-        response = requests.get(NOAA_MAG_URL, timeout=10)
+        response = rate_limit.get(NOAA_MAG_URL, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -13,11 +13,17 @@ import sys
 import io
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import List, Dict
-import urllib.request
+from typing import List, Dict, Optional
 import urllib.error
 import re
 
+from date_parsing import parse_feed_date
+from keyword_matcher import KeywordMatcher
+from near_duplicates import NearDuplicateIndex, article_key
+from rate_limit import urlopen
+from text_cleaning import clean_html
+from tracing import traced
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -42,32 +48,28 @@ HUMANITARIAN_KEYWORDS = [
     'aid', 'relief', 'famine', 'starvation', 'persecution'
 ]
 
+# Words that mark active fighting (not just an ongoing conflict)
+ACTIVE_CONFLICT_KEYWORDS = ['offensive', 'fighting', 'attack']
+
+# All keyword lists compiled once; one pass over the text finds every category
+KEYWORD_MATCHER = KeywordMatcher({
+    'war': WAR_KEYWORDS,
+    'casualty': CASUALTY_KEYWORDS,
+    'humanitarian': HUMANITARIAN_KEYWORDS,
+    'active': ACTIVE_CONFLICT_KEYWORDS,
+})
+
 
 def fetch_feed(feed_url: str) -> str:
     """Fetch UN Peacekeeping RSS feed."""
     try:
-        with urllib.request.urlopen(feed_url, timeout=10) as response:
+        with urlopen(feed_url, timeout=10) as response:
             return response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"Error fetching feed: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def clean_html(text: str) -> str:
-    """Remove HTML tags and entities from text."""
-    if text is None:
-        return ""
-    # Remove HTML tags
-    clean = re.sub('<.*?>', '', text)
-    # Decode HTML entities
-    clean = clean.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    clean = clean.replace('&quot;', '"').replace('&#39;', "'")
-    clean = clean.replace('&nbsp;', ' ')
-    # Normalize whitespace
-    clean = re.sub(r'\s+', ' ', clean).strip()
-    return clean
-
-
 def extract_numbers(text: str) -> List[str]:
     """Extract significant numbers from text (casualties, displaced, etc.)."""
     # Match patterns like "2.39 million", "90%", "1,140", "77 per cent"
@@ -88,12 +90,14 @@ def extract_numbers(text: str) -> List[str]:
 
 def classify_article(title: str, description: str) -> Dict[str, any]:
     """Classify article by relevance to prophecy nodes."""
-    combined = (title + ' ' + description).lower()
+    combined = title + ' ' + description
     
     # Check for conflict/war
-    war_matches = [kw for kw in WAR_KEYWORDS if kw in combined]
-    casualty_matches = [kw for kw in CASUALTY_KEYWORDS if kw in combined]
-    humanitarian_matches = [kw for kw in HUMANITARIAN_KEYWORDS if kw in combined]
+    hits = KEYWORD_MATCHER.match(combined)
+    war_matches = hits['war']
+    casualty_matches = hits['casualty']
+    humanitarian_matches = hits['humanitarian']
+    active_conflict = bool(hits['active'])
     
     # Extract numbers (casualties, displaced, etc.)
     numbers = extract_numbers(title + ' ' + description)
@@ -101,7 +105,7 @@ def classify_article(title: str, description: str) -> Dict[str, any]:
     # Determine confidence
     if casualty_matches and numbers:
         confidence = 'High'  # Verifiable casualty numbers
-    elif war_matches and ('offensive' in combined or 'fighting' in combined or 'attack' in combined):
+    elif war_matches and active_conflict:
         confidence = 'High'  # Active conflict
     elif humanitarian_matches and numbers:
         confidence = 'Med'  # Humanitarian crisis with numbers
@@ -113,7 +117,7 @@ def classify_article(title: str, description: str) -> Dict[str, any]:
     # Determine category
     if casualty_matches:
         category = 'Casualties'
-    elif 'offensive' in combined or 'fighting' in combined or 'attack' in combined:
+    elif active_conflict:
         category = 'Active Conflict'
     elif humanitarian_matches:
         category = 'Humanitarian Crisis'
@@ -133,26 +137,24 @@ def classify_article(title: str, description: str) -> Dict[str, any]:
     }
 
 
-def parse_pubdate(pubdate_text: str) -> datetime:
-    """Parse publication date from UN Peacekeeping feed."""
+def parse_pubdate(pubdate_text: str) -> Optional[datetime]:
+    """Parse publication date from UN Peacekeeping feed (UTC, None if unparseable)."""
     # The feed has HTML in pubDate, extract the date string
-    clean = clean_html(pubdate_text)
-    
-    try:
-        # Format: "Wed, 24 Dec 2025 12:21:47 EST"
-        return datetime.strptime(clean, '%a, %d %b %Y %H:%M:%S %Z')
-    except ValueError:
-        try:
-            # Try without timezone
-            return datetime.strptime(clean.rsplit(' ', 1)[0], '%a, %d %b %Y %H:%M:%S')
-        except ValueError:
-            return datetime.utcnow()
+    # Format: "Wed, 24 Dec 2025 12:21:47 EST"
+    return parse_feed_date(clean_html(pubdate_text))
 
 
-def parse_news(xml_content: str, days_back: int = 30) -> List[Dict]:
-    """Parse UN Peacekeeping news feed."""
+@traced('parse:un_peacekeeping', 'parse')
+def parse_news(xml_content: str, days_back: int = 30, duplicates: NearDuplicateIndex = None) -> List[Dict]:
+    """Parse UN Peacekeeping news feed.
+    
+    Lightly edited republications of a story already seen (in this feed, or
+    in `duplicates` when a persisted index is passed) are skipped.
+    """
     root = ET.fromstring(xml_content)
     articles = []
+    if duplicates is None:
+        duplicates = NearDuplicateIndex('conflicts')
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
     
     for item in root.findall('.//item'):
@@ -165,12 +167,8 @@ def parse_news(xml_content: str, days_back: int = 30) -> List[Dict]:
             continue
         
         # Parse date
-        try:
-            if pubdate_elem is not None:
-                pub_date = parse_pubdate(pubdate_elem.text)
-            else:
-                continue
-        except Exception:
+        pub_date = parse_pubdate(pubdate_elem.text) if pubdate_elem is not None else None
+        if pub_date is None:
             continue
         
         # Filter by date
@@ -186,6 +184,9 @@ def parse_news(xml_content: str, days_back: int = 30) -> List[Dict]:
         if not classification['relevant']:
             continue  # Skip irrelevant articles
         
+        if duplicates.add(article_key(link_elem.text, title), title + ' ' + description) is not None:
+            continue  # Near-duplicate of an article already kept
+        
         article = {
             'title': title,
             'description': description[:200] + '...' if len(description) > 200 else description,
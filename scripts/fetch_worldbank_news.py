@@ -15,9 +15,14 @@ import os
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import List, Dict
-import urllib.request
 import urllib.error
-import re
+
+from date_parsing import parse_feed_date
+from keyword_matcher import KeywordMatcher
+from near_duplicates import NearDuplicateIndex, article_key
+from rate_limit import urlopen
+from text_cleaning import clean_html
+from tracing import traced
 
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
@@ -59,62 +64,60 @@ ECONOMIC_KEYWORDS = [
     'currency crisis', 'trade collapse', 'market crash'
 ]
 
+# Confidence indicators
+IMPACT_KEYWORDS = ['billion', 'million', 'deaths', 'destroyed']
+TREND_KEYWORDS = ['increase', 'crisis', 'forecast']
+
+# All keyword lists compiled once; one pass over the text finds every category
+KEYWORD_MATCHER = KeywordMatcher({
+    'poverty': POVERTY_KEYWORDS,
+    'disaster': DISASTER_KEYWORDS,
+    'economic': ECONOMIC_KEYWORDS,
+    'impact': IMPACT_KEYWORDS,
+    'trend': TREND_KEYWORDS,
+})
+
 
 def fetch_feed(feed_url: str) -> str:
     """Fetch World Bank news RSS feed."""
     try:
-        with urllib.request.urlopen(feed_url, timeout=10) as response:
+        with urlopen(feed_url, timeout=10) as response:
             return response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"Error fetching feed: {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def clean_html(text: str) -> str:
-    """Remove HTML tags and entities from text."""
-    if text is None:
-        return ""
-    # Remove HTML tags
-    clean = re.sub('<.*?>', '', text)
-    # Decode HTML entities
-    clean = clean.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    clean = clean.replace('&quot;', '"').replace('&#39;', "'")
-    clean = clean.replace('&#8230;', '...').replace('&nbsp;', ' ')
-    # Normalize whitespace
-    clean = re.sub(r'\s+', ' ', clean).strip()
-    return clean
-
-
 def classify_article(title: str, description: str) -> Dict[str, any]:
     """Classify article by relevance to prophecy nodes."""
-    combined = (title + ' ' + description).lower()
+    hits = KEYWORD_MATCHER.match(title + ' ' + description)
     
     nodes = []
     keywords_found = []
     
     # Check for poverty/famine (J0)
-    poverty_matches = [kw for kw in POVERTY_KEYWORDS if kw in combined]
+    poverty_matches = hits['poverty']
     if poverty_matches:
         nodes.append('J0')
         keywords_found.extend(poverty_matches[:2])  # Top 2
     
     # Check for disasters (J0)
-    disaster_matches = [kw for kw in DISASTER_KEYWORDS if kw in combined]
+    disaster_matches = hits['disaster']
     if disaster_matches:
         if 'J0' not in nodes:
             nodes.append('J0')
         keywords_found.extend(disaster_matches[:2])
     
     # Check for economic crisis (H0)
-    economic_matches = [kw for kw in ECONOMIC_KEYWORDS if kw in combined]
+    economic_matches = hits['economic']
     if economic_matches:
         nodes.append('H0')
         keywords_found.extend(economic_matches[:2])
     
     # Determine confidence
-    if disaster_matches and any(x in combined for x in ['billion', 'million', 'deaths', 'destroyed']):
+    if disaster_matches and hits['impact']:
         confidence = 'High'
-    elif poverty_matches and any(x in combined for x in ['increase', 'crisis', 'forecast']):
+    elif poverty_matches and hits['trend']:
         confidence = 'Med'
     elif economic_matches:
         confidence = 'Med'
@@ -129,10 +132,17 @@ def classify_article(title: str, description: str) -> Dict[str, any]:
     }
 
 
-def parse_news(xml_content: str, days_back: int = 7) -> List[Dict]:
-    """Parse World Bank news feed."""
+@traced('parse:worldbank', 'parse')
+def parse_news(xml_content: str, days_back: int = 7, duplicates: NearDuplicateIndex = None) -> List[Dict]:
+    """Parse World Bank news feed.
+    
+    Lightly edited republications of a story already seen (in this feed, or
+    in `duplicates` when a persisted index is passed) are skipped.
+    """
     root = ET.fromstring(xml_content)
     articles = []
+    if duplicates is None:
+        duplicates = NearDuplicateIndex('worldbank_news')
     cutoff_date = datetime.utcnow() - timedelta(days=days_back)
     
     for item in root.findall('.//item'):
@@ -145,13 +155,9 @@ def parse_news(xml_content: str, days_back: int = 7) -> List[Dict]:
             continue
         
         # Parse date
-        try:
-            if pubdate_elem is not None:
-                # Format: "Fri, 26 Dec 2025 05:46:24 GMT"
-                pub_date = datetime.strptime(pubdate_elem.text, '%a, %d %b %Y %H:%M:%S %Z')
-            else:
-                continue
-        except ValueError:
+        # Format: "Fri, 26 Dec 2025 05:46:24 GMT"
+        pub_date = parse_feed_date(pubdate_elem.text) if pubdate_elem is not None else None
+        if pub_date is None:
             continue
         
         # Filter by date
@@ -167,6 +173,9 @@ def parse_news(xml_content: str, days_back: int = 7) -> List[Dict]:
         if not classification['relevant']:
             continue  # Skip irrelevant articles
         
+        if duplicates.add(article_key(link_elem.text, title), title + ' ' + description) is not None:
+            continue  # Near-duplicate of an article already kept
+        
         article = {
             'title': title,
             'description': description[:150] + '...' if len(description) > 150 else description,
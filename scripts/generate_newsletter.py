@@ -43,9 +43,20 @@ except ImportError:
     print("⚠️  OpenAI not installed. Install with: pip install openai")
     print("   Newsletter will use template-based content (still functional)\n")
 
+from baselines import get_baseline, relative_intensity
+from event_resolution import resolve_events
+from geo_index import assign_geohashes, describe_region_summary, get_region_summary
+from init_database import apply_migrations
+from rollups import MAJOR_BAND, rollup_totals
+from search_articles import FAMINE_QUERY, match_condition
+from tracing import span
+
 SCRIPTS_DIR = Path(__file__).parent
 DB_PATH = Path("data/prophecy_tracking.db")
 
+# Fallback when there is not enough history for a data-derived baseline
+DEFAULT_QUAKE_BASELINE = 68  # ~68 magnitude 4.0+ quakes/week
+
 # Load API keys from environment variables (NOT hardcoded!)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 FRED_API_KEY = os.getenv('FRED_API_KEY')
@@ -57,6 +68,13 @@ if HAS_OPENAI and not OPENAI_API_KEY:
     print("   To enable AI enhancement: Set OPENAI_API_KEY in .env file\n")
 
 
+def _earthquake_counts(conn: sqlite3.Connection, since: str, until: str = None) -> tuple:
+    """(earthquakes, major earthquakes) among resolved events, from the weekly rollups."""
+    totals = [row for row in rollup_totals(conn, 'events', since, until) if row['category'] == 'Earthquake']
+    return (sum(row['count'] for row in totals),
+            sum(row['count'] for row in totals if row['band'] >= MAJOR_BAND))
+
+
 def get_fig_tree_data(conn: sqlite3.Connection, weeks: int = 1) -> dict:
     """Get fig tree pattern analysis data."""
     # This replicates the logic from analyze_fig_tree_pattern.py
@@ -66,50 +84,46 @@ def get_fig_tree_data(conn: sqlite3.Connection, weeks: int = 1) -> dict:
     cutoff_date = (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
     
     # J0 Wars
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN conflict_type = 'Active Conflict' THEN 1 ELSE 0 END) as active
-        FROM conflicts
-        WHERE date >= ?
-    """, (cutoff_date,))
-    wars_result = cursor.fetchone()
-    wars_intensity = 0 if not wars_result or wars_result[0] == 0 else min(wars_result[1] * 10, 100)
+    conflicts = rollup_totals(conn, 'conflicts', cutoff_date)
+    if not conflicts:
+        wars_intensity = 0
+    else:
+        active = sum(row['count'] for row in conflicts if row['category'] == 'Active Conflict')
+        wars_intensity = relative_intensity(active / weeks, get_baseline(conn, 'active_conflicts_per_week'))
+        if wars_intensity is None:
+            wars_intensity = min(active * 10, 100)
     
     # J0 Earthquakes
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN magnitude >= 6.0 THEN 1 ELSE 0 END) as major
-        FROM earthquakes
-        WHERE date_utc >= ?
-    """, (cutoff_date,))
-    quake_result = cursor.fetchone()
-    if quake_result and quake_result[0] > 0:
-        weekly_avg = quake_result[0] / weeks
-        baseline = 68
-        quake_intensity = min((weekly_avg / baseline) * 50 + quake_result[1] * 10, 100)
+    total, major = _earthquake_counts(conn, cutoff_date)
+    if total > 0:
+        weekly_avg = total / weeks
+        stats = get_baseline(conn, 'earthquakes_per_week')
+        baseline = stats['mean'] if stats and stats['mean'] > 0 else DEFAULT_QUAKE_BASELINE
+        quake_intensity = min((weekly_avg / baseline) * 50 + major * 10, 100)
     else:
         quake_intensity = 0
     
-    # J0 Famines
-    cursor.execute("""
+    # J0 Famines/Poverty: same definition as the fig tree analysis and the
+    # famine_reports_per_week baseline (FAMINE_QUERY over headline, description and keywords)
+    cursor.execute(f"""
         SELECT COUNT(*) FROM worldbank_news
-        WHERE date >= ? AND (category = 'Disaster/Famine' OR keywords LIKE '%famine%')
+        WHERE date >= ? AND (category = 'Disaster/Famine' OR {match_condition('worldbank_news', FAMINE_QUERY)})
     """, (cutoff_date,))
     famine_count = cursor.fetchone()[0]
-    famine_intensity = min(famine_count * 15, 100) if famine_count > 0 else 30
+    if famine_count > 0:
+        famine_intensity = relative_intensity(famine_count / weeks, get_baseline(conn, 'famine_reports_per_week'))
+        if famine_intensity is None:
+            famine_intensity = min(famine_count * 15, 100)
+    else:
+        famine_intensity = 30
     
     # J6 Cosmic (placeholder)
     cosmic_intensity = 5
     
     # H0 Economic
-    cursor.execute("""
-        SELECT SUM(CASE WHEN status = 'Crisis' THEN 1 ELSE 0 END) as crisis
-        FROM economic_indicators
-        WHERE date >= ?
-        ORDER BY date DESC LIMIT 1
-    """, (cutoff_date,))
-    econ_result = cursor.fetchone()
-    econ_intensity = 70 if econ_result and econ_result[0] and econ_result[0] > 0 else 20
+    crisis = sum(row['count'] for row in rollup_totals(conn, 'economic_indicators', cutoff_date)
+                 if row['band'] == 'Crisis')
+    econ_intensity = 70 if crisis > 0 else 20
     
     # B2 Digital (placeholder)
     digital_intensity = 25
@@ -167,34 +181,29 @@ def get_earthquake_summary(conn: sqlite3.Connection, days: int = 7) -> dict:
         SELECT COUNT(*) as total,
                MAX(magnitude) as max_mag,
                SUM(CASE WHEN magnitude >= 6.0 THEN 1 ELSE 0 END) as major
-        FROM earthquakes
-        WHERE date_utc >= ?
+        FROM events
+        WHERE event_type = 'Earthquake' AND date_utc >= ?
     """, (cutoff_date,))
     
     result = cursor.fetchone()
+    regions = get_region_summary(conn, cutoff_date)
     return {
         'total': result[0] if result else 0,
         'max_magnitude': result[1] if result and result[1] else 0,
-        'major_count': result[2] if result else 0
+        'major_count': result[2] if result else 0,
+        'regions': regions,
+        'region_summary': describe_region_summary(regions)
     }
 
 
 def get_conflicts_summary(conn: sqlite3.Connection, days: int = 7) -> dict:
     """Get conflicts summary data."""
-    cursor = conn.cursor()
     cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
     
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(COALESCE(casualties, 0)) as total_casualties
-        FROM conflicts
-        WHERE date >= ?
-    """, (cutoff_date,))
-    
-    result = cursor.fetchone()
+    totals = rollup_totals(conn, 'conflicts', cutoff_date)
     return {
-        'total_reports': result[0] if result else 0,
-        'casualties': result[1] if result else 0
+        'total_reports': sum(row['count'] for row in totals),
+        'casualties': int(sum(row['value'] for row in totals))
     }
 
 
@@ -221,33 +230,17 @@ def get_economic_status(conn: sqlite3.Connection) -> dict:
 
 def get_last_week_comparison(conn: sqlite3.Connection) -> dict:
     """Get last week's data for 'What Changed?' tracker."""
-    cursor = conn.cursor()
-    
     # Get data from 7-14 days ago (previous week)
     start_date = (datetime.now() - timedelta(days=14)).strftime('%Y-%m-%d')
     end_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
     
-    # Earthquakes last week
-    cursor.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN magnitude >= 6.0 THEN 1 ELSE 0 END) as major
-        FROM earthquakes
-        WHERE date_utc >= ? AND date_utc < ?
-    """, (start_date, end_date))
-    last_quakes = cursor.fetchone()
-    
-    # Conflicts last week
-    cursor.execute("""
-        SELECT COUNT(*) as total
-        FROM conflicts
-        WHERE date >= ? AND date < ?
-    """, (start_date, end_date))
-    last_conflicts = cursor.fetchone()
+    earthquakes, major = _earthquake_counts(conn, start_date, end_date)
+    conflicts = sum(row['count'] for row in rollup_totals(conn, 'conflicts', start_date, end_date))
     
     return {
-        'earthquakes': last_quakes[0] if last_quakes else 0,
-        'major_quakes': last_quakes[1] if last_quakes else 0,
-        'conflicts': last_conflicts[0] if last_conflicts else 0
+        'earthquakes': earthquakes,
+        'major_quakes': major,
+        'conflicts': conflicts
     }
 
 
@@ -259,7 +252,7 @@ def enhance_with_openai(fig_tree: dict, earthquakes: dict, conflicts: dict, econ
         return {
             'enhanced_headline': None,
             'scripture_reflection': "This week's data confirms Jesus' description of the 'beginning of sorrows.' We observe these patterns with sobriety, knowing 'the end is not yet' (Matt 24:6).",
-            'surprise_finding': None,
+            'surprise_finding': earthquakes['region_summary'],
             'shareable_quote': "\"When you see all these things, know that it is near.\" — Matthew 24:33\n\nWe're watching, not predicting. We're observing, not date-setting."
         }
     
@@ -272,6 +265,7 @@ def enhance_with_openai(fig_tree: dict, earthquakes: dict, conflicts: dict, econ
 DATA SUMMARY:
 - Fig Tree Pattern Strength: {fig_tree['overall_intensity']:.0f}/100 ({fig_tree['season']})
 - Earthquakes: {earthquakes['total']} (mag 4.0+), {earthquakes['major_count']} major (6.0+)
+- Earthquake regions: {earthquakes['region_summary'] or 'no located earthquakes'}
 - Conflicts: {conflicts['total_reports']} UN reports, {conflicts['casualties']} casualties
 - Economics: {'CRISIS' if economics['has_crisis'] else 'STABLE'}
 - Wars intensity: {fig_tree['wars_intensity']:.0f}/100
@@ -320,7 +314,7 @@ Your task: Provide brief, honest, Bible-grounded enhancements."""
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": context},
-                    {"role": "user", "content": "Identify ONE unexpected or noteworthy pattern this week (e.g., 'Earthquakes concentrated in Pacific Ring of Fire' or 'Economic indicators stable despite conflicts'). 1-2 sentences max. If nothing notable, say 'Routine monitoring across all categories.' NO speculation."}
+                    {"role": "user", "content": "Identify ONE unexpected or noteworthy pattern this week (e.g., 'Earthquakes concentrated in Pacific Ring of Fire' or 'Economic indicators stable despite conflicts'). Only cite regions given in the earthquake regions data. 1-2 sentences max. If nothing notable, say 'Routine monitoring across all categories.' NO speculation."}
                 ],
                 max_tokens=60,
                 temperature=0.7
@@ -353,7 +347,7 @@ Your task: Provide brief, honest, Bible-grounded enhancements."""
         return {
             'enhanced_headline': None,
             'scripture_reflection': "This week's data confirms Jesus' description of the 'beginning of sorrows.' We observe these patterns with sobriety, knowing 'the end is not yet' (Matt 24:6).",
-            'surprise_finding': None,
+            'surprise_finding': earthquakes['region_summary'],
             'shareable_quote': "\"When you see all these things, know that it is near.\" — Matthew 24:33\n\nWe're watching, not predicting. We're observing, not date-setting."
         }
 
@@ -368,17 +362,25 @@ def generate_newsletter(days: int = 7) -> str:
     conn = sqlite3.connect(DB_PATH)
     
     try:
+        # Link any reports ingested since the last resolution run
+        apply_migrations(conn)
+        with span('resolve_events', 'ingest'):
+            resolve_events(conn)
+            assign_geohashes(conn)
+        
         # Get data
         weeks = max(1, days // 7)
-        fig_tree = get_fig_tree_data(conn, weeks)
-        earthquakes = get_earthquake_summary(conn, days)
-        conflicts = get_conflicts_summary(conn, days)
-        economics = get_economic_status(conn)
-        last_week = get_last_week_comparison(conn)
+        with span('newsletter_queries', 'analysis'):
+            fig_tree = get_fig_tree_data(conn, weeks)
+            earthquakes = get_earthquake_summary(conn, days)
+            conflicts = get_conflicts_summary(conn, days)
+            economics = get_economic_status(conn)
+            last_week = get_last_week_comparison(conn)
         
         # ⭐ Get OpenAI enhancements (20% polish)
         print("🤖 Enhancing newsletter with OpenAI...")
-        ai_enhancements = enhance_with_openai(fig_tree, earthquakes, conflicts, economics)
+        with span('enhance_with_openai', 'newsletter'):
+            ai_enhancements = enhance_with_openai(fig_tree, earthquakes, conflicts, economics)
         
         # Generate content
         today = datetime.now()
@@ -498,6 +500,12 @@ def generate_newsletter(days: int = 7) -> str:
                 content.append(f"- 🔴 **{earthquakes['major_count']} major earthquakes** (6.0+)")
                 content.append(f"- 🟠 Peak magnitude: **{earthquakes['max_magnitude']:.1f}**\n")
             
+            if earthquakes['regions']['regions']:
+                content.append("**Where:**")
+                for row in earthquakes['regions']['regions'][:3]:
+                    content.append(f"- {row['region']}: {row['count']}")
+                content.append("")
+            
             content.append(f"**Source:** [USGS Earthquake Hazards Program](https://earthquake.usgs.gov/) (Tier 1)")
             content.append(f"**Scripture:** Matthew 24:7 — 'earthquakes in divers places'\n")
             content.append("---\n")
@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic Data Generator
+Builds a tracking database filled with statistically realistic synthetic rows
+for scale testing (no network needed):
+
+    - earthquakes: Gutenberg-Richter magnitudes (b = 1, M4.0+) in the seismic
+      regions, 80% background events and 20% Omori-law aftershock clusters
+    - disasters: GDACS reports of M5.5+ quakes plus floods, tropical cyclones,
+      droughts and volcanoes with seasonal dates and a ~80/15/5 Green/Orange/Red mix
+    - conflicts and World Bank news: templated article text with the keywords the
+      classifiers and searches look for, in bursts per conflict zone
+    - economic indicators: autocorrelated walks of the seven FRED series
+    - events/event_sources, daily trend snapshots, weekly assessments, MinHash
+      signatures and rolling baselines derived from the rows above
+
+Scale 1 is roughly one week of live ingest per week of history (~170 quakes,
+~25 disasters, ~10 conflict and ~12 news articles). --scale multiplies the
+observation tables; per-run tables (trends, weekly assessments) do not grow.
+Rows are bulk loaded (no journal, secondary indexes dropped and rebuilt).
+
+Usage:
+    python generate_synthetic_data.py [--scale 10] [--years 2] [--seed 42] [--output PATH] [--force]
+"""
+
+import sys
+import io
+import time
+import random
+import sqlite3
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from init_database import apply_migrations
+from event_resolution import grid_cell
+from geo_index import geohash_encode
+from near_duplicates import minhash, band_keys
+from baselines import update_baselines
+from compact_trends import compact_trends
+from ingest_data import TRENDS_VERSION
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+SYNTHETIC_DIR = Path("data/synthetic")
+
+# Rows per week at scale 1 (GDACS earthquake reports come on top of 'disasters')
+WEEKLY_RATES = {
+    'earthquakes': 170,
+    'disasters': 20,
+    'conflicts': 10,
+    'worldbank_news': 12,
+}
+
+# Gutenberg-Richter: log10 N(>=M) = a - b*M, above the USGS feed's cutoff
+B_VALUE = 1.0
+MIN_MAGNITUDE = 4.0
+MAX_MAGNITUDE = 9.5
+
+# Aftershocks: share of all quakes, modified Omori decay (t + c)^-p, and how
+# strongly productivity grows with the mainshock's magnitude (10^(alpha*M))
+AFTERSHOCK_SHARE = 0.2
+OMORI_C_DAYS = 0.05
+OMORI_P = 1.1
+OMORI_MAX_DAYS = 90
+PRODUCTIVITY_ALPHA = 0.8
+
+# GDACS reports every quake at or above this magnitude
+GDACS_MIN_MAGNITUDE = 5.5
+
+# Seismic zones: (centre lat, centre lon, lat spread, lon spread in degrees, share of quakes, countries)
+SEISMIC_ZONES = [
+    (37, 141, 5, 3, 12, ['Japan']),
+    (47, 152, 3, 4, 3, ['Russia']),
+    (-4, 120, 4, 12, 14, ['Indonesia']),
+    (11, 125, 5, 2, 6, ['Philippines']),
+    (-15, 170, 7, 10, 12, ['Papua New Guinea', 'Vanuatu', 'Fiji', 'Tonga', 'Solomon Islands']),
+    (-38, 176, 5, 3, 4, ['New Zealand']),
+    (55, -160, 3, 12, 6, ['Alaska']),
+    (40, -123, 5, 2, 3, ['California', 'Oregon']),
+    (15, -95, 4, 8, 7, ['Mexico', 'Guatemala', 'El Salvador', 'Nicaragua', 'Costa Rica']),
+    (-22, -70, 12, 2.5, 10, ['Chile', 'Peru', 'Argentina', 'Ecuador', 'Bolivia']),
+    (18, -68, 1.5, 6, 2, ['Puerto Rico', 'Dominican Republic', 'Haiti']),
+    (36, 35, 4, 12, 6, ['Turkey', 'Greece', 'Iran', 'Italy']),
+    (32, 85, 4, 12, 5, ['Nepal', 'China', 'India', 'Afghanistan', 'Pakistan']),
+    (30, 103, 5, 4, 2, ['China']),
+    (-2, 33, 8, 3, 1, ['Ethiopia', 'Kenya', 'Tanzania']),
+    (0, -25, 25, 6, 3, ['Mid-Atlantic Ridge', 'Iceland']),
+]
+
+PLACE_SYLLABLES = ['ka', 'lu', 'mo', 'san', 'ta', 'ri', 'ne', 'po', 'ba', 'shi', 'vo', 'den', 'ar', 'el', 'qu', 'ino']
+COMPASS = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
+
+# Non-earthquake GDACS hazards: share, (seasonal peak day of year, amplitude), countries (name, lat, lon)
+HAZARDS = {
+    'Flood': (0.45, (200, 0.5), [
+        ('India', 25, 82), ('Bangladesh', 24, 90), ('Pakistan', 28, 69), ('China', 29, 112),
+        ('Indonesia', -2, 112), ('Nigeria', 9, 8), ('Kenya', 0, 38), ('Somalia', 3, 45),
+        ('Brazil', -12, -48), ('Colombia', 5, -74), ('Afghanistan', 34, 67), ('Sudan', 14, 31),
+    ]),
+    'Tropical Cyclone': (0.30, (255, 0.8), [
+        ('Philippines', 13, 122), ('Japan', 33, 133), ('China', 23, 113), ('Viet Nam', 16, 108),
+        ('India', 20, 86), ('Bangladesh', 22, 90), ('Mexico', 20, -105), ('United States', 28, -85),
+        ('Cuba', 22, -79), ('Madagascar', -19, 47), ('Mozambique', -19, 35), ('Australia', -18, 146),
+    ]),
+    'Drought': (0.10, None, [
+        ('Somalia', 5, 46), ('Ethiopia', 9, 40), ('Kenya', 1, 38), ('Madagascar', -22, 45),
+        ('Afghanistan', 34, 66), ('Brazil', -9, -40), ('Zimbabwe', -19, 30), ('Niger', 15, 8),
+    ]),
+    'Volcano': (0.15, None, [
+        ('Indonesia', -7, 110), ('Japan', 32, 131), ('Philippines', 13, 123), ('Iceland', 64, -19),
+        ('Italy', 37.7, 15), ('Guatemala', 14.5, -91), ('Chile', -39, -72), ('Vanuatu', -16, 168),
+    ]),
+}
+
+HAZARD_CODES = {'Earthquake': 'EQ', 'Tropical Cyclone': 'TC', 'Flood': 'FL', 'Drought': 'DR', 'Volcano': 'VO'}
+ALERT_MIX = (('Green', 0.80), ('Orange', 0.15), ('Red', 0.05))
+MEDIAN_POPULATION = {'Green': 5_000, 'Orange': 200_000, 'Red': 2_000_000}
+
+# Conflict zones (weights) and article categories with the confidence the classifier gives them
+CONFLICT_ZONES = {
+    'Sudan': 10, 'South Sudan': 8, 'Democratic Republic of the Congo': 10, 'Mali': 5,
+    'Central African Republic': 5, 'Somalia': 6, 'Lebanon': 4, 'Syria': 5, 'Yemen': 5,
+    'Haiti': 4, 'Ukraine': 8, 'Myanmar': 4, 'Cyprus': 1, 'Western Sahara': 1, 'Kosovo': 1,
+}
+CONFLICT_CATEGORIES = {
+    'Casualties': (0.25, 'High'),
+    'Active Conflict': (0.20, 'High'),
+    'Humanitarian Crisis': (0.20, 'Med'),
+    'Conflict/War': (0.20, 'Med'),
+    'Peacekeeping': (0.15, 'Low'),
+}
+# Weekly log-intensity of each conflict zone follows an AR(1) walk (bursty coverage)
+CONFLICT_BURST_PHI = 0.9
+CONFLICT_BURST_SD = 0.6
+
+CONFLICT_HEADLINES = {
+    'Casualties': ["{n} civilians killed in attacks in {zone}", "Deaths mount as violence spreads in {zone}",
+                   "Peacekeepers wounded, {n} dead in {zone} clashes"],
+    'Active Conflict': ["Fighting intensifies in {zone}", "Armed group launches offensive in {zone}",
+                        "Attack on convoy in {zone} condemned"],
+    'Humanitarian Crisis': ["{n} displaced as crisis deepens in {zone}", "Aid agencies warn of famine in {zone}",
+                            "Refugees flee {zone} in growing emergency"],
+    'Conflict/War': ["Ceasefire talks stall in {zone}", "Rebel clashes continue in {zone}",
+                     "Insurgency threatens stability in {zone}"],
+    'Peacekeeping': ["Security Council renews mission in {zone}", "UN mission in {zone} marks anniversary",
+                     "Envoy briefs Council on {zone}"],
+}
+CONFLICT_SENTENCES = {
+    'Casualties': ["At least {n} people were killed and dozens wounded, officials said.",
+                   "Civilian casualties have risen sharply since the start of the month."],
+    'Active Conflict': ["Heavy fighting was reported near the provincial capital.",
+                        "The offensive has cut supply routes to several towns."],
+    'Humanitarian Crisis': ["More than {n} people have been displaced and need emergency aid.",
+                            "Relief workers report starvation and famine conditions in camps."],
+    'Conflict/War': ["Armed groups continue to clash despite the ceasefire.",
+                     "The conflict has entered its third year with no political settlement."],
+    'Peacekeeping': ["The mission will continue to support the protection of civilians.",
+                     "Council members welcomed progress on the peace agreement."],
+}
+
+NEWS_HEADLINES = {
+    'Disaster/Famine': ["World Bank approves emergency support for {country}",
+                        "Hunger and poverty rise in {country}, report warns",
+                        "Food security crisis deepens across {country}",
+                        "{country} drought leaves millions facing famine"],
+    'Economic': ["Global growth forecast cut as inflation persists",
+                 "Debt crisis risks mount for low-income economies",
+                 "{country} faces recession as currency crisis deepens",
+                 "Commodity prices increase on supply fears"],
+}
+NEWS_SENTENCES = {
+    'Disaster/Famine': ["Vulnerable households need food assistance and relief.",
+                        "Malnutrition rates have increased in rural districts.",
+                        "The program will fund recovery of damaged infrastructure.",
+                        "Poverty reduction has stalled after repeated shocks."],
+    'Economic': ["Inflation remains above target in most emerging markets.",
+                 "The report forecasts slower growth of {pct} percent next year.",
+                 "Financial conditions tightened as debt service costs increased.",
+                 "Officials warned of economic instability without reforms."],
+}
+FILLER_SENTENCES = [
+    "Officials said talks with partners will continue next week.",
+    "The statement was issued by the regional office on Tuesday.",
+    "Local authorities are coordinating with international agencies.",
+    "Further details are expected in the coming days.",
+]
+NEWS_COUNTRIES = ['Somalia', 'Ethiopia', 'Kenya', 'Sudan', 'Yemen', 'Afghanistan', 'Haiti', 'Pakistan',
+                  'Bangladesh', 'Nigeria', 'Madagascar', 'Malawi', 'Argentina', 'Sri Lanka', 'Egypt']
+NEWS_FAMINE_SHARE = 0.6
+# Share of disaster news written about a GDACS report from the week before
+NEWS_EVENT_SHARE = 0.3
+NEWS_WINDOW_DAYS = 7
+HAZARD_WORDS = {'Earthquake': 'earthquake', 'Tropical Cyclone': 'cyclone', 'Flood': 'floods',
+                'Drought': 'drought', 'Volcano': 'volcanic eruption'}
+
+# Seven FRED series: (name, category, measure, long-run mean, sd, concern, crisis, higher is worse, level)
+# measure 'yoy' walks the annual % change of a level; 'value' walks the reading itself
+ECONOMIC_SERIES = [
+    ('Consumer Price Index (CPI-U)', 'inflation', 'yoy', 3.0, 1.8, 5.0, 10.0, True, 300.0),
+    ('Personal Consumption Expenditures Price Index', 'inflation', 'yoy', 2.6, 1.5, 4.0, 8.0, True, 120.0),
+    ('Unemployment Rate', 'unemployment', 'value', 5.0, 1.5, 7.0, 10.0, True, None),
+    ('Total Unemployed + Marginally Attached + Part-Time', 'unemployment', 'value', 9.0, 2.5, 12.0, 18.0, True, None),
+    ('Gross Domestic Product', 'gdp', 'yoy', 4.5, 2.5, -2.0, -5.0, False, 27000.0),
+    ('Real GDP Growth Rate', 'gdp', 'value', 2.2, 2.5, -1.0, -3.0, False, None),
+    ('Trade Balance: Goods and Services', 'trade', 'value', -70.0, 12.0, -70.0, -100.0, False, None),
+]
+ECONOMIC_PHI = 0.98
+
+ASSESSMENT_NODES = ['j0', 'j1', 'j2', 'j3', 'j4', 'j6', 'j7', 'h0']
+
+
+def synthetic_db_path(scale: float, years: float) -> Path:
+    """Default location of a generated database."""
+    return SYNTHETIC_DIR / f"prophecy_{scale:g}x_{years:g}y.db"
+
+
+def format_dates(start: np.datetime64, days: np.ndarray, with_time: bool = True) -> List[str]:
+    """Offsets in days from start as stored date strings ('YYYY-MM-DD HH:MM UTC' or 'YYYY-MM-DD')."""
+    moments = start + (days * 86400).astype('timedelta64[s]')
+    if not with_time:
+        return np.datetime_as_string(moments, unit='D').tolist()
+    text = np.datetime_as_string(moments, unit='m')
+    return np.char.add(np.char.replace(text, 'T', ' '), ' UTC').tolist()
+
+
+def gutenberg_richter(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Magnitudes above MIN_MAGNITUDE with log10 N(>=M) falling by B_VALUE per unit."""
+    magnitudes = MIN_MAGNITUDE + rng.exponential(1 / (B_VALUE * np.log(10)), n)
+    return np.minimum(magnitudes, MAX_MAGNITUDE)
+
+
+def omori_delays(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Days after the mainshock, drawn from the modified Omori law (inverse CDF)."""
+    q = 1 - OMORI_P
+    low = OMORI_C_DAYS ** q
+    high = (OMORI_MAX_DAYS + OMORI_C_DAYS) ** q
+    return (low + rng.random(n) * (high - low)) ** (1 / q) - OMORI_C_DAYS
+
+
+def seasonal_days(rng: np.random.Generator, n: int, total_days: float, start_doy: int, season) -> np.ndarray:
+    """Uniform day offsets, thinned towards the seasonal peak (day of year, amplitude)."""
+    if season is None:
+        return rng.random(n) * total_days
+    peak, amplitude = season
+    days = np.empty(0)
+    while len(days) < n:
+        candidates = rng.random(2 * n) * total_days
+        doy = (start_doy + candidates) % 365.25
+        keep = rng.random(2 * n) < (1 + amplitude * np.cos(2 * np.pi * (doy - peak) / 365.25)) / (1 + amplitude)
+        days = np.concatenate([days, candidates[keep]])
+    return days[:n]
+
+
+def generate_earthquakes(rng: np.random.Generator, count: int, total_days: float) -> Dict[str, np.ndarray]:
+    """Background quakes in the seismic zones plus aftershock clusters, sorted by time."""
+    aftershocks = int(count * AFTERSHOCK_SHARE)
+    background = count - aftershocks
+
+    weights = np.array([zone[4] for zone in SEISMIC_ZONES], dtype=float)
+    zone = rng.choice(len(SEISMIC_ZONES), background, p=weights / weights.sum())
+    centres = np.array([spec[:4] for spec in SEISMIC_ZONES], dtype=float)
+    sizes = np.array([len(spec[5]) for spec in SEISMIC_ZONES])
+    country = (rng.random(background) * sizes[zone]).astype(int)
+
+    days = rng.random(background) * total_days
+    magnitude = gutenberg_richter(rng, background)
+    latitude = centres[zone, 0] + rng.normal(0, 1, background) * centres[zone, 2]
+    longitude = centres[zone, 1] + rng.normal(0, 1, background) * centres[zone, 3]
+
+    # Bigger mainshocks trigger more aftershocks, clustered in time and space
+    productivity = 10 ** (PRODUCTIVITY_ALPHA * (magnitude - MIN_MAGNITUDE))
+    parent = rng.choice(background, aftershocks, p=productivity / productivity.sum())
+    rupture_degrees = 0.1 * 10 ** (0.5 * (magnitude[parent] - 6))
+    after_days = days[parent] + omori_delays(rng, aftershocks)
+    # Bath's law: aftershocks stay below their mainshock
+    after_magnitude = np.minimum(gutenberg_richter(rng, aftershocks), magnitude[parent] - 0.2)
+    keep = (after_days < total_days) & (after_magnitude >= MIN_MAGNITUDE)
+
+    quakes = {
+        'days': np.concatenate([days, after_days[keep]]),
+        'magnitude': np.concatenate([magnitude, after_magnitude[keep]]),
+        'latitude': np.concatenate([latitude, latitude[parent][keep] + rng.normal(0, 1, keep.sum()) * rupture_degrees[keep]]),
+        'longitude': np.concatenate([longitude, longitude[parent][keep] + rng.normal(0, 1, keep.sum()) * rupture_degrees[keep]]),
+        'zone': np.concatenate([zone, zone[parent][keep]]),
+        'country': np.concatenate([country, country[parent][keep]]),
+    }
+    # Mostly shallow crustal quakes, some intermediate and deep slab events
+    n = len(quakes['days'])
+    quakes['depth'] = np.where(rng.random(n) < 0.85, rng.exponential(20, n) + 2, rng.uniform(70, 650, n))
+    quakes['latitude'] = np.clip(quakes['latitude'], -85, 85)
+    quakes['longitude'] = (quakes['longitude'] + 180) % 360 - 180
+    quakes['magnitude'] = np.round(quakes['magnitude'], 1)
+
+    order = np.argsort(quakes['days'], kind='stable')
+    return {key: values[order] for key, values in quakes.items()}
+
+
+def generate_disasters(rng: np.random.Generator, count: int, total_days: float, start_doy: int,
+                       quakes: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """GDACS reports: one per M5.5+ quake plus seasonal non-seismic hazards, sorted by time."""
+    reported = np.flatnonzero(quakes['magnitude'] >= GDACS_MIN_MAGNITUDE)
+    eq_magnitude = quakes['magnitude'][reported]
+    eq_alert = np.where(eq_magnitude >= 7.5, 'Red', np.where(eq_magnitude >= 6.5, 'Orange', 'Green'))
+
+    records = {
+        'days': [quakes['days'][reported] + rng.uniform(0.005, 0.03, len(reported))],
+        'type': [np.full(len(reported), 'Earthquake', dtype=object)],
+        'country': [np.array([SEISMIC_ZONES[z][5][c] for z, c in zip(quakes['zone'][reported], quakes['country'][reported])], dtype=object)],
+        'latitude': [quakes['latitude'][reported] + rng.normal(0, 0.05, len(reported))],
+        'longitude': [quakes['longitude'][reported] + rng.normal(0, 0.05, len(reported))],
+        'alert': [eq_alert.astype(object)],
+        'quake': [reported],
+    }
+
+    shares = np.array([spec[0] for spec in HAZARDS.values()])
+    per_hazard = rng.multinomial(count, shares / shares.sum())
+    for (hazard, (_, season, countries)), n in zip(HAZARDS.items(), per_hazard):
+        pick = rng.integers(len(countries), size=n)
+        records['days'].append(seasonal_days(rng, n, total_days, start_doy, season))
+        records['type'].append(np.full(n, hazard, dtype=object))
+        records['country'].append(np.array([countries[i][0] for i in pick], dtype=object))
+        records['latitude'].append(np.array([countries[i][1] for i in pick]) + rng.normal(0, 2, n))
+        records['longitude'].append(np.array([countries[i][2] for i in pick]) + rng.normal(0, 2, n))
+        records['alert'].append(rng.choice([a for a, _ in ALERT_MIX], n, p=[p for _, p in ALERT_MIX]).astype(object))
+        records['quake'].append(np.full(n, -1))
+
+    disasters = {key: np.concatenate(parts) for key, parts in records.items()}
+    disasters['latitude'] = np.clip(disasters['latitude'], -85, 85)
+    disasters['longitude'] = (disasters['longitude'] + 180) % 360 - 180
+    order = np.argsort(disasters['days'], kind='stable')
+    return {key: values[order] for key, values in disasters.items()}
+
+
+def quake_location(rnd: random.Random, country: str) -> str:
+    """USGS-style place text ("45 km SSW of Kalumo, Indonesia")."""
+    place = ''.join(rnd.choice(PLACE_SYLLABLES) for _ in range(rnd.randint(2, 3))).title()
+    return f"{rnd.randint(2, 180)} km {rnd.choice(COMPASS)} of {place}, {country}"
+
+
+def severity_text(rnd: random.Random, hazard: str, alert: str, magnitude: float, depth: float) -> str:
+    """GDACS severity line for a hazard and alert level."""
+    level = [a for a, _ in ALERT_MIX].index(alert)
+    if hazard == 'Earthquake':
+        return f"Magnitude {magnitude:.1f}M, Depth:{depth:.0f}km"
+    if hazard == 'Tropical Cyclone':
+        wind = rnd.randint(*((90, 118), (119, 177), (178, 280))[level])
+        return f"{'Tropical Storm' if wind < 119 else 'Cyclone'} (maximum wind speed of {wind} km/h)"
+    if hazard == 'Flood':
+        return f"{rnd.randint(0, 10 ** (level + 1))} killed and {rnd.randint(100, 10 ** (level + 4))} displaced"
+    if hazard == 'Drought':
+        return f"Drought affecting {rnd.randint(10, 10 ** (level + 2)) * 1000} km2"
+    return f"Volcanic eruption, VEI {level + rnd.randint(1, 2)}"
+
+
+def article(rnd: random.Random, headlines: Dict[str, List[str]], sentences: Dict[str, List[str]],
+            category: str, **slots) -> tuple:
+    """Headline and 2-4 sentence description for a category."""
+    n = rnd.choice([12, 40, 250, 1200, 5000, 30000])
+    pct = round(rnd.uniform(0.5, 4.5), 1)
+    headline = rnd.choice(headlines[category]).format(n=n, pct=pct, **slots)
+    body = rnd.sample(sentences[category], 2) + rnd.sample(FILLER_SENTENCES, rnd.randint(0, 2))
+    rnd.shuffle(body)
+    return headline, ' '.join(body).format(n=n, pct=pct, **slots)
+
+
+def generate_conflicts(rng: np.random.Generator, rnd: random.Random, count: int, total_days: float):
+    """Conflict reports in bursts: each zone's weekly intensity follows an AR(1) walk."""
+    zones = list(CONFLICT_ZONES)
+    weeks = max(1, int(np.ceil(total_days / 7)))
+    log_intensity = np.zeros((weeks, len(zones)))
+    noise = rng.normal(0, CONFLICT_BURST_SD * np.sqrt(1 - CONFLICT_BURST_PHI ** 2), (weeks, len(zones)))
+    for week in range(1, weeks):
+        log_intensity[week] = CONFLICT_BURST_PHI * log_intensity[week - 1] + noise[week]
+    intensity = np.exp(log_intensity) * np.array([CONFLICT_ZONES[z] for z in zones], dtype=float)
+    cells = rng.choice(intensity.size, count, p=(intensity / intensity.sum()).ravel())
+    week, zone = np.divmod(cells, len(zones))
+    days = np.minimum((week + rng.random(count)) * 7, total_days - 1e-6)
+
+    categories = list(CONFLICT_CATEGORIES)
+    shares = np.array([CONFLICT_CATEGORIES[c][0] for c in categories])
+    category = rng.choice(len(categories), count, p=shares / shares.sum())
+
+    order = np.argsort(days, kind='stable')
+    rows = []
+    for i in order.tolist():
+        name = categories[category[i]]
+        title, description = article(rnd, CONFLICT_HEADLINES, CONFLICT_SENTENCES, name, zone=zones[zone[i]])
+        rows.append((days[i], title, name, description, CONFLICT_CATEGORIES[name][1]))
+    return rows
+
+
+def generate_news(rng: np.random.Generator, rnd: random.Random, count: int, total_days: float,
+                  disasters: Dict[str, np.ndarray]):
+    """World Bank articles; some disaster coverage names a GDACS report from the previous week."""
+    days = np.sort(rng.random(count) * total_days)
+    famine = rng.random(count) < NEWS_FAMINE_SHARE
+    about_event = famine & (rng.random(count) < NEWS_EVENT_SHARE)
+    first = np.searchsorted(disasters['days'], days - NEWS_WINDOW_DAYS)
+    last = np.searchsorted(disasters['days'], days)
+
+    rows = []
+    for i in range(count):
+        category = 'Disaster/Famine' if famine[i] else 'Economic'
+        disaster = None
+        if about_event[i] and last[i] > first[i]:
+            disaster = int(rng.integers(first[i], last[i]))
+            country = disasters['country'][disaster]
+            headline = f"{HAZARD_WORDS[disasters['type'][disaster]].capitalize()} in {country}: World Bank assesses damage"
+            _, description = article(rnd, NEWS_HEADLINES, NEWS_SENTENCES, category, country=country)
+        else:
+            headline, description = article(rnd, NEWS_HEADLINES, NEWS_SENTENCES, category,
+                                            country=rnd.choice(NEWS_COUNTRIES))
+        text = f"{headline} {description}".lower()
+        keywords = [word for word in ('famine', 'poverty', 'hunger', 'drought', 'flood', 'cyclone', 'earthquake',
+                                      'crisis', 'inflation', 'recession', 'debt crisis', 'increase', 'forecast')
+                    if word in text]
+        confidence = 'High' if len(keywords) >= 3 else 'Med' if keywords else 'Low'
+        rows.append((days[i], headline, description, category, ', '.join(keywords), confidence,
+                     'H0' if category == 'Economic' else 'J0', disaster))
+    return rows
+
+
+def generate_economic(rng: np.random.Generator, scale: float, weeks: int) -> List[tuple]:
+    """Weekly readings per series (regional variants above scale 1): (week, name, category, value, yoy, status, confidence)."""
+    variants = max(1, int(round(scale)))
+    rows = []
+    for variant in range(variants):
+        for name, category, measure, mean, sd, concern, crisis, higher_worse, level in ECONOMIC_SERIES:
+            walk = np.empty(weeks)
+            walk[0] = mean + rng.normal(0, sd)
+            shocks = rng.normal(0, sd * np.sqrt(1 - ECONOMIC_PHI ** 2), weeks)
+            for week in range(1, weeks):
+                walk[week] = mean + ECONOMIC_PHI * (walk[week - 1] - mean) + shocks[week]
+
+            if measure == 'yoy':
+                values = level * np.cumprod((1 + walk / 100) ** (1 / 52))
+                yoy = walk
+            else:
+                values = walk * (1000 if category == 'trade' else 1)  # FRED reports trade in millions
+                yoy = np.concatenate([np.full(min(52, weeks), np.nan), walk[52:] - walk[:-52]])
+            score = walk if higher_worse else -walk
+            status = np.where(score >= (crisis if higher_worse else -crisis), 'Crisis',
+                              np.where(score >= (concern if higher_worse else -concern), 'Concern', 'Normal'))
+            label = name if variant == 0 else f"{name} (District {variant})"
+            for week in range(weeks):
+                rows.append((week, label, category, round(float(values[week]), 2),
+                             None if np.isnan(yoy[week]) else round(float(yoy[week]), 2), str(status[week]),
+                             {'Crisis': 'High', 'Concern': 'Med', 'Normal': 'Low'}[str(status[week])]))
+    return rows
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection) -> List[str]:
+    """Drop every explicit index (rebuilt after loading). Returns their CREATE statements."""
+    indexes = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL
+    """).fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    return [sql for _, sql in indexes]
+
+
+def bulk_insert(conn: sqlite3.Connection, table: str, columns: List[str], rows: Iterable[tuple]) -> int:
+    """executemany one table's rows; returns the row count."""
+    cursor = conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})", rows
+    )
+    return cursor.rowcount
+
+
+def generate(db_path: Path, scale: float = 1, years: float = 2, seed: int = 42) -> Dict[str, int]:
+    """Build a synthetic database at db_path. Returns row counts per table."""
+    rng = np.random.default_rng(seed)
+    rnd = random.Random(seed)
+
+    total_days = years * 365.25
+    now = np.datetime64(datetime.utcnow().replace(second=0, microsecond=0), 's')
+    start = now - np.timedelta64(int(total_days * 86400), 's')
+    start_day = start.astype('datetime64[D]')
+    start_doy = int((start_day - start_day.astype('datetime64[Y]')).astype(int))
+    first_monday = -int((start_day.astype(int) + 3) % 7) % 7  # 1970-01-01 was a Thursday
+    weeks = int((total_days - first_monday) // 7)
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = db_path.with_suffix('.partial')
+    partial.unlink(missing_ok=True)
+    conn = sqlite3.connect(partial)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    apply_migrations(conn)
+    indexes = drop_secondary_indexes(conn)
+    counts = {}
+
+    print(f"🎲 Generating {scale:g}× synthetic data over {years:g} years (seed {seed})")
+
+    # Earthquakes (rows keep chronological ids, like a live ingest)
+    quakes = generate_earthquakes(rng, int(rng.poisson(WEEKLY_RATES['earthquakes'] * scale * total_days / 7)), total_days)
+    quake_dates = format_dates(start, quakes['days'])
+    quake_countries = [SEISMIC_ZONES[z][5][c] for z, c in zip(quakes['zone'].tolist(), quakes['country'].tolist())]
+    quake_locations = [quake_location(rnd, country) for country in quake_countries]
+    lats, lons = quakes['latitude'].tolist(), quakes['longitude'].tolist()
+    counts['earthquakes'] = bulk_insert(conn, 'earthquakes', [
+        'id', 'event_id', 'date_utc', 'magnitude', 'location', 'latitude', 'longitude', 'depth_km',
+        'source_url', 'node_id', 'geohash',
+    ], (
+        (i + 1, f"syn{i + 1:09d}", quake_dates[i], magnitude, quake_locations[i], lats[i], lons[i], round(depth, 1),
+         f"https://earthquake.usgs.gov/earthquakes/eventpage/syn{i + 1:09d}", 'J0', geohash_encode(lats[i], lons[i]))
+        for i, (magnitude, depth) in enumerate(zip(quakes['magnitude'].tolist(), quakes['depth'].tolist()))
+    ))
+    print(f"   🌍 earthquakes: {counts['earthquakes']:,}")
+
+    # Disasters
+    disasters = generate_disasters(rng, int(rng.poisson(WEEKLY_RATES['disasters'] * scale * total_days / 7)),
+                                   total_days, start_doy, quakes)
+    disaster_dates = format_dates(start, disasters['days'])
+    d_lats, d_lons = disasters['latitude'].tolist(), disasters['longitude'].tolist()
+    disaster_rows = []
+    for i, (hazard, country, alert, quake) in enumerate(zip(disasters['type'], disasters['country'],
+                                                             disasters['alert'], disasters['quake'].tolist())):
+        magnitude = float(quakes['magnitude'][quake]) if quake >= 0 else 0.0
+        depth = float(quakes['depth'][quake]) if quake >= 0 else 0.0
+        population = int(MEDIAN_POPULATION[alert] * rng.lognormal(0, 1))
+        code = HAZARD_CODES[hazard]
+        disaster_rows.append((
+            i + 1, f"{code}{1000000 + i}", disaster_dates[i], hazard, country, alert,
+            severity_text(rnd, hazard, alert, magnitude, depth), population,
+            f"https://www.gdacs.org/report.aspx?eventtype={code}&eventid={1000000 + i}", 'J0',
+            d_lats[i], d_lons[i], geohash_encode(d_lats[i], d_lons[i]),
+        ))
+    counts['disasters'] = bulk_insert(conn, 'disasters', [
+        'id', 'event_id', 'date_utc', 'disaster_type', 'location', 'alert_level', 'severity_description',
+        'population_affected', 'source_url', 'node_id', 'latitude', 'longitude', 'geohash',
+    ], disaster_rows)
+    del disaster_rows
+    print(f"   🌀 disasters: {counts['disasters']:,}")
+
+    # Conflicts
+    conflicts = generate_conflicts(rng, rnd, int(rng.poisson(WEEKLY_RATES['conflicts'] * scale * total_days / 7)), total_days)
+    conflict_dates = format_dates(start, np.array([row[0] for row in conflicts]), with_time=False)
+    counts['conflicts'] = bulk_insert(conn, 'conflicts', [
+        'id', 'date', 'location', 'conflict_type', 'casualties', 'description', 'source_url', 'confidence', 'node_id',
+    ], (
+        (i + 1, conflict_dates[i], title, category, None, description,
+         f"https://news.un.org/en/story/{conflict_dates[i][:4]}/{conflict_dates[i][5:7]}/{1000000 + i}", confidence, 'J0')
+        for i, (_, title, category, description, confidence) in enumerate(conflicts)
+    ))
+    print(f"   ⚔️  conflicts: {counts['conflicts']:,}")
+
+    # World Bank news
+    news = generate_news(rng, rnd, int(rng.poisson(WEEKLY_RATES['worldbank_news'] * scale * total_days / 7)),
+                         total_days, disasters)
+    news_dates = format_dates(start, np.array([row[0] for row in news]), with_time=False)
+    counts['worldbank_news'] = bulk_insert(conn, 'worldbank_news', [
+        'id', 'date', 'headline', 'description', 'category', 'keywords', 'confidence', 'source_url', 'node_id',
+    ], (
+        (i + 1, news_dates[i], headline, description, category, keywords, confidence,
+         f"https://worldbank.einnews.com/article/{1000000 + i}", node)
+        for i, (_, headline, description, category, keywords, confidence, node, _) in enumerate(news)
+    ))
+    print(f"   📰 worldbank_news: {counts['worldbank_news']:,}")
+
+    # Economic indicators (one reading per series per week, on Fridays)
+    week_dates = format_dates(start_day, np.arange(weeks) * 7.0 + first_monday + 4, with_time=False)
+    counts['economic_indicators'] = bulk_insert(conn, 'economic_indicators', [
+        'date', 'indicator_name', 'indicator_category', 'value', 'yoy_change', 'status', 'confidence', 'source', 'node_id',
+    ], (
+        (week_dates[week], name, category, value, yoy, status, confidence, 'FRED', 'H0')
+        for week, name, category, value, yoy, status, confidence in generate_economic(rng, scale, weeks)
+        if week_dates[week] <= str(now)[:10]
+    ))
+    print(f"   📉 economic_indicators: {counts['economic_indicators']:,}")
+
+    # Canonical events: one per quake and per non-seismic GDACS report; GDACS quake
+    # reports and news articles join the quake's/report's event
+    non_seismic = np.flatnonzero(disasters['quake'] < 0)
+    event_days = np.concatenate([quakes['days'], disasters['days'][non_seismic]])
+    order = np.argsort(event_days, kind='stable')
+    event_ids = np.empty(len(order), dtype=int)
+    event_ids[order] = np.arange(1, len(order) + 1)
+    quake_event = event_ids[:len(quakes['days'])]
+    disaster_event = np.empty(len(disasters['days']), dtype=int)
+    disaster_event[non_seismic] = event_ids[len(quakes['days']):]
+    seismic = np.flatnonzero(disasters['quake'] >= 0)
+    disaster_event[seismic] = quake_event[disasters['quake'][seismic]]
+
+    source_count = np.ones(len(order), dtype=int)
+    np.add.at(source_count, quake_event[disasters['quake'][seismic]] - 1, 1)
+    news_links = [(i + 1, int(disaster_event[row[7]])) for i, row in enumerate(news) if row[7] is not None]
+    for _, event in news_links:
+        source_count[event - 1] += 1
+
+    event_dates = format_dates(start, event_days)
+    hazard_places = disasters['country'][non_seismic].tolist()
+    event_types = ['Earthquake'] * len(quakes['days']) + disasters['type'][non_seismic].tolist()
+    event_magnitudes = quakes['magnitude'].tolist() + [None] * len(non_seismic)
+    event_locations = quake_locations + hazard_places
+    event_regions = quake_countries + hazard_places
+    event_lats = lats + disasters['latitude'][non_seismic].tolist()
+    event_lons = lons + disasters['longitude'][non_seismic].tolist()
+    counts['events'] = bulk_insert(conn, 'events', [
+        'id', 'event_type', 'date_utc', 'magnitude', 'location', 'region', 'latitude', 'longitude',
+        'grid_cell', 'source_count', 'node_id',
+    ], (
+        (rank + 1, event_types[k], event_dates[k], event_magnitudes[k], event_locations[k], event_regions[k],
+         event_lats[k], event_lons[k], grid_cell(event_lats[k], event_lons[k]), int(source_count[rank]), 'J0')
+        for rank, k in enumerate(order.tolist())
+    ))
+    counts['event_sources'] = bulk_insert(conn, 'event_sources', ['source_table', 'source_id', 'event_id'], [
+        *(('earthquakes', i + 1, int(e)) for i, e in enumerate(quake_event)),
+        *(('disasters', i + 1, int(e)) for i, e in enumerate(disaster_event)),
+        *(('worldbank_news', news_id, event) for news_id, event in news_links),
+    ])
+    print(f"   🔗 events: {counts['events']:,} ({counts['event_sources']:,} linked reports)")
+
+    # Daily trend snapshots (what calculate_trends stores), thinned like compact_trends does
+    snapshot_days = np.arange(max(0, int(total_days) - 730), int(total_days) + 1)
+    window_start = np.searchsorted(quakes['days'], snapshot_days - 56)
+    window_end = np.searchsorted(quakes['days'], snapshot_days, side='right')
+    major_cumulative = np.concatenate([[0], np.cumsum(quakes['magnitude'] >= 6.0)])
+    snapshot_dates = format_dates(start_day, snapshot_days.astype(float), with_time=False)
+    window_dates = format_dates(start_day, snapshot_days - 56.0, with_time=False)
+    trend_rows = []
+    for k, day in enumerate(snapshot_dates):
+        for metric, count in (('avg_earthquakes_per_week', window_end[k] - window_start[k]),
+                              ('major_earthquakes_per_week', major_cumulative[window_end[k]] - major_cumulative[window_start[k]])):
+            trend_rows.append((metric, 'week', window_dates[k], day, count / 8.0, TRENDS_VERSION, f"{day} 06:00:00"))
+    bulk_insert(conn, 'trends', ['metric_name', 'time_period', 'period_start', 'period_end', 'value',
+                                 'model_version', 'calculated_at'], trend_rows)
+
+    # Weekly assessments: J0 observed in weeks with a major quake or an Orange/Red alert
+    major_week = np.zeros(weeks + 1, dtype=bool)
+    for days in (quakes['days'][quakes['magnitude'] >= 6.0], disasters['days'][disasters['alert'] != 'Green']):
+        major_week[((days - first_monday) // 7).astype(int).clip(0, weeks)] = True
+    week_starts = format_dates(start_day, np.arange(weeks) * 7.0 + first_monday, with_time=False)
+    week_ends = format_dates(start_day, np.arange(weeks) * 7.0 + first_monday + 6, with_time=False)
+    counts['weekly_assessments'] = bulk_insert(conn, 'weekly_assessments', [
+        'week_start', 'week_end', *(f"{node}_status" for node in ASSESSMENT_NODES),
+        'j0_confidence', 'h0_confidence', 'newsletter_path',
+    ], (
+        (week_starts[w], week_ends[w], 'Observed' if major_week[w] else 'Not Observed',
+         *(rnd.choice(['Observed', 'Not Observed']) for _ in ASSESSMENT_NODES[1:]),
+         'High' if major_week[w] else 'Med', rnd.choice(['Low', 'Med']), f"newsletters/{week_ends[w]}.md")
+        for w in range(weeks)
+    ))
+
+    # MinHash signatures, as the feed parsers persist them (keyed by article URL)
+    signatures = 0
+    for source, rows in (('conflicts', conn.execute("SELECT source_url, location || ' ' || COALESCE(description, '') FROM conflicts")),
+                         ('worldbank_news', conn.execute("SELECT source_url, headline || ' ' || COALESCE(description, '') FROM worldbank_news"))):
+        items = [(url, minhash(text)) for url, text in rows.fetchall()]
+        items = [(url, signature) for url, signature in items if signature is not None]
+        signatures += bulk_insert(conn, 'minhash_signatures', ['source', 'item_key', 'signature'],
+                                  ((source, url, signature.tobytes()) for url, signature in items))
+        conn.executemany(
+            "INSERT OR IGNORE INTO minhash_buckets (source, band, bucket, item_key) VALUES (?, ?, ?, ?)",
+            ((source, band, bucket, url) for url, signature in items for band, bucket in enumerate(band_keys(signature)))
+        )
+    counts['minhash_signatures'] = signatures
+    conn.commit()
+
+    print("   🏗️  Rebuilding indexes...")
+    for sql in indexes:
+        conn.execute(sql)
+    conn.commit()
+
+    compact_trends(conn)
+    counts['trends'] = conn.execute("SELECT COUNT(*) FROM trends").fetchone()[0]
+    update_baselines(conn)
+    counts['metric_weekly'] = conn.execute("SELECT COUNT(*) FROM metric_weekly").fetchone()[0]
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+
+    partial.replace(db_path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic tracking database for scale testing.")
+    parser.add_argument("--scale", type=float, default=1, help="Multiplier on weekly row rates (default: 1).")
+    parser.add_argument("--years", type=float, default=2, help="Years of history (default: 2).")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="Database path (default: data/synthetic/prophecy_<scale>x_<years>y.db).")
+    parser.add_argument("--force", action="store_true", help="Overwrite an existing database.")
+    args = parser.parse_args()
+
+    output = args.output or synthetic_db_path(args.scale, args.years)
+    if output.resolve() == DB_PATH.resolve():
+        print("❌ Refusing to overwrite the tracking database")
+        sys.exit(1)
+    if output.exists() and not args.force:
+        print(f"✅ {output} already exists (use --force to regenerate)")
+        return
+
+    started = time.perf_counter()
+    counts = generate(output, args.scale, args.years, args.seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n✅ {output} ({output.stat().st_size / 1e6:,.0f} MB) in {elapsed:.1f}s\n")
+    print("| Table | Rows |")
+    print("|-------|------|")
+    for table, count in counts.items():
+        print(f"| {table} | {count:,} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geographic Region Index
+Per-region counts and hotspots for earthquakes and disasters.
+
+Every row with coordinates carries a geohash cell (`geohash` column, indexed) and
+an entry in an SQLite R*Tree (`earthquakes_rtree`, `disasters_rtree`, kept in
+step by triggers). Region counts are R*Tree bounding-box lookups; hotspots are
+an indexed GROUP BY on a geohash prefix. Both take milliseconds, so the
+newsletter can report where activity is concentrated from data instead of guessing.
+
+Usage:
+    python geo_index.py [--days 7] [--table earthquakes|disasters]
+"""
+
+import sys
+import io
+import sqlite3
+import time
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# Stored cell size: 4 characters ~ 39 x 20 km
+GEOHASH_PRECISION = 4
+
+# Hotspot cell size: 3 characters ~ 156 x 156 km
+HOTSPOT_PRECISION = 3
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+INDEXED_TABLES = ('earthquakes', 'disasters')
+
+# Named seismic/hazard regions as (min_lat, max_lat, min_lon, max_lon) boxes.
+# Regions crossing the date line use two boxes. Boxes don't overlap and are
+# half-open (min <= x < max, the 180th meridian included), so a point on a
+# shared edge belongs to exactly one region.
+REGIONS = {
+    'Japan & Kuril Islands': [(24, 50, 122, 160)],
+    'Indonesia & Philippines': [(-11, 24, 92, 135)],
+    'Southwest Pacific (PNG, Vanuatu, Fiji, Tonga)': [(-35, -1, 135, 180), (-35, -1, -180, -170)],
+    'New Zealand': [(-48, -35, 165, 180), (-48, -35, -180, -175)],
+    'Alaska & Aleutians': [(50, 72, 165, 180), (50, 72, -180, -130)],
+    'US & Canada West Coast': [(33, 50, -130, -114)],
+    'Mexico & Central America': [(5, 33, -118, -77)],
+    'South America (Andes)': [(-56, 5, -82, -60)],
+    'Caribbean': [(10, 24, -77, -59)],
+    'Mediterranean & Middle East': [(28, 46, -10, 63)],
+    'Himalaya & Central Asia': [(25, 50, 63, 105)],
+    'China & Mongolia': [(24, 53, 105, 122)],
+    'East Africa (Rift Valley)': [(-16, 16, 28, 52)],
+    'Mid-Atlantic Ridge & Iceland': [(-60, 67, -45, -10)],
+}
+
+# Regions that make up the Pacific "Ring of Fire"
+RING_OF_FIRE = (
+    'Japan & Kuril Islands', 'Indonesia & Philippines', 'Southwest Pacific (PNG, Vanuatu, Fiji, Tonga)',
+    'New Zealand', 'Alaska & Aleutians', 'US & Canada West Coast', 'Mexico & Central America',
+    'South America (Andes)',
+)
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> Optional[str]:
+    """Encode a point as a geohash string (None if either coordinate is missing)."""
+    if latitude is None or longitude is None:
+        return None
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash bits alternate longitude, latitude
+
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    """Return the (latitude, longitude) at the centre of a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if value >> shift & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def _half_open(box: Tuple[float, float, float, float]) -> Tuple[float, float, float, float]:
+    """Box with exclusive upper bounds; one reaching the date line keeps longitude 180."""
+    min_lat, max_lat, min_lon, max_lon = box
+    return min_lat, max_lat, min_lon, max_lon if max_lon < 180 else 181
+
+
+def region_of_point(latitude: float, longitude: float) -> Optional[str]:
+    """Return the named region containing a point (None if outside all regions)."""
+    for name, boxes in REGIONS.items():
+        for box in boxes:
+            min_lat, max_lat, min_lon, max_lon = _half_open(box)
+            if min_lat <= latitude < max_lat and min_lon <= longitude < max_lon:
+                return name
+    return None
+
+
+def assign_geohashes(conn: sqlite3.Connection) -> int:
+    """Fill the geohash column for rows that have coordinates but no cell yet.
+
+    Called after each ingest. Returns the number of rows updated.
+    """
+    updated = 0
+
+    for table in INDEXED_TABLES:
+        cursor = conn.execute(f"""
+            SELECT id, latitude, longitude FROM {table}
+            WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL
+        """)
+        rows = [(geohash_encode(lat, lon), row_id) for row_id, lat, lon in cursor.fetchall()]
+        conn.executemany(f"UPDATE {table} SET geohash = ? WHERE id = ?", rows)
+        updated += len(rows)
+
+    conn.commit()
+    return updated
+
+
+def count_in_region(conn: sqlite3.Connection, region: str, table: str = 'earthquakes',
+                    since: Optional[str] = None) -> Tuple[int, Optional[float]]:
+    """Count rows inside a named region since a date. Returns (count, max magnitude)."""
+    magnitude = 'MAX(t.magnitude)' if table == 'earthquakes' else 'NULL'
+    total, peak = 0, None
+
+    for box in REGIONS[region]:
+        cursor = conn.execute(f"""
+            SELECT COUNT(*), {magnitude}
+            FROM {table}_rtree r
+            JOIN {table} t ON t.id = r.id
+            WHERE r.min_lat >= ? AND r.max_lat < ?
+              AND r.min_lon >= ? AND r.max_lon < ?
+              AND t.date_utc >= ?
+        """, (*_half_open(box), since or '0000-00-00'))
+        count, box_peak = cursor.fetchone()
+        total += count
+        if box_peak is not None and (peak is None or box_peak > peak):
+            peak = box_peak
+
+    return total, peak
+
+
+def region_counts(conn: sqlite3.Connection, table: str = 'earthquakes',
+                  since: Optional[str] = None) -> List[Dict]:
+    """Counts for every named region with activity, busiest first."""
+    rows = []
+    for region in REGIONS:
+        count, peak = count_in_region(conn, region, table, since)
+        if count:
+            rows.append({'region': region, 'count': count, 'max_magnitude': peak})
+    rows.sort(key=lambda row: row['count'], reverse=True)
+    return rows
+
+
+def hotspots(conn: sqlite3.Connection, table: str = 'earthquakes', since: Optional[str] = None,
+             precision: int = HOTSPOT_PRECISION, limit: int = 5) -> List[Dict]:
+    """Busiest geohash cells since a date, with the region each falls in."""
+    cursor = conn.execute(f"""
+        SELECT substr(geohash, 1, ?) AS cell, COUNT(*) AS events
+        FROM {table}
+        WHERE geohash IS NOT NULL AND date_utc >= ?
+        GROUP BY cell
+        ORDER BY events DESC
+        LIMIT ?
+    """, (precision, since or '0000-00-00', limit))
+
+    results = []
+    for cell, count in cursor.fetchall():
+        latitude, longitude = geohash_center(cell)
+        results.append({
+            'cell': cell,
+            'count': count,
+            'latitude': latitude,
+            'longitude': longitude,
+            'region': region_of_point(latitude, longitude) or 'Other'
+        })
+    return results
+
+
+def get_region_summary(conn: sqlite3.Connection, since: Optional[str] = None) -> Dict:
+    """Earthquake distribution since a date, for reports and the newsletter."""
+    cursor = conn.execute(
+        "SELECT COUNT(*) FROM earthquakes WHERE latitude IS NOT NULL AND date_utc >= ?",
+        (since or '0000-00-00',)
+    )
+    located = cursor.fetchone()[0]
+
+    regions = region_counts(conn, 'earthquakes', since)
+    ring_total = sum(row['count'] for row in regions if row['region'] in RING_OF_FIRE)
+
+    return {
+        'located': located,
+        'regions': regions,
+        'ring_of_fire': ring_total,
+        'ring_of_fire_share': ring_total / located if located else 0.0,
+        'hotspots': hotspots(conn, 'earthquakes', since)
+    }
+
+
+def describe_region_summary(summary: Dict) -> Optional[str]:
+    """One-sentence, data-derived description of where earthquakes concentrated."""
+    if not summary['located']:
+        return None
+
+    parts = [
+        f"{summary['ring_of_fire_share']:.0%} of located earthquakes "
+        f"({summary['ring_of_fire']} of {summary['located']}) were in the Pacific Ring of Fire"
+    ]
+    if summary['regions']:
+        busiest = summary['regions'][0]
+        parts.append(f"the busiest region was {busiest['region']} ({busiest['count']})")
+    return '; '.join(parts) + '.'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Region counts and hotspots from the spatial index.")
+    parser.add_argument("--days", type=int, default=7, help="Look-back window in days (default: 7).")
+    parser.add_argument("--table", choices=INDEXED_TABLES, default='earthquakes',
+                        help="Table to summarise (default: earthquakes).")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+        assign_geohashes(conn)
+
+        since = (datetime.utcnow() - timedelta(days=args.days)).strftime('%Y-%m-%d')
+
+        started = time.perf_counter()
+        regions = region_counts(conn, args.table, since)
+        region_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        cells = hotspots(conn, args.table, since)
+        hotspot_ms = (time.perf_counter() - started) * 1000
+
+        print(f"🗺️  {args.table.capitalize()} by region — past {args.days} days\n")
+        print("| Region | Count | Max Magnitude |")
+        print("|--------|-------|---------------|")
+        for row in regions:
+            peak = f"{row['max_magnitude']:.1f}" if row['max_magnitude'] is not None else '—'
+            print(f"| {row['region']} | {row['count']} | {peak} |")
+
+        print(f"\n🔥 Hotspots (geohash cells, ~156 km)\n")
+        print("| Cell | Count | Centre | Region |")
+        print("|------|-------|--------|--------|")
+        for cell in cells:
+            print(f"| {cell['cell']} | {cell['count']} | {cell['latitude']:.1f}, {cell['longitude']:.1f} | {cell['region']} |")
+
+        if args.table == 'earthquakes':
+            sentence = describe_region_summary(get_region_summary(conn, since))
+            if sentence:
+                print(f"\n💡 {sentence}")
+
+        print(f"\n⏱️  Region counts: {region_ms:.1f} ms, hotspots: {hotspot_ms:.1f} ms")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
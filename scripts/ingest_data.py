@@ -2,35 +2,46 @@
 # -*- coding: utf-8 -*-
 """
 Database Ingestion Script
-Runs all automation scripts and ingests data into SQLite database.
+Fetches every registered source (sources.py) concurrently and ingests the results into SQLite.
 
 Usage:
-    python ingest_data.py [--days 7]
+    python ingest_data.py [--days 7] [--trace]   # --trace: print stage timings and save a trace
 """
 
 import sys
 import io
+import asyncio
 import sqlite3
 import subprocess
 import json
-import re
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from baselines import update_baselines
+from compact_trends import compact_trends
+from event_resolution import resolve_events
+from geo_index import assign_geohashes
+from init_database import apply_migrations
+from sources import SOURCES, run_sources
+from tracing import finish_run, span
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 DB_PATH = Path("data/prophecy_tracking.db")
 
+# Stored with calculated trends (part of the trends key)
+TRENDS_VERSION = 'weekly-average-v1'
+
 
-def run_fetch_script(script_name: str, days: int = 7) -> str:
+def run_fetch_script(script_name: str, days: int = 7, extra_args: tuple = ()) -> str:
     """Run a fetch script and return output."""
     script_path = Path(__file__).parent / script_name
     
     try:
         result = subprocess.run(
-            [sys.executable, str(script_path), '--days', str(days)],
+            [sys.executable, str(script_path), '--days', str(days), *extra_args],
             capture_output=True,
             text=True,
             encoding='utf-8',
@@ -42,56 +53,24 @@ def run_fetch_script(script_name: str, days: int = 7) -> str:
         return ""
 
 
-def parse_earthquake_output(output: str) -> list:
-    """Parse earthquake data from script output."""
-    earthquakes = []
+def ingest_sources(conn: sqlite3.Connection, days: int):
+    """Fetch and store every registered source concurrently. Returns the earliest new event date (or None)."""
+    sources = [source for source in SOURCES.values() if source.table]
+    print(f"📡 Fetching {len(sources)} sources concurrently...")
+    results = asyncio.run(run_sources(conn, sources, days))
     
-    # Look for table rows with earthquake data
-    for line in output.split('\n'):
-        # Match: | **6.5** | Location | Date | Lat, Lon | [USGS](url) |
-        match = re.search(r'\|\s*\*\*(\d+\.?\d*)\*\*\s*\|\s*([^|]+)\|\s*([^|]+)\s*\|\s*([^|]+)\|\s*\[USGS\]\(([^)]+)\)', line)
-        if match:
-            mag, location, date_str, coords, url = match.groups()
-            earthquakes.append({
-                'magnitude': float(mag),
-                'location': location.strip(),
-                'date_utc': date_str.strip(),
-                'source_url': url.strip(),
-                'event_id': url.split('/')[-1]  # Extract event ID from URL
-            })
+    for source in sources:
+        if source.key not in results:
+            print(f"   ⏭️  {source.name}: disabled (missing configuration)")
+            continue
+        r = results[source.key]
+        if r['error']:
+            print(f"   ⚠️  {source.name} unavailable, skipping: {r['error']}", file=sys.stderr)
+            continue
+        print(f"   ✅ {source.name}: {r['inserted']} new rows in {source.table} "
+              f"(skipped {r['items'] - r['inserted']} duplicates, {r['seconds']:.1f}s)")
     
-    return earthquakes
-
-
-def ingest_earthquakes(conn: sqlite3.Connection, days: int):
-    """Fetch and ingest earthquake data."""
-    print("📊 Fetching earthquake data...")
-    output = run_fetch_script('fetch_earthquakes.py', days)
-    earthquakes = parse_earthquake_output(output)
-    
-    cursor = conn.cursor()
-    inserted = 0
-    
-    for eq in earthquakes:
-        try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO earthquakes 
-                (event_id, date_utc, magnitude, location, source_url, node_id)
-                VALUES (?, ?, ?, ?, ?, 'J0')
-            """, (
-                eq['event_id'],
-                eq['date_utc'],
-                eq['magnitude'],
-                eq['location'],
-                eq['source_url']
-            ))
-            if cursor.rowcount > 0:
-                inserted += 1
-        except sqlite3.Error as e:
-            print(f"⚠️  Error inserting earthquake: {e}", file=sys.stderr)
-    
-    conn.commit()
-    print(f"   ✅ Inserted {inserted} new earthquakes (skipped {len(earthquakes) - inserted} duplicates)")
+    return min(filter(None, (r['earliest'] for r in results.values())), default=None)
 
 
 def ingest_economic_data(conn: sqlite3.Connection, days: int):
@@ -110,36 +89,44 @@ def ingest_economic_data(conn: sqlite3.Connection, days: int):
 
 
 def calculate_trends(conn: sqlite3.Connection):
-    """Calculate and store trend data."""
+    """Calculate and store trend data (re-running on the same day updates in place)."""
     print("📈 Calculating trends...")
     cursor = conn.cursor()
     
     # Earthquake trend: average per week over last 8 weeks
     cursor.execute("""
-        INSERT INTO trends (metric_name, time_period, period_start, period_end, value)
+        INSERT INTO trends (metric_name, time_period, period_start, period_end, value, model_version)
         SELECT 
             'avg_earthquakes_per_week' as metric_name,
             'week' as time_period,
             date('now', '-56 days') as period_start,
             date('now') as period_end,
-            CAST(COUNT(*) AS REAL) / 8.0 as value
+            CAST(COUNT(*) AS REAL) / 8.0 as value,
+            ? as model_version
         FROM earthquakes
         WHERE date_utc >= date('now', '-56 days')
-    """)
+        ON CONFLICT (metric_name, period_start, period_end, model_version) DO UPDATE SET
+            value = excluded.value,
+            calculated_at = CURRENT_TIMESTAMP
+    """, (TRENDS_VERSION,))
     
     # Major earthquake trend (6.0+)
     cursor.execute("""
-        INSERT INTO trends (metric_name, time_period, period_start, period_end, value)
+        INSERT INTO trends (metric_name, time_period, period_start, period_end, value, model_version)
         SELECT 
             'major_earthquakes_per_week' as metric_name,
             'week' as time_period,
             date('now', '-56 days') as period_start,
             date('now') as period_end,
-            CAST(COUNT(*) AS REAL) / 8.0 as value
+            CAST(COUNT(*) AS REAL) / 8.0 as value,
+            ? as model_version
         FROM earthquakes
         WHERE date_utc >= date('now', '-56 days')
         AND magnitude >= 6.0
-    """)
+        ON CONFLICT (metric_name, period_start, period_end, model_version) DO UPDATE SET
+            value = excluded.value,
+            calculated_at = CURRENT_TIMESTAMP
+    """, (TRENDS_VERSION,))
     
     conn.commit()
     print("   ✅ Trends calculated")
@@ -198,8 +185,9 @@ def main():
             idx = sys.argv.index('--days')
             days = int(sys.argv[idx + 1])
         except (IndexError, ValueError):
-            print("Usage: python ingest_data.py [--days 7]")
+            print("Usage: python ingest_data.py [--days 7] [--trace]")
             sys.exit(1)
+    trace = '--trace' in sys.argv
     
     # Check if database exists
     if not DB_PATH.exists():
@@ -214,12 +202,38 @@ def main():
     conn = sqlite3.connect(DB_PATH)
     
     try:
-        # Ingest data from each source
-        ingest_earthquakes(conn, days)
+        # Bring older databases up to the current schema
+        apply_migrations(conn)
+        
+        # Ingest data from each registered source
+        with span('ingest_sources', 'ingest'):
+            earliest = ingest_sources(conn, days)
         # ingest_economic_data(conn, days)  # Placeholder
         
+        # Place new rows in the spatial index (R*Tree rows come from triggers)
+        with span('assign_geohashes', 'ingest'):
+            assign_geohashes(conn)
+        
+        # Link duplicate reports (USGS + GDACS + news) to canonical events
+        print("🔗 Resolving cross-source events...")
+        with span('resolve_events', 'ingest'):
+            stats = resolve_events(conn, earliest or datetime.now().strftime('%Y-%m-%d'))
+        print(f"   ✅ {stats['created']} new events, {stats['merged']} duplicate reports merged")
+        
+        # Refresh rolling baselines for the weeks just ingested
+        print("📏 Updating rolling baselines...")
+        with span('update_baselines', 'analysis'):
+            update_baselines(conn, earliest or datetime.now().strftime('%Y-%m-%d'))
+        
         # Calculate trends
-        calculate_trends(conn)
+        with span('calculate_trends', 'analysis'):
+            calculate_trends(conn)
+        
+        # Thin old daily trend snapshots and drop expired rows
+        with span('compact_trends', 'analysis'):
+            stats = compact_trends(conn)
+        if stats['expired'] or stats['compacted']:
+            print(f"   🧹 Trends compacted: {stats['compacted']} old snapshots, {stats['expired']} expired rows removed")
         
         # Generate report
         generate_summary_report(conn)
@@ -231,6 +245,10 @@ def main():
         conn.rollback()
     finally:
         conn.close()
+    
+    if trace:
+        print()
+        finish_run('ingest_data')
 
 
 if __name__ == '__main__':
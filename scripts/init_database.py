@@ -6,6 +6,8 @@ Creates the SQLite database schema for prophecy tracking.
 
 Usage:
     python init_database.py [--reset]
+
+Running it against an existing database applies any pending migrations.
 """
 
 import sys
@@ -160,6 +162,556 @@ CREATE TABLE IF NOT EXISTS schema_version (
 );
 """
 
+# Incremental schema changes applied on top of SCHEMA (version 1).
+# Each entry is (version, description, sql); applied versions are recorded in schema_version.
+# The SQL is fixed text, never generated from current code: a migration must mean the
+# same thing on every database, so changed definitions get a new numbered migration.
+MIGRATIONS = [
+    (2, "Backfill checkpoints for resumable historical imports", """
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    source TEXT NOT NULL,
+    slice_start TEXT NOT NULL,
+    slice_end TEXT NOT NULL,
+    events_fetched INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, slice_start, slice_end)
+);
+"""),
+    (3, "Rolling per-metric baselines for intensity scoring", """
+CREATE TABLE IF NOT EXISTS metric_weekly (
+    metric_name TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric_name, week_start)
+);
+
+CREATE TABLE IF NOT EXISTS metric_baselines (
+    metric_name TEXT PRIMARY KEY,
+    window_weeks INTEGER NOT NULL,
+    sample_weeks INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    std REAL NOT NULL,
+    p10 REAL,
+    p50 REAL,
+    p90 REAL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""),
+    (4, "Canonical events linking duplicate reports across sources", """
+ALTER TABLE disasters ADD COLUMN latitude REAL;
+ALTER TABLE disasters ADD COLUMN longitude REAL;
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    date_utc TEXT NOT NULL,
+    magnitude REAL,
+    location TEXT,
+    region TEXT,
+    latitude REAL,
+    longitude REAL,
+    grid_cell INTEGER,
+    source_count INTEGER NOT NULL DEFAULT 1,
+    node_id TEXT DEFAULT 'J0',
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_type_date ON events(event_type, date_utc);
+CREATE INDEX IF NOT EXISTS idx_events_cell ON events(event_type, grid_cell, date_utc);
+
+CREATE TABLE IF NOT EXISTS event_sources (
+    source_table TEXT NOT NULL,
+    source_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL REFERENCES events(id),
+    PRIMARY KEY (source_table, source_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_event_sources_event ON event_sources(event_id);
+"""),
+    (5, "Geohash cells and R*Tree spatial indexes for earthquakes and disasters", """
+ALTER TABLE earthquakes ADD COLUMN geohash TEXT;
+ALTER TABLE disasters ADD COLUMN geohash TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_earthquakes_geohash ON earthquakes(geohash);
+CREATE INDEX IF NOT EXISTS idx_disasters_geohash ON disasters(geohash);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS earthquakes_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+CREATE VIRTUAL TABLE IF NOT EXISTS disasters_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+
+INSERT OR REPLACE INTO earthquakes_rtree
+SELECT id, latitude, latitude, longitude, longitude FROM earthquakes
+WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+
+INSERT OR REPLACE INTO disasters_rtree
+SELECT id, latitude, latitude, longitude, longitude FROM disasters
+WHERE latitude IS NOT NULL AND longitude IS NOT NULL;
+
+-- Keep the R*Trees in step with the base tables
+CREATE TRIGGER IF NOT EXISTS earthquakes_rtree_insert AFTER INSERT ON earthquakes
+WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO earthquakes_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS earthquakes_rtree_update AFTER UPDATE OF latitude, longitude ON earthquakes
+BEGIN
+    DELETE FROM earthquakes_rtree WHERE id = OLD.id;
+    UPDATE earthquakes SET geohash = NULL WHERE id = NEW.id;  -- Re-assigned by assign_geohashes()
+    INSERT INTO earthquakes_rtree
+    SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+    WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS earthquakes_rtree_delete AFTER DELETE ON earthquakes
+BEGIN
+    DELETE FROM earthquakes_rtree WHERE id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rtree_insert AFTER INSERT ON disasters
+WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+BEGIN
+    INSERT OR REPLACE INTO disasters_rtree VALUES (NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude);
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rtree_update AFTER UPDATE OF latitude, longitude ON disasters
+BEGIN
+    DELETE FROM disasters_rtree WHERE id = OLD.id;
+    UPDATE disasters SET geohash = NULL WHERE id = NEW.id;  -- Re-assigned by assign_geohashes()
+    INSERT INTO disasters_rtree
+    SELECT NEW.id, NEW.latitude, NEW.latitude, NEW.longitude, NEW.longitude
+    WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rtree_delete AFTER DELETE ON disasters
+BEGIN
+    DELETE FROM disasters_rtree WHERE id = OLD.id;
+END;
+"""),
+    (6, "Prediction interval bounds for stored forecasts", """
+ALTER TABLE trends ADD COLUMN lower_bound REAL;
+ALTER TABLE trends ADD COLUMN upper_bound REAL;
+ALTER TABLE trends ADD COLUMN interval_level REAL;
+"""),
+    (7, "One row per trend key with model versions; covering index for recent trends", """
+ALTER TABLE trends ADD COLUMN model_version TEXT NOT NULL DEFAULT 'legacy';
+
+-- Keep the newest row of each duplicate group before enforcing uniqueness
+DELETE FROM trends
+WHERE id NOT IN (
+    SELECT MAX(id) FROM trends
+    GROUP BY metric_name, period_start, period_end, model_version
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_trends_key ON trends(metric_name, period_start, period_end, model_version);
+
+-- Covers the recent-trends summary: filter, sort and columns all come from the index
+CREATE INDEX IF NOT EXISTS idx_trends_recent ON trends(calculated_at, metric_name, value);
+"""),
+    (8, "FTS5 full-text index over article text", """
+-- One index for all stored text. rowid = source row id * 8 + source code
+-- (1 worldbank_news, 2 conflicts, 3 disasters), so triggers update by rowid.
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, body, source UNINDEXED, date UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+
+INSERT INTO articles_fts (rowid, title, body, source, date)
+SELECT id * 8 + 1, headline, COALESCE(description, '') || ' ' || COALESCE(keywords, ''), 'worldbank_news', date
+FROM worldbank_news;
+
+INSERT INTO articles_fts (rowid, title, body, source, date)
+SELECT id * 8 + 2, location || ': ' || conflict_type, COALESCE(description, ''), 'conflicts', date
+FROM conflicts;
+
+INSERT INTO articles_fts (rowid, title, body, source, date)
+SELECT id * 8 + 3, disaster_type || ': ' || location, COALESCE(severity_description, ''), 'disasters', substr(date_utc, 1, 10)
+FROM disasters;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_fts_insert AFTER INSERT ON worldbank_news
+BEGIN
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 1, NEW.headline, COALESCE(NEW.description, '') || ' ' || COALESCE(NEW.keywords, ''), 'worldbank_news', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_fts_update AFTER UPDATE OF headline, description, keywords, date ON worldbank_news
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 1;
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 1, NEW.headline, COALESCE(NEW.description, '') || ' ' || COALESCE(NEW.keywords, ''), 'worldbank_news', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_fts_delete AFTER DELETE ON worldbank_news
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_fts_insert AFTER INSERT ON conflicts
+BEGIN
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 2, NEW.location || ': ' || NEW.conflict_type, COALESCE(NEW.description, ''), 'conflicts', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_fts_update AFTER UPDATE OF location, conflict_type, description, date ON conflicts
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 2;
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 2, NEW.location || ': ' || NEW.conflict_type, COALESCE(NEW.description, ''), 'conflicts', NEW.date);
+END;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_fts_delete AFTER DELETE ON conflicts
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 2;
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_fts_insert AFTER INSERT ON disasters
+BEGIN
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 3, NEW.disaster_type || ': ' || NEW.location, COALESCE(NEW.severity_description, ''), 'disasters', substr(NEW.date_utc, 1, 10));
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_fts_update AFTER UPDATE OF disaster_type, location, severity_description, date_utc ON disasters
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 3;
+    INSERT INTO articles_fts (rowid, title, body, source, date)
+    VALUES (NEW.id * 8 + 3, NEW.disaster_type || ': ' || NEW.location, COALESCE(NEW.severity_description, ''), 'disasters', substr(NEW.date_utc, 1, 10));
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_fts_delete AFTER DELETE ON disasters
+BEGIN
+    DELETE FROM articles_fts WHERE rowid = OLD.id * 8 + 3;
+END;
+"""),
+    (9, "MinHash LSH index for near-duplicate articles", """
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    source TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source, item_key)
+);
+
+CREATE TABLE IF NOT EXISTS minhash_buckets (
+    source TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    item_key TEXT NOT NULL,
+    PRIMARY KEY (source, band, bucket, item_key)
+) WITHOUT ROWID;
+"""),
+    (10, "Per-stage pipeline timings", """
+CREATE TABLE IF NOT EXISTS pipeline_timings (
+    run_id TEXT NOT NULL,
+    run_name TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    max_seconds REAL NOT NULL,
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_id, stage)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pipeline_timings_run ON pipeline_timings(run_name, run_id);
+"""),
+    (11, "Weekly rollups maintained by triggers", """CREATE TABLE IF NOT EXISTS weekly_rollups (
+    source TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    category TEXT NOT NULL,
+    band TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    value_sum REAL NOT NULL,
+    PRIMARY KEY (source, week_start, category, band)
+) WITHOUT ROWID;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'earthquakes', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date_utc, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE('Earthquake', '') AS category, COALESCE('M' || MIN(MAX(CAST(magnitude AS INTEGER), 0), 9), '') AS band, magnitude AS value
+    FROM earthquakes
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS earthquakes_rollup_insert AFTER INSERT ON earthquakes
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'earthquakes', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE('Earthquake', ''), COALESCE('M' || MIN(MAX(CAST(NEW.magnitude AS INTEGER), 0), 9), ''), 1, COALESCE(NEW.magnitude, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS earthquakes_rollup_update AFTER UPDATE OF date_utc, magnitude ON earthquakes
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.magnitude, 0)
+    WHERE source = 'earthquakes' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE('Earthquake', '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '');
+    DELETE FROM weekly_rollups WHERE source = 'earthquakes' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE('Earthquake', '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'earthquakes', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE('Earthquake', ''), COALESCE('M' || MIN(MAX(CAST(NEW.magnitude AS INTEGER), 0), 9), ''), 1, COALESCE(NEW.magnitude, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS earthquakes_rollup_delete AFTER DELETE ON earthquakes
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.magnitude, 0)
+    WHERE source = 'earthquakes' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE('Earthquake', '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '');
+    DELETE FROM weekly_rollups WHERE source = 'earthquakes' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE('Earthquake', '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '') AND row_count <= 0;
+END;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'events', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date_utc, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE(event_type, '') AS category, COALESCE('M' || MIN(MAX(CAST(magnitude AS INTEGER), 0), 9), '') AS band, magnitude AS value
+    FROM events
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS events_rollup_insert AFTER INSERT ON events
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'events', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.event_type, ''), COALESCE('M' || MIN(MAX(CAST(NEW.magnitude AS INTEGER), 0), 9), ''), 1, COALESCE(NEW.magnitude, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_rollup_update AFTER UPDATE OF date_utc, event_type, magnitude ON events
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.magnitude, 0)
+    WHERE source = 'events' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.event_type, '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '');
+    DELETE FROM weekly_rollups WHERE source = 'events' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.event_type, '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'events', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.event_type, ''), COALESCE('M' || MIN(MAX(CAST(NEW.magnitude AS INTEGER), 0), 9), ''), 1, COALESCE(NEW.magnitude, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_rollup_delete AFTER DELETE ON events
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.magnitude, 0)
+    WHERE source = 'events' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.event_type, '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '');
+    DELETE FROM weekly_rollups WHERE source = 'events' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.event_type, '') AND band = COALESCE('M' || MIN(MAX(CAST(OLD.magnitude AS INTEGER), 0), 9), '') AND row_count <= 0;
+END;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'disasters', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date_utc, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE(disaster_type, '') AS category, COALESCE(alert_level, '') AS band, population_affected AS value
+    FROM disasters
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rollup_insert AFTER INSERT ON disasters
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'disasters', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.disaster_type, ''), COALESCE(NEW.alert_level, ''), 1, COALESCE(NEW.population_affected, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rollup_update AFTER UPDATE OF date_utc, alert_level, disaster_type, population_affected ON disasters
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.population_affected, 0)
+    WHERE source = 'disasters' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.disaster_type, '') AND band = COALESCE(OLD.alert_level, '');
+    DELETE FROM weekly_rollups WHERE source = 'disasters' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.disaster_type, '') AND band = COALESCE(OLD.alert_level, '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'disasters', date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.disaster_type, ''), COALESCE(NEW.alert_level, ''), 1, COALESCE(NEW.population_affected, 0)
+    WHERE date(substr(NEW.date_utc, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS disasters_rollup_delete AFTER DELETE ON disasters
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.population_affected, 0)
+    WHERE source = 'disasters' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.disaster_type, '') AND band = COALESCE(OLD.alert_level, '');
+    DELETE FROM weekly_rollups WHERE source = 'disasters' AND week_start = date(substr(OLD.date_utc, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.disaster_type, '') AND band = COALESCE(OLD.alert_level, '') AND row_count <= 0;
+END;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'conflicts', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE(conflict_type, '') AS category, COALESCE(confidence, '') AS band, casualties AS value
+    FROM conflicts
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_rollup_insert AFTER INSERT ON conflicts
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'conflicts', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.conflict_type, ''), COALESCE(NEW.confidence, ''), 1, COALESCE(NEW.casualties, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_rollup_update AFTER UPDATE OF date, casualties, confidence, conflict_type ON conflicts
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.casualties, 0)
+    WHERE source = 'conflicts' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.conflict_type, '') AND band = COALESCE(OLD.confidence, '');
+    DELETE FROM weekly_rollups WHERE source = 'conflicts' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.conflict_type, '') AND band = COALESCE(OLD.confidence, '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'conflicts', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.conflict_type, ''), COALESCE(NEW.confidence, ''), 1, COALESCE(NEW.casualties, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS conflicts_rollup_delete AFTER DELETE ON conflicts
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(OLD.casualties, 0)
+    WHERE source = 'conflicts' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.conflict_type, '') AND band = COALESCE(OLD.confidence, '');
+    DELETE FROM weekly_rollups WHERE source = 'conflicts' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.conflict_type, '') AND band = COALESCE(OLD.confidence, '') AND row_count <= 0;
+END;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'worldbank_news', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE(category, '') AS category, COALESCE(confidence, '') AS band, NULL AS value
+    FROM worldbank_news
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_rollup_insert AFTER INSERT ON worldbank_news
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'worldbank_news', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.category, ''), COALESCE(NEW.confidence, ''), 1, COALESCE(NULL, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_rollup_update AFTER UPDATE OF date, category, confidenceNULL ON worldbank_news
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(NULL, 0)
+    WHERE source = 'worldbank_news' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.category, '') AND band = COALESCE(OLD.confidence, '');
+    DELETE FROM weekly_rollups WHERE source = 'worldbank_news' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.category, '') AND band = COALESCE(OLD.confidence, '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'worldbank_news', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.category, ''), COALESCE(NEW.confidence, ''), 1, COALESCE(NULL, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS worldbank_news_rollup_delete AFTER DELETE ON worldbank_news
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(NULL, 0)
+    WHERE source = 'worldbank_news' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.category, '') AND band = COALESCE(OLD.confidence, '');
+    DELETE FROM weekly_rollups WHERE source = 'worldbank_news' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.category, '') AND band = COALESCE(OLD.confidence, '') AND row_count <= 0;
+END;
+
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT 'economic_indicators', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT date(substr(date, 1, 10), 'weekday 0', '-6 days') AS week, COALESCE(indicator_category, '') AS category, COALESCE(status, '') AS band, NULL AS value
+    FROM economic_indicators
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+
+CREATE TRIGGER IF NOT EXISTS economic_indicators_rollup_insert AFTER INSERT ON economic_indicators
+BEGIN
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'economic_indicators', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.indicator_category, ''), COALESCE(NEW.status, ''), 1, COALESCE(NULL, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS economic_indicators_rollup_update AFTER UPDATE OF date, indicator_category, statusNULL ON economic_indicators
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(NULL, 0)
+    WHERE source = 'economic_indicators' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.indicator_category, '') AND band = COALESCE(OLD.status, '');
+    DELETE FROM weekly_rollups WHERE source = 'economic_indicators' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.indicator_category, '') AND band = COALESCE(OLD.status, '') AND row_count <= 0;
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT 'economic_indicators', date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days'), COALESCE(NEW.indicator_category, ''), COALESCE(NEW.status, ''), 1, COALESCE(NULL, 0)
+    WHERE date(substr(NEW.date, 1, 10), 'weekday 0', '-6 days') IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;
+END;
+
+CREATE TRIGGER IF NOT EXISTS economic_indicators_rollup_delete AFTER DELETE ON economic_indicators
+BEGIN
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE(NULL, 0)
+    WHERE source = 'economic_indicators' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.indicator_category, '') AND band = COALESCE(OLD.status, '');
+    DELETE FROM weekly_rollups WHERE source = 'economic_indicators' AND week_start = date(substr(OLD.date, 1, 10), 'weekday 0', '-6 days') AND category = COALESCE(OLD.indicator_category, '') AND band = COALESCE(OLD.status, '') AND row_count <= 0;
+END;
+"""),
+    (12, "Recount famine baseline as full-text famine OR poverty matches", """DELETE FROM metric_weekly WHERE metric_name = 'famine_reports_per_week';
+INSERT INTO metric_weekly (metric_name, week_start, value)
+SELECT 'famine_reports_per_week', date(substr(date, 1, 10), 'weekday 0', '-6 days') AS week, COUNT(*)
+FROM worldbank_news
+WHERE (category = 'Disaster/Famine' OR id IN (SELECT rowid / 8 FROM articles_fts WHERE articles_fts MATCH 'famine OR poverty' AND rowid % 8 = 1))
+GROUP BY week
+HAVING week IS NOT NULL;
+DELETE FROM metric_baselines WHERE metric_name = 'famine_reports_per_week';
+"""),
+    (13, "Index trends by period end for compaction", """
+CREATE INDEX IF NOT EXISTS idx_trends_period_end ON trends(period_end);
+"""),
+]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> list:
+    """Bring an existing database up to the latest schema version.
+    
+    Returns a list of (version, description) for the migrations applied.
+    """
+    cursor = conn.cursor()
+    
+    # Base schema is idempotent (CREATE ... IF NOT EXISTS)
+    cursor.executescript(SCHEMA)
+    cursor.execute(
+        "INSERT OR IGNORE INTO schema_version (version, description) VALUES (?, ?)",
+        (1, "Initial schema with 7 core tables")
+    )
+    
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    current_version = cursor.fetchone()[0]
+    
+    applied = []
+    for version, description, sql in MIGRATIONS:
+        if version <= current_version:
+            continue
+        # Schema changes and their version row commit together, so a failed or
+        # interrupted migration leaves nothing behind to break the retry
+        # (executescript commits first and would otherwise autocommit each statement)
+        record = description.replace("'", "''")
+        try:
+            cursor.executescript(
+                f"BEGIN;\n{sql}\n"
+                f"INSERT INTO schema_version (version, description) VALUES ({version}, '{record}');\n"
+                "COMMIT;"
+            )
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        applied.append((version, description))
+    
+    conn.commit()
+    return applied
+
+
 def init_database(reset=False):
     """Initialize the database with schema."""
     # Create data directory if it doesn't exist
@@ -175,6 +727,13 @@ def init_database(reset=False):
     
     if exists and not reset:
         print(f"✅ Database already exists: {DB_PATH}")
+        conn = sqlite3.connect(DB_PATH)
+        applied = apply_migrations(conn)
+        conn.close()
+        for version, description in applied:
+            print(f"   ⬆️  Applied migration {version}: {description}")
+        if not applied:
+            print("   Schema is up to date")
         print("   Use --reset to recreate")
         return
     
@@ -183,16 +742,8 @@ def init_database(reset=False):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
-    # Execute schema
-    cursor.executescript(SCHEMA)
-    
-    # Insert schema version
-    cursor.execute(
-        "INSERT OR IGNORE INTO schema_version (version, description) VALUES (?, ?)",
-        (1, "Initial schema with 7 core tables")
-    )
-    
-    conn.commit()
+    # Execute schema (base tables + all migrations)
+    apply_migrations(conn)
     
     # Verify tables
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Keyword Matcher
+Compiles several keyword lists into one regular expression and reports every
+category hit in a single pass over the text.
+
+The keywords are merged into a character trie before being turned into a regex,
+so matching cost grows with text length, not with the number of keywords.
+Keywords match at the start of a word ('aid' matches "aid" and "aided" but not
+"said"), so plural and inflected forms still count.
+
+Usage:
+    from keyword_matcher import KeywordMatcher
+
+    matcher = KeywordMatcher({'war': WAR_KEYWORDS, 'casualty': CASUALTY_KEYWORDS})
+    hits = matcher.match(title + ' ' + description)
+    hits['war']  # -> ['conflict', 'attack'] (in WAR_KEYWORDS order)
+"""
+
+import re
+from typing import Dict, List
+
+
+def trie_pattern(words: List[str]) -> str:
+    """Build a regex alternation for words, factored by common prefixes.
+
+    At each position the pattern matches the longest word that starts there.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End-of-word marker
+
+    def build(node: dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_end else group
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """One-pass matcher for named keyword lists."""
+
+    def __init__(self, categories: Dict[str, List[str]]):
+        self.categories = {name: list(keywords) for name, keywords in categories.items()}
+
+        keywords = {kw.lower() for kws in self.categories.values() for kw in kws}
+
+        # The lookahead tries every word start, so keywords that overlap are all seen.
+        # At each position the regex reports the longest keyword; shorter keywords
+        # that are prefixes of it are added back via self._prefixes
+        self._pattern = re.compile(r'\b(?=(' + trie_pattern(sorted(keywords)) + '))') if keywords else None
+
+        self._prefixes = {
+            kw: [other for other in keywords if other != kw and kw.startswith(other)]
+            for kw in keywords
+        }
+
+        # keyword -> [(position in its list, category, keyword as written)]
+        self._owners = {}
+        for name, kws in self.categories.items():
+            for position, kw in enumerate(kws):
+                self._owners.setdefault(kw.lower(), []).append((position, name, kw))
+
+    def found(self, text: str) -> set:
+        """Return the set of (lowercased) keywords present in text."""
+        if not self._pattern or not text:
+            return set()
+
+        hits = set()
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in hits:
+                hits.add(keyword)
+                hits.update(self._prefixes[keyword])
+        return hits
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return {category: [matched keywords in list order]} for every category."""
+        result = {name: [] for name in self.categories}
+
+        # Only the (few) hits are visited, keeping each list's original order
+        owners = sorted(owner for kw in self.found(text) for owner in self._owners[kw])
+        for _, name, kw in owners:
+            result[name].append(kw)
+        return result
+
+    def matches_any(self, text: str, category: str = None) -> bool:
+        """True if text contains any keyword (optionally from one category only)."""
+        if category is None:
+            return bool(self._pattern and text and self._pattern.search(text.lower()))
+        return bool(self.match(text)[category])
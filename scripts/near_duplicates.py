@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near-Duplicate Article Detection
+Spots lightly edited republications of the same story (EIN News copies of World
+Bank releases, UN and EFF reposts) so each story is counted once.
+
+Each article's text is cut into character shingles and summarised as a 64-value
+MinHash signature (one-permutation hashing: one crc32 per shingle, binned, with
+empty bins densified). Signatures are split into 16 bands of 4; articles sharing
+any band are candidates, and a candidate is a duplicate when the signatures agree
+on at least DUPLICATE_THRESHOLD of their values (estimated Jaccard similarity).
+Checking one article takes well under a millisecond.
+
+The index lives in memory for a single fetch, or in the database
+(`minhash_signatures`, `minhash_buckets`) so duplicates are caught across runs.
+The persisted index only keeps the last SIGNATURE_RETENTION_DAYS of articles
+(older entries are pruned on the first write of each run), so it stays small.
+Articles are keyed by link, or by a hash of the title when they have none.
+
+Usage:
+    from near_duplicates import NearDuplicateIndex
+
+    duplicates = NearDuplicateIndex('worldbank_news')          # in memory
+    duplicates = NearDuplicateIndex('worldbank_news', conn)    # persisted
+    if duplicates.add(article_key(url, title), title + ' ' + description) is not None:
+        continue  # Near-duplicate of an article already seen
+
+    python near_duplicates.py [--table worldbank_news|conflicts]   # report clusters in stored rows
+"""
+
+import sys
+import io
+import re
+import hashlib
+import time
+import zlib
+import sqlite3
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+NUM_HASHES = 64  # Must be a power of two (bins are picked with a bit mask)
+BIN_BITS = 6     # log2(NUM_HASHES)
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+SHINGLE_CHARS = 5
+
+# Estimated Jaccard similarity at or above which two articles are the same story
+DUPLICATE_THRESHOLD = 0.7
+
+# Persisted signatures older than this are dropped (republications come within days)
+SIGNATURE_RETENTION_DAYS = 30
+
+EMPTY_BIN = 0xFFFFFFFF
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Text columns compared for stored rows (CLI report)
+TABLE_TEXT = {
+    'worldbank_news': "headline || ' ' || COALESCE(description, '')",
+    'conflicts': "location || ' ' || COALESCE(description, '')",
+}
+
+
+def shingles(text: str) -> set:
+    """Overlapping character n-grams of the text, case and punctuation removed."""
+    normalized = ' '.join(WORD_PATTERN.findall(text.lower()))
+    if len(normalized) <= SHINGLE_CHARS:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_CHARS] for i in range(len(normalized) - SHINGLE_CHARS + 1)}
+
+
+def minhash(text: str) -> Optional[array]:
+    """64-value MinHash signature of the text (None if it has no words)."""
+    signature = array('I', [EMPTY_BIN]) * NUM_HASHES
+    mask = NUM_HASHES - 1
+    found = False
+
+    for shingle in shingles(text):
+        h = zlib.crc32(shingle.encode('utf-8'))
+        slot = h & mask
+        value = h >> BIN_BITS
+        if value < signature[slot]:
+            signature[slot] = value
+        found = True
+
+    if not found:
+        return None
+
+    # Densify: an empty bin borrows the next filled bin's value, tagged with the distance
+    for slot in range(NUM_HASHES):
+        if signature[slot] != EMPTY_BIN:
+            continue
+        for distance in range(1, NUM_HASHES):
+            donor = signature[(slot + distance) & mask]
+            if donor != EMPTY_BIN and donor < (1 << (32 - BIN_BITS)):
+                signature[slot] = donor | (distance << (32 - BIN_BITS))
+                break
+
+    return signature
+
+
+def article_key(link: Optional[str], title: str) -> str:
+    """Index key for an article: its link, or a hash of its title when it has none."""
+    link = (link or '').strip()
+    if link:
+        return link
+    normalized = ' '.join(WORD_PATTERN.findall(title.lower()))
+    return 'title:' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def band_keys(signature: array) -> List[int]:
+    """One bucket key per band (stable across runs and Python versions)."""
+    return [
+        zlib.crc32(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes())
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity: share of signature values that agree."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_HASHES
+
+
+class NearDuplicateIndex:
+    """LSH index of article signatures for one source (in memory or persisted)."""
+
+    def __init__(self, source: str, conn: Optional[sqlite3.Connection] = None,
+                 threshold: float = DUPLICATE_THRESHOLD):
+        self.source = source
+        self.conn = conn
+        self.threshold = threshold
+
+        # In-memory mode only
+        self._buckets: Dict[tuple, List[str]] = {}
+        self._signatures: Dict[str, array] = {}
+
+        # Persisted mode: old entries are pruned before the first write
+        self._pruned = False
+
+    def prune(self, days: int = SIGNATURE_RETENTION_DAYS) -> int:
+        """Drop persisted signatures and buckets older than `days`. Returns signatures removed.
+
+        Writes without committing, like add().
+        """
+        if self.conn is None:
+            return 0
+        cutoff = f'-{days} days'
+        self.conn.execute("""
+            DELETE FROM minhash_buckets
+            WHERE source = ? AND item_key IN (
+                SELECT item_key FROM minhash_signatures
+                WHERE source = ? AND created_at < datetime('now', ?)
+            )
+        """, (self.source, self.source, cutoff))
+        cursor = self.conn.execute(
+            "DELETE FROM minhash_signatures WHERE source = ? AND created_at < datetime('now', ?)",
+            (self.source, cutoff)
+        )
+        return cursor.rowcount
+
+    def _candidates(self, bands: List[int]) -> Dict[str, array]:
+        """Signatures sharing at least one band bucket."""
+        if self.conn is None:
+            keys = {key for band, bucket in enumerate(bands) for key in self._buckets.get((band, bucket), ())}
+            return {key: self._signatures[key] for key in keys}
+
+        # One primary-key lookup per band
+        values = ', '.join('(?, ?)' for _ in bands)
+        params = [value for band, bucket in enumerate(bands) for value in (band, bucket)]
+        cursor = self.conn.execute(f"""
+            WITH probe(band, bucket) AS (VALUES {values})
+            SELECT DISTINCT s.item_key, s.signature
+            FROM probe
+            JOIN minhash_buckets b ON b.source = ? AND b.band = probe.band AND b.bucket = probe.bucket
+            JOIN minhash_signatures s ON s.source = b.source AND s.item_key = b.item_key
+        """, params + [self.source])
+        return {key: array('I', blob) for key, blob in cursor.fetchall()}
+
+    def _best_match(self, signature: array, bands: List[int]) -> Optional[str]:
+        best_key, best_score = None, self.threshold
+        for key, other in self._candidates(bands).items():
+            score = similarity(signature, other)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def find(self, text: str) -> Optional[str]:
+        """Key of an indexed near-duplicate of text, or None."""
+        signature = minhash(text)
+        if signature is None:
+            return None
+        return self._best_match(signature, band_keys(signature))
+
+    def add(self, key: str, text: str) -> Optional[str]:
+        """Index text under key unless it duplicates an earlier article.
+
+        Returns the earlier article's key for a near-duplicate (nothing is
+        stored), else None. Persisted mode writes without committing; the
+        caller commits with the rows it stores.
+        """
+        signature = minhash(text)
+        if signature is None:
+            return None
+
+        bands = band_keys(signature)
+        duplicate = self._best_match(signature, bands)
+        if duplicate is not None:
+            return duplicate
+
+        if self.conn is None:
+            self._signatures[key] = signature
+            for band, bucket in enumerate(bands):
+                self._buckets.setdefault((band, bucket), []).append(key)
+        else:
+            if not self._pruned:
+                self.prune()
+                self._pruned = True
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO minhash_signatures (source, item_key, signature) VALUES (?, ?, ?)",
+                (self.source, key, signature.tobytes())
+            )
+            if cursor.rowcount:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO minhash_buckets (source, band, bucket, item_key) VALUES (?, ?, ?, ?)",
+                    [(self.source, band, bucket, key) for band, bucket in enumerate(bands)]
+                )
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report near-duplicate clusters among stored articles.")
+    parser.add_argument("--table", choices=sorted(TABLE_TEXT), default='worldbank_news',
+                        help="Table to scan (default: worldbank_news).")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        rows = conn.execute(f"SELECT id, date, {TABLE_TEXT[args.table]} FROM {args.table} ORDER BY date, id").fetchall()
+
+        index = NearDuplicateIndex(args.table)
+        clusters: Dict[str, List[tuple]] = {}
+        started = time.perf_counter()
+        for row_id, date, text in rows:
+            original = index.add(str(row_id), text)
+            if original is not None:
+                clusters.setdefault(original, []).append((row_id, date))
+        elapsed = time.perf_counter() - started
+
+        print(f"🧬 Near-duplicates in {args.table}: {len(rows)} rows scanned\n")
+        if clusters:
+            print("| Original ID | Duplicate IDs | Dates |")
+            print("|-------------|---------------|-------|")
+            for original, copies in clusters.items():
+                ids = ', '.join(str(row_id) for row_id, _ in copies)
+                dates = ', '.join(sorted({date for _, date in copies}))
+                print(f"| {original} | {ids} | {dates} |")
+
+        duplicates = sum(len(copies) for copies in clusters.values())
+        print(f"\n✅ {duplicates} near-duplicate row(s) in {len(clusters)} cluster(s)")
+        if rows:
+            print(f"⏱️  {elapsed / len(rows) * 1e6:.0f} µs per article")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
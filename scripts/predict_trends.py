@@ -8,14 +8,17 @@ IMPORTANT: This is for PATTERN ANALYSIS, not date-setting prophecy fulfillment.
 We track trends, not predict "when Jesus returns."
 
 Usage:
-    python predict_trends.py [--weeks 4]
+    python predict_trends.py [--weeks 4] [--workers N]
 """
 
 import sys
 import io
 import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 import warnings
 
 # Force UTF-8 encoding for stdout (Windows compatibility)
@@ -25,6 +28,7 @@ if sys.stdout.encoding != 'utf-8':
 # Try to import numpy first (required)
 try:
     import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
     HAS_NUMPY = True
 except ImportError:
     HAS_NUMPY = False
@@ -45,55 +49,47 @@ except ImportError:
     print("⚠️  TensorFlow not installed. Using simple statistical methods instead.")
     print("   (Optional) Install TensorFlow for ML predictions: pip install tensorflow")
 
+from event_resolution import resolve_events
+from init_database import apply_migrations
+from timeseries import EARTHQUAKE_METRICS, load_weekly_series, week_labels
+from tracing import span
+
 DB_PATH = Path("data/prophecy_tracking.db")
 
+# Prediction intervals: central 80% of bootstrapped forecast paths
+INTERVAL_LEVEL = 0.8
+BOOTSTRAP_RESAMPLES = 5000
+
+# Fixed seeds so repeated runs give the same forecasts and intervals
+RANDOM_SEED = 42
+
+# LSTM input: the last 4 weeks; training needs at least 4 windows
+SEQUENCE_LENGTH = 4
+MIN_WINDOWS = 4
+
+# Stored with each forecast (part of the trends key); bump when a model changes
+MODEL_VERSIONS = {
+    "Low (Simple MA)": 'moving-average-v1',
+    "Low (Insufficient Data)": 'moving-average-v1',
+    "Med (ML-based)": 'lstm-direct-v1',
+}
+
 
 def check_sufficient_data(conn: sqlite3.Connection, min_weeks: int = 4) -> bool:
     """Check if we have enough historical data for predictions."""
-    cursor = conn.cursor()
-    
-    # Check earthquake data span
-    cursor.execute("""
-        SELECT 
-            MIN(date(date_utc)) as first_date,
-            MAX(date(date_utc)) as last_date,
-            COUNT(DISTINCT date(date_utc, 'weekday 0', '-6 days')) as weeks
-        FROM earthquakes
-    """)
-    
-    result = cursor.fetchone()
-    if not result or result[2] < min_weeks:
-        return False, result[2] if result else 0
-    
-    return True, result[2]
+    # Complete calendar weeks from the first earthquake on (quiet weeks included)
+    weeks = len(load_weekly_series(conn, {'total': EARTHQUAKE_METRICS['total']}))
+    return weeks >= min_weeks, weeks
 
 
 def get_earthquake_time_series(conn: sqlite3.Connection) -> tuple:
-    """Get earthquake count time series data."""
-    cursor = conn.cursor()
+    """Get weekly earthquake series (dense: quiet weeks are 0, their avg magnitude NaN)."""
+    series = load_weekly_series(conn, EARTHQUAKE_METRICS)
     
-    cursor.execute("""
-        SELECT 
-            date(date_utc, 'weekday 0', '-6 days') as week_start,
-            COUNT(*) as total_quakes,
-            SUM(CASE WHEN magnitude >= 6.0 THEN 1 ELSE 0 END) as major_quakes,
-            AVG(magnitude) as avg_magnitude
-        FROM earthquakes
-        GROUP BY week_start
-        ORDER BY week_start ASC
-    """)
-    
-    data = cursor.fetchall()
-    
-    if not data:
+    if len(series) == 0:
         return None, None, None, None
     
-    weeks = [row[0] for row in data]
-    total = np.array([row[1] for row in data])
-    major = np.array([row[2] for row in data])
-    avg_mag = np.array([row[3] for row in data])
-    
-    return weeks, total, major, avg_mag
+    return week_labels(series), series['total'], series['major'], series['avg_magnitude']
 
 
 def simple_moving_average(data: np.ndarray, window: int = 3) -> np.ndarray:
@@ -105,46 +101,83 @@ def simple_moving_average(data: np.ndarray, window: int = 3) -> np.ndarray:
     return (cumsum[window:] - cumsum[:-window]) / window
 
 
-def predict_with_ml(data: np.ndarray, forecast_weeks: int = 4) -> tuple:
-    """Use TensorFlow to predict future trends."""
-    if not HAS_TF or len(data) < 8:
-        # Fallback to simple moving average
-        ma = simple_moving_average(data, window=3)
-        last_value = ma[-1] if len(ma) > 0 else data[-1]
-        predictions = np.array([last_value] * forecast_weeks)
-        confidence = "Low (Simple MA)"
-        return predictions, confidence
+def make_windows(data: np.ndarray, sequence_length: int, horizon: int) -> tuple:
+    """Split a series into (inputs, targets) training pairs without copying.
+    
+    Each row of X is `sequence_length` consecutive weeks and the matching row
+    of y is the `horizon` weeks that follow. Both are strided views of `data`
+    (empty when the series is shorter than one window).
+    """
+    if len(data) < sequence_length + horizon:
+        return np.empty((0, sequence_length)), np.empty((0, horizon))
+    windows = sliding_window_view(data, sequence_length + horizon)
+    return windows[:, :sequence_length], windows[:, sequence_length:]
+
+
+def predict_with_moving_average(data: np.ndarray, forecast_weeks: int, window: int = 3) -> tuple:
+    """Flat moving-average forecast plus its historical forecast errors.
+    
+    Residual row j holds the errors of the forecast made from the moving
+    average ending at week j + window - 1 against the weeks that followed it.
+    """
+    ma = simple_moving_average(data, window=window)
+    last_value = ma[-1] if len(ma) > 0 else data[-1]
+    predictions = np.full(forecast_weeks, last_value, dtype=float)
+    
+    if len(data) < window + forecast_weeks:
+        return predictions, np.empty((0, forecast_weeks))
+    
+    targets = sliding_window_view(data[window:], forecast_weeks)
+    residuals = targets - ma[:len(targets), np.newaxis]
+    return predictions, residuals
+
+
+def bootstrap_intervals(predictions: np.ndarray, residuals: np.ndarray,
+                        level: float = INTERVAL_LEVEL, resamples: int = BOOTSTRAP_RESAMPLES,
+                        seed: int = None) -> tuple:
+    """Prediction interval per forecast week via residual bootstrap.
+    
+    Whole residual rows (one past forecast's errors at every horizon) are
+    resampled, so each bootstrap path keeps the week-to-week correlation of
+    real errors. All resamples are drawn and summarised in single array ops.
+    Returns (lower, upper), or (None, None) with too little history.
+    """
+    if len(residuals) < 2:
+        return None, None
+    
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(residuals), size=resamples)
+    paths = predictions + residuals[rows]  # (resamples, forecast_weeks)
+    
+    lower, upper = np.quantile(paths, [(1 - level) / 2, (1 + level) / 2], axis=0)
+    return np.maximum(lower, 0), np.maximum(upper, 0)
+
+
+def fit_lstm(data: np.ndarray, forecast_weeks: int) -> Optional[dict]:
+    """Train the LSTM on a weekly series (None if there are too few windows).
     
-    # Prepare data for LSTM
+    Returns the fitted model with what forecast_lstm needs: normalisation
+    constants and the training windows.
+    """
     # Normalize
     data_mean = np.mean(data)
     data_std = np.std(data) if np.std(data) > 0 else 1.0
     normalized_data = (data - data_mean) / data_std
     
-    # Create sequences (use last 4 weeks to predict next week)
-    sequence_length = min(4, len(data) - 1)
-    X, y = [], []
-    
-    for i in range(len(normalized_data) - sequence_length):
-        X.append(normalized_data[i:i+sequence_length])
-        y.append(normalized_data[i+sequence_length])
+    # Create sequences (last 4 weeks -> all forecast weeks at once)
+    sequence_length = min(SEQUENCE_LENGTH, len(data) - 1)
+    X, y = make_windows(normalized_data, sequence_length, forecast_weeks)
     
-    if len(X) < 4:
-        # Not enough data for ML
-        ma = simple_moving_average(data, window=3)
-        last_value = ma[-1] if len(ma) > 0 else data[-1]
-        predictions = np.array([last_value] * forecast_weeks)
-        confidence = "Low (Insufficient Data)"
-        return predictions, confidence
+    if len(X) < MIN_WINDOWS:
+        return None
     
-    X = np.array(X).reshape(-1, sequence_length, 1)
-    y = np.array(y)
+    X = X[..., np.newaxis]
     
-    # Build simple LSTM model
+    # Build simple LSTM model with a direct multi-horizon output head
     model = keras.Sequential([
         keras.layers.LSTM(16, input_shape=(sequence_length, 1)),
         keras.layers.Dense(8, activation='relu'),
-        keras.layers.Dense(1)
+        keras.layers.Dense(forecast_weeks)
     ])
     
     model.compile(optimizer='adam', loss='mse')
@@ -152,26 +185,102 @@ def predict_with_ml(data: np.ndarray, forecast_weeks: int = 4) -> tuple:
     # Train quietly
     model.fit(X, y, epochs=50, verbose=0, batch_size=2)
     
-    # Predict future weeks
-    predictions = []
-    current_sequence = normalized_data[-sequence_length:].tolist()
-    
-    for _ in range(forecast_weeks):
-        pred_input = np.array(current_sequence[-sequence_length:]).reshape(1, sequence_length, 1)
-        pred_normalized = model.predict(pred_input, verbose=0)[0][0]
-        predictions.append(pred_normalized)
-        current_sequence.append(pred_normalized)
+    return {
+        'model': model,
+        'mean': data_mean,
+        'std': data_std,
+        'X': X,
+        'y': y,
+        'last_window': normalized_data[-sequence_length:].reshape(1, sequence_length, 1)
+    }
+
+
+def forecast_lstm(fitted: dict) -> np.ndarray:
+    """Predict all forecast weeks in one call (no feeding predictions back in)."""
+    predictions = fitted['model'].predict(fitted['last_window'], verbose=0)[0]
     
     # Denormalize
-    predictions = np.array(predictions) * data_std + data_mean
-    predictions = np.maximum(predictions, 0)  # Can't have negative earthquakes
+    predictions = predictions * fitted['std'] + fitted['mean']
+    return np.maximum(predictions, 0)  # Can't have negative earthquakes
+
+
+def predict_with_ml(data: np.ndarray, forecast_weeks: int = 4) -> tuple:
+    """Use TensorFlow to predict future trends.
+    
+    Returns (predictions, confidence label, residuals), where residuals are
+    past forecast errors (rows x forecast_weeks) for bootstrap_intervals.
+    """
+    if not HAS_TF or len(data) < SEQUENCE_LENGTH + forecast_weeks + MIN_WINDOWS - 1:
+        # Fallback to simple moving average
+        predictions, residuals = predict_with_moving_average(data, forecast_weeks)
+        confidence = "Low (Simple MA)"
+        return predictions, confidence, residuals
+    
+    fitted = fit_lstm(data, forecast_weeks)
+    
+    if fitted is None:
+        # Not enough data for ML
+        predictions, residuals = predict_with_moving_average(data, forecast_weeks)
+        confidence = "Low (Insufficient Data)"
+        return predictions, confidence, residuals
+    
+    predictions = forecast_lstm(fitted)
+    
+    # Errors on the training windows, in original units, for the intervals
+    residuals = (fitted['y'] - fitted['model'].predict(fitted['X'], verbose=0)) * fitted['std']
     
     confidence = "Med (ML-based)"
     
-    return predictions, confidence
+    return predictions, confidence, residuals
+
+
+def _init_training_worker(threads: int):
+    """Pin TensorFlow to a share of the cores so parallel fits don't oversubscribe."""
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def forecast_series(task: tuple) -> tuple:
+    """Forecast one series with its prediction intervals (runs in a worker process).
+    
+    Returns (predictions, confidence label, lower, upper).
+    """
+    data, forecast_weeks, seed = task
+    if HAS_TF:
+        keras.utils.set_random_seed(seed)
+    
+    predictions, confidence, residuals = predict_with_ml(data, forecast_weeks)
+    lower, upper = bootstrap_intervals(predictions, residuals, seed=seed)
+    return predictions, confidence, lower, upper
+
+
+def forecast_all(series: Dict[str, np.ndarray], forecast_weeks: int, workers: int = None) -> Dict[str, tuple]:
+    """Forecast every metric, training the models in parallel worker processes.
+    
+    The pool is sized to the available cores (at most one worker per metric)
+    and each worker gets an equal share of TensorFlow threads. Each metric has
+    its own fixed seed, and results come back keyed by metric in input order,
+    whichever model finishes first.
+    """
+    tasks = [(data, forecast_weeks, RANDOM_SEED + i) for i, data in enumerate(series.values())]
+    cores = os.cpu_count() or 1
+    workers = min(workers or cores, len(tasks))
+    
+    if not HAS_TF or workers <= 1:
+        # Moving averages are instant: not worth starting processes
+        results = [forecast_series(task) for task in tasks]
+    else:
+        # spawn: TensorFlow is not fork-safe once initialised
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_training_worker,
+                                 initargs=(max(1, cores // workers),)) as executor:
+            results = list(executor.map(forecast_series, tasks))
+    
+    return dict(zip(series, results))
 
 
-def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
+def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4, workers: int = None):
     """Analyze historical trends and make predictions."""
     print("📊 Analyzing Historical Trends with ML/AI")
     print("="*60)
@@ -189,17 +298,18 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
     print(f"📈 Forecasting next {forecast_weeks} weeks...\n")
     
     # Get earthquake time series
-    weeks, total, major, avg_mag = get_earthquake_time_series(conn)
+    with span('load_weekly_series', 'analysis'):
+        weeks, total, major, avg_mag = get_earthquake_time_series(conn)
     
     if weeks is None:
         print("❌ No earthquake data available.")
         return
     
-    # Predict total earthquakes
-    pred_total, conf_total = predict_with_ml(total, forecast_weeks)
-    
-    # Predict major earthquakes
-    pred_major, conf_major = predict_with_ml(major, forecast_weeks)
+    # Predict total and major earthquakes (models train in parallel)
+    with span('forecast_all', 'forecast', weeks=forecast_weeks):
+        forecasts = forecast_all({'total': total, 'major': major}, forecast_weeks, workers)
+    pred_total, conf_total, lower_total, upper_total = forecasts['total']
+    pred_major, conf_major, lower_major, upper_major = forecasts['major']
     
     # Generate report
     print("🌍 **EARTHQUAKE TREND ANALYSIS**\n")
@@ -208,7 +318,7 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
     print(f"Historical Average (past {len(total)} weeks):")
     print(f"   Total earthquakes/week: {np.mean(total):.1f}")
     print(f"   Major (6.0+) quakes/week: {np.mean(major):.2f}")
-    print(f"   Average magnitude: {np.mean(avg_mag):.2f}")
+    print(f"   Average magnitude: {np.nanmean(avg_mag):.2f}")
     
     # Recent trend (last 4 weeks)
     recent_total = total[-4:] if len(total) >= 4 else total
@@ -222,6 +332,8 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
     # Predictions
     print(f"\n🔮 **FORECAST (Next {forecast_weeks} weeks)**\n")
     print(f"Confidence: {conf_total}")
+    if lower_total is not None:
+        print(f"Ranges: {INTERVAL_LEVEL:.0%} prediction intervals from {BOOTSTRAP_RESAMPLES} bootstrap resamples")
     print()
     
     for i in range(forecast_weeks):
@@ -230,8 +342,10 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
         week_start = pred_date - timedelta(days=pred_date.weekday())
         
         print(f"Week {week_num} ({week_start.strftime('%Y-%m-%d')}):")
-        print(f"   Predicted total: {pred_total[i]:.0f} earthquakes")
-        print(f"   Predicted major: {pred_major[i]:.1f} (6.0+)")
+        total_range = f" (range {lower_total[i]:.0f}–{upper_total[i]:.0f})" if lower_total is not None else ""
+        major_range = f" (range {lower_major[i]:.1f}–{upper_major[i]:.1f})" if lower_major is not None else ""
+        print(f"   Predicted total: {pred_total[i]:.0f} earthquakes{total_range}")
+        print(f"   Predicted major: {pred_major[i]:.1f} (6.0+){major_range}")
         print()
     
     # Important disclaimers
@@ -265,15 +379,27 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
         week_end = (pred_date + timedelta(days=6 - pred_date.weekday())).strftime('%Y-%m-%d')
         
         cursor.execute("""
-            INSERT INTO trends (metric_name, time_period, period_start, period_end, value, comparison_to_previous)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO trends (metric_name, time_period, period_start, period_end, value, comparison_to_previous,
+                                lower_bound, upper_bound, interval_level, model_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (metric_name, period_start, period_end, model_version) DO UPDATE SET
+                value = excluded.value,
+                comparison_to_previous = excluded.comparison_to_previous,
+                lower_bound = excluded.lower_bound,
+                upper_bound = excluded.upper_bound,
+                interval_level = excluded.interval_level,
+                calculated_at = CURRENT_TIMESTAMP
         """, (
             f'predicted_earthquakes_week_{week_num}',
             'week',
             week_start,
             week_end,
             float(pred_total[i]),
-            None
+            None,
+            float(lower_total[i]) if lower_total is not None else None,
+            float(upper_total[i]) if upper_total is not None else None,
+            INTERVAL_LEVEL if lower_total is not None else None,
+            MODEL_VERSIONS[conf_total]
         ))
     
     conn.commit()
@@ -283,13 +409,22 @@ def analyze_trends(conn: sqlite3.Connection, forecast_weeks: int = 4):
 def main():
     """Main execution."""
     forecast_weeks = 4
+    workers = None
     
     if '--weeks' in sys.argv:
         try:
             idx = sys.argv.index('--weeks')
             forecast_weeks = int(sys.argv[idx + 1])
         except (IndexError, ValueError):
-            print("Usage: python predict_trends.py [--weeks 4]")
+            print("Usage: python predict_trends.py [--weeks 4] [--workers N]")
+            sys.exit(1)
+    
+    if '--workers' in sys.argv:
+        try:
+            idx = sys.argv.index('--workers')
+            workers = int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print("Usage: python predict_trends.py [--weeks 4] [--workers N]")
             sys.exit(1)
     
     # Check database
@@ -301,7 +436,12 @@ def main():
     conn = sqlite3.connect(DB_PATH)
     
     try:
-        analyze_trends(conn, forecast_weeks)
+        # Link any reports ingested since the last resolution run
+        apply_migrations(conn)
+        with span('resolve_events', 'ingest'):
+            resolve_events(conn)
+        
+        analyze_trends(conn, forecast_weeks, workers)
     except Exception as e:
         print(f"\n❌ Error during analysis: {e}", file=sys.stderr)
     finally:
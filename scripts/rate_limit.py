@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-Host Rate Limiting
+Shared throttle for every outbound HTTP request, so concurrent fetchers and
+backfills stay under each provider's limits instead of triggering 429 storms.
+
+Each host gets a token bucket (requests per second, with a burst allowance) and
+a cap on simultaneous requests. A 429 or 503 answer pauses the whole host for
+the server's Retry-After (seconds or HTTP date) and the request is retried.
+Limiters are shared by all threads of the process.
+
+When PROPHECY_REPLAY_SERVER is set (e.g. http://127.0.0.1:8765), requests are
+sent to that local replay server instead of the real host (see replay_server.py);
+limits still apply per original host.
+
+Usage:
+    from rate_limit import urlopen
+
+    with urlopen(url, timeout=10) as response:     # Drop-in for urllib.request.urlopen
+        content = response.read().decode('utf-8')
+
+    response = get(url, timeout=10)                  # Same for requests.get
+    response.raise_for_status()
+
+    # Other HTTP clients
+    with throttle(url):
+        response = client.fetch(replay_url(url))
+    if response.status in RETRY_STATUSES:
+        back_off(url, response.headers.get('Retry-After'))    # Then retry
+"""
+
+import os
+import time
+import threading
+import urllib.request
+import urllib.error
+import urllib.parse
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from tracing import span
+
+# Host -> (requests per second, burst, simultaneous requests)
+HOST_LIMITS = {
+    'api.stlouisfed.org': (2.0, 5, 2),           # FRED API: 120 requests/minute per key
+    'earthquake.usgs.gov': (5.0, 10, 4),          # FDSN backfill slices + summary feeds
+    'www.gdacs.org': (1.0, 2, 1),
+    'services.swpc.noaa.gov': (2.0, 4, 2),
+}
+DEFAULT_LIMIT = (2.0, 4, 2)
+
+# Answers that mean "slow down": pause the host for Retry-After, then retry
+RETRY_STATUSES = {429, 503}
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+MAX_RETRY_AFTER_SECONDS = 300.0
+
+# Base URL of a local replay server standing in for every host (unset: live requests)
+REPLAY_SERVER_ENV = 'PROPHECY_REPLAY_SERVER'
+
+
+class HostLimiter:
+    """Token bucket plus concurrency cap for one host (thread-safe)."""
+
+    def __init__(self, rate: float, burst: int, concurrency: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+        # Counters for reports and benchmarks
+        self.requests = 0
+        self.retries = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self):
+        """Block until a token is available and the host is not backing off."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.requests += 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self):
+        """Hold one of the host's concurrent-request slots for one request."""
+        with self.slots:
+            self.acquire()
+            yield
+
+    def back_off(self, seconds: float):
+        """Pause every request to this host for the given number of seconds."""
+        with self.lock:
+            self.retries += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+_limiters: Dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return (urllib.parse.urlsplit(url).hostname or '').lower()
+
+
+def limiter_for(url: str) -> HostLimiter:
+    """The shared limiter for url's host."""
+    host = host_of(url)
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = HostLimiter(*HOST_LIMITS.get(host, DEFAULT_LIMIT))
+        return _limiters[host]
+
+
+def replay_url(url: str) -> str:
+    """url rewritten to the replay server (http://replay/<host>/<path>) when one is configured."""
+    base = os.getenv(REPLAY_SERVER_ENV)
+    if not base:
+        return url
+    parts = urllib.parse.urlsplit(url)
+    return f"{base.rstrip('/')}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+
+
+def retry_after_seconds(value: Optional[str]) -> float:
+    """Seconds to wait from a Retry-After header (delay in seconds or an HTTP date)."""
+    if not value:
+        return DEFAULT_RETRY_AFTER_SECONDS
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER_SECONDS
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+@contextmanager
+def throttle(url: str):
+    """Context manager holding a rate-limited slot for one request to url's host."""
+    with span('http', 'http', host=host_of(url)), limiter_for(url).slot():
+        yield
+
+
+def back_off(url: str, retry_after: Optional[str] = None):
+    """Pause url's host after a 429/503 answer (retry_after: the Retry-After header)."""
+    limiter_for(url).back_off(retry_after_seconds(retry_after))
+
+
+@contextmanager
+def urlopen(request: Union[str, urllib.request.Request], timeout: float = 10):
+    """Rate-limited urllib.request.urlopen; retries 429/503 answers after Retry-After.
+
+    The host's slot is held until the response is closed, so the body is read
+    within the concurrency cap. Other errors are raised as urlopen raises them.
+    """
+    url = request.full_url if isinstance(request, urllib.request.Request) else request
+    limiter = limiter_for(url)
+
+    target = replay_url(url)
+    if target != url:
+        if isinstance(request, urllib.request.Request):
+            request.full_url = target
+        else:
+            request = target
+
+    # Traced from first attempt to response close: waiting, retries and body read included
+    with span('http', 'http', host=host_of(url)):
+        for attempt in range(MAX_RETRIES + 1):
+            with limiter.slot():
+                try:
+                    response = urllib.request.urlopen(request, timeout=timeout)
+                except urllib.error.HTTPError as e:
+                    if e.code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        raise
+                    retry_after = e.headers.get('Retry-After')
+                    e.close()  # Release the connection before waiting
+                    limiter.back_off(retry_after_seconds(retry_after))
+                    continue
+
+                with response:
+                    yield response
+                return
+
+
+def get(url: str, **kwargs):
+    """Rate-limited requests.get; retries 429/503 answers after Retry-After.
+
+    Returns the last response (the caller checks its status, e.g. with
+    raise_for_status()); connection errors are raised as requests raises them.
+    """
+    import requests
+
+    limiter = limiter_for(url)
+    with span('http', 'http', host=host_of(url)):
+        for attempt in range(MAX_RETRIES + 1):
+            with limiter.slot():
+                response = requests.get(replay_url(url), **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            response.close()  # Release the connection before waiting
+            limiter.back_off(retry_after_seconds(response.headers.get('Retry-After')))
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Feed Replay Server
+Serves a fixture corpus of feed responses from a local HTTP stand-in so
+fetchers and benchmarks run offline and repeatably.
+
+data/fixtures/feeds/ is the pinned corpus kept in the repository: a
+manifest.json and a few items of every feed, so everyone benchmarks the same
+input (scale it up with --scale). `record` downloads every known feed (USGS
+summary feeds, GDACS, UN Peacekeeping, FRED news, EFF, NOAA, and World
+Bank/EIN when EINNEWS_RSS_KEY is set) into data/fixtures/recorded/ (not
+committed); pass --fixtures data/fixtures/recorded to use it. API keys in URLs
+are replaced with REDACTED; FRED API series need a key on every request and
+are not recorded.
+
+`serve` answers http://127.0.0.1:<port>/<host>/<path> with the recorded body
+for that host and path (query strings are ignored when no exact recording
+exists, so incremental FDSN queries still find the recorded response). It can
+add latency per response and scale every feed N× with synthetic copies of its
+items: unique ids/links, and RSS news text reworded so the copies are not
+collapsed as near-duplicates. With --rebase, dates in the bodies are moved
+forward by whole days so the corpus looks as fresh as when it was recorded
+(fetchers keep only the past N days).
+
+Point the fetchers at it with PROPHECY_REPLAY_SERVER (read by rate_limit.py):
+
+Usage:
+    python replay_server.py record
+    python replay_server.py serve [--port 8765] [--latency-ms 200] [--scale 100] [--rebase]
+    python replay_server.py --fixtures data/fixtures/recorded serve
+
+    PROPHECY_REPLAY_SERVER=http://127.0.0.1:8765 python scripts/ingest_data.py
+"""
+
+import sys
+import io
+import os
+import re
+import copy
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rate_limit import REPLAY_SERVER_ENV, urlopen
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+FIXTURES_DIR = Path("data/fixtures/feeds")        # Pinned corpus (committed)
+RECORDED_DIR = Path("data/fixtures/recorded")     # Local recordings (ignored)
+MANIFEST_NAME = "manifest.json"
+DEFAULT_PORT = 8765
+
+REDACTED = "REDACTED"
+
+# Share of words replaced in each synthetic copy of a news item (keeps copies
+# well below the near-duplicate threshold)
+REWORD_FRACTION = 0.6
+
+# Elements holding item identity (made unique per copy) and free text (reworded)
+ID_TAGS = {'link', 'guid', 'id', 'eventid'}
+TEXT_TAGS = {'title', 'description', 'summary'}
+
+WORD_PATTERN = re.compile(r'[A-Za-z]+')
+
+# Dates moved by --rebase: RFC 822 ("Sun, 18 Oct 2026 ...") and ISO 8601 ("2026-10-18T..." / "2026-10-18 ...")
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+RFC822_DATE = re.compile(rb'\b(Mon|Tue|Wed|Thu|Fri|Sat|Sun), (\d{1,2}) (' + '|'.join(MONTHS).encode() + rb') (\d{4})\b')
+ISO_DATE = re.compile(rb'\b(\d{4})-(\d{2})-(\d{2})(?=[T ]\d{2}:\d{2})')
+
+
+def feed_urls() -> Dict[str, str]:
+    """Fixture name -> live URL for every feed the fetchers read."""
+    from fetch_earthquakes import FEEDS
+    from fetch_eff_news import EFF_RSS_URL
+    from fetch_fred_news import FRED_NEWS_FEED
+    from fetch_gdacs import GDACS_FEED
+    from fetch_spaceweather import NOAA_ALERTS_URL, NOAA_MAG_URL
+    from fetch_un_peacekeeping import UN_PKO_FEED
+
+    urls = {f"usgs_{name}.atom": url for name, url in FEEDS.items()}
+    urls.update({
+        'gdacs.xml': GDACS_FEED,
+        'un_peacekeeping.xml': UN_PKO_FEED,
+        'fred_news.xml': FRED_NEWS_FEED,
+        'eff_news.xml': EFF_RSS_URL,
+        'noaa_alerts.json': NOAA_ALERTS_URL,
+        'noaa_mag.json': NOAA_MAG_URL,
+    })
+    if os.getenv('EINNEWS_RSS_KEY'):
+        from fetch_worldbank_news import WB_NEWS_FEED
+        urls['worldbank_news.xml'] = WB_NEWS_FEED
+    return urls
+
+
+def redact(url: str) -> str:
+    """url with configured API keys replaced by REDACTED."""
+    for variable in ('EINNEWS_RSS_KEY', 'FRED_API_KEY'):
+        secret = os.getenv(variable)
+        if secret:
+            url = url.replace(secret, REDACTED)
+    return url
+
+
+def record(fixtures_dir: Path = RECORDED_DIR) -> List[Dict]:
+    """Download every feed into fixtures_dir and write the manifest; returns its entries."""
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for name, url in feed_urls().items():
+        try:
+            with urlopen(url, timeout=30) as response:
+                body = response.read()
+                content_type = response.headers.get('Content-Type', 'application/octet-stream')
+        except (urllib.error.URLError, OSError) as e:
+            print(f"   ⚠️  {name}: {e}", file=sys.stderr)
+            continue
+        (fixtures_dir / name).write_bytes(body)
+        entries.append({
+            'file': name,
+            'url': redact(url),
+            'content_type': content_type,
+            'bytes': len(body),
+            'recorded_at': time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime())
+        })
+        print(f"   ✅ {name}: {len(body):,} bytes")
+
+    (fixtures_dir / MANIFEST_NAME).write_text(json.dumps(entries, indent=2), encoding='utf-8')
+    return entries
+
+
+def load_manifest(fixtures_dir: Path = FIXTURES_DIR) -> List[Dict]:
+    path = fixtures_dir / MANIFEST_NAME
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def reword(text: str, vocabulary: List[str], rng: random.Random) -> str:
+    """Replace a share of the words in text with words drawn from vocabulary."""
+    return WORD_PATTERN.sub(
+        lambda m: rng.choice(vocabulary) if rng.random() < REWORD_FRACTION else m.group(0),
+        text
+    )
+
+
+def shift_dates(content: bytes, days: int) -> bytes:
+    """Feed body with every RFC 822 and ISO 8601 date moved `days` days later."""
+    if not days:
+        return content
+
+    def shift_rfc822(match):
+        try:
+            day = date(int(match.group(4)), MONTHS.index(match.group(3).decode()) + 1, int(match.group(2)))
+        except ValueError:
+            return match.group(0)
+        day += timedelta(days=days)
+        return f"{WEEKDAYS[day.weekday()]}, {day.day:02d} {MONTHS[day.month - 1]} {day.year}".encode()
+
+    def shift_iso(match):
+        try:
+            day = date(*(int(part) for part in match.groups()))
+        except ValueError:
+            return match.group(0)
+        return (day + timedelta(days=days)).isoformat().encode()
+
+    return ISO_DATE.sub(shift_iso, RFC822_DATE.sub(shift_rfc822, content))
+
+
+def age_in_days(entry: Dict) -> int:
+    """Whole days since a manifest entry was recorded."""
+    recorded = datetime.strptime(entry['recorded_at'][:10], '%Y-%m-%d').date()
+    return max((datetime.utcnow().date() - recorded).days, 0)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _unique(value: str, copy_number: int) -> str:
+    if value.startswith('http'):
+        return f"{value}{'&' if '?' in value else '?'}copy={copy_number}"
+    return f"{value}-{copy_number}"
+
+
+def scale_xml(content: bytes, factor: int, seed: int = 42) -> bytes:
+    """RSS/Atom feed with factor× the items (copies get unique ids; RSS text is reworded)."""
+    # Keep the original namespace prefixes (the parsers look up elements by URI either way)
+    for prefix, uri in re.findall(rb'xmlns:(\w+)="([^"]+)"', content):
+        ET.register_namespace(prefix.decode(), uri.decode())
+
+    root = ET.fromstring(content)
+    parents = [parent for parent in root.iter()
+               if any(_local(child.tag) in ('item', 'entry') for child in parent)]
+    if not parents:
+        return content
+
+    rng = random.Random(seed)
+    vocabulary = sorted({
+        word.lower()
+        for element in root.iter() if _local(element.tag) in TEXT_TAGS and element.text
+        for word in WORD_PATTERN.findall(element.text)
+    }) or ['report']
+
+    for parent in parents:
+        items = [child for child in parent if _local(child.tag) in ('item', 'entry')]
+        for copy_number in range(1, factor):
+            for item in items:
+                # Atom entries are USGS quakes: their titles carry the magnitude, keep them
+                news = _local(item.tag) == 'item'
+                duplicate = copy.deepcopy(item)
+                for element in duplicate.iter():
+                    tag = _local(element.tag)
+                    if tag in ID_TAGS:
+                        if element.text:
+                            element.text = _unique(element.text.strip(), copy_number)
+                        if element.get('href'):
+                            element.set('href', _unique(element.get('href'), copy_number))
+                    elif news and tag in TEXT_TAGS and element.text:
+                        element.text = reword(element.text, vocabulary, rng)
+                parent.append(duplicate)
+
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def scale_json(content: bytes, factor: int) -> bytes:
+    """FDSN GeoJSON (features get unique ids) or a NOAA row list, factor× as long."""
+    data = json.loads(content)
+    if isinstance(data, dict) and 'features' in data:
+        features = data['features']
+        originals = list(features)
+        for copy_number in range(1, factor):
+            for feature in originals:
+                duplicate = copy.deepcopy(feature)
+                duplicate['id'] = _unique(str(feature.get('id', '')), copy_number)
+                props = duplicate.get('properties') or {}
+                if props.get('url'):
+                    props['url'] = _unique(props['url'], copy_number)
+                features.append(duplicate)
+    elif isinstance(data, list) and data:
+        # NOAA products: optional header row, then records
+        header, rows = (data[:1], data[1:]) if isinstance(data[0], list) else ([], data)
+        data = header + rows * factor
+    return json.dumps(data).encode('utf-8')
+
+
+def scale_feed(content: bytes, factor: int) -> bytes:
+    """Feed body with factor× as many items (XML or JSON)."""
+    if factor <= 1:
+        return content
+    if content.lstrip()[:1] in (b'{', b'['):
+        return scale_json(content, factor)
+    return scale_xml(content, factor)
+
+
+class ReplayStore:
+    """Recorded bodies indexed for lookup by URL, by host + path, then by host."""
+
+    def __init__(self, fixtures_dir: Path = FIXTURES_DIR, scale: int = 1, rebase: bool = False):
+        self.fixtures_dir = fixtures_dir
+        self.scale = scale
+        self.rebase = rebase
+        self.entries = load_manifest(fixtures_dir)
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def find(self, host: str, path: str, query: str) -> Optional[Dict]:
+        """Manifest entry for a request (None if nothing was recorded for the host)."""
+        requested = f"{host}{path}"
+        by_url = by_path = by_host = None
+        for entry in self.entries:
+            parts = urllib.parse.urlsplit(entry['url'])
+            if parts.hostname != host:
+                continue
+            if f"{parts.hostname}{parts.path}" == requested:
+                if parts.query == query:
+                    by_url = entry
+                by_path = by_path or entry
+            elif REDACTED in entry['url']:
+                by_host = by_host or entry
+        return by_url or by_path or by_host
+
+    def body(self, entry: Dict) -> bytes:
+        """Recorded body, scaled (and rebased) once and then kept in memory."""
+        with self._lock:
+            if entry['file'] not in self._bodies:
+                raw = (self.fixtures_dir / entry['file']).read_bytes()
+                if self.rebase:
+                    raw = shift_dates(raw, age_in_days(entry))
+                self._bodies[entry['file']] = scale_feed(raw, self.scale)
+            return self._bodies[entry['file']]
+
+
+def make_server(store: ReplayStore, port: int = DEFAULT_PORT, latency_ms: float = 0) -> ThreadingHTTPServer:
+    """HTTP server answering /<host>/<path> from the store (after latency_ms)."""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            parts = urllib.parse.urlsplit(self.path)
+            host, _, path = parts.path.lstrip('/').partition('/')
+            entry = store.find(host, '/' + path, parts.query)
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            if entry is None:
+                self.send_error(404, f"No recording for {host}/{path}")
+                return
+            body = store.body(entry)
+            self.send_response(200)
+            self.send_header('Content-Type', entry['content_type'])
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), ReplayHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record feeds to fixtures, or replay them from a local server.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('record', help=f"Download every feed into {RECORDED_DIR}/ (or --fixtures).")
+    serve = sub.add_parser('serve', help="Serve the fixture corpus over HTTP.")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT}).")
+    serve.add_argument("--latency-ms", type=float, default=0, help="Delay before each response (default: 0).")
+    serve.add_argument("--scale", type=int, default=1, help="Serve every feed N× larger (default: 1).")
+    serve.add_argument("--rebase", action='store_true', help="Move dates forward to look freshly recorded.")
+    parser.add_argument("--fixtures", type=Path, default=None,
+                        help=f"Fixture directory (default: {FIXTURES_DIR}; record: {RECORDED_DIR}).")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        fixtures = args.fixtures or RECORDED_DIR
+        print(f"📼 Recording feeds into {fixtures}/")
+        entries = record(fixtures)
+        print(f"\n✅ {len(entries)} feed(s) recorded")
+        return
+
+    fixtures = args.fixtures or FIXTURES_DIR
+    store = ReplayStore(fixtures, args.scale, args.rebase)
+    if not store.entries:
+        print(f"❌ No fixtures in {fixtures}. Run: python scripts/replay_server.py record")
+        sys.exit(1)
+
+    server = make_server(store, args.port, args.latency_ms)
+    print(f"▶️  Replaying {len(store.entries)} feed(s) on http://127.0.0.1:{args.port} "
+          f"(latency {args.latency_ms:g} ms, scale {args.scale}×)")
+    print(f"   Use: {REPLAY_SERVER_ENV}=http://127.0.0.1:{args.port} python scripts/ingest_data.py")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Weekly Rollups
+Precomputed per-week counts for each tracked table, so analyses read one row
+per week and bucket instead of re-aggregating every stored row.
+
+`weekly_rollups` holds (source table, week start, category, band) ->
+row count and value sum, e.g. ('events', '2025-12-22', 'Earthquake', 'M6').
+Triggers on the source tables keep it exact on every insert, update and
+delete (ingest, backfills and event resolution alike); nothing has to run
+after ingest.
+
+    totals = rollup_totals(conn, 'conflicts', '2025-12-01')
+    active = sum(row['count'] for row in totals if row['category'] == 'Active Conflict')
+
+rollup_totals() answers any date range exactly: whole weeks come from the
+rollup, partial weeks at either end from the source table.
+
+Usage:
+    python rollups.py [--weeks 8] [--source events]   # Recent weeks per source
+    python rollups.py --verify                        # Compare with the source tables
+    python rollups.py --rebuild                       # Recount from the source tables
+"""
+
+import sys
+import io
+import re
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from baselines import week_expression, week_start
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# Whole magnitudes: 'M4' is 4.0-4.9, 'M9' is 9.0 and above; '' when unknown
+MAGNITUDE_BAND = "'M' || MIN(MAX(CAST({row}magnitude AS INTEGER), 0), 9)"
+MAJOR_BAND = 'M6'
+
+# Source table -> (date column, category, band, summed value); {row} is the
+# NEW./OLD. prefix inside triggers. NULL categories and bands are stored as ''.
+# Migration 11 holds the triggers generated from these as fixed SQL: a change
+# here needs a new migration that drops and recreates the triggers
+# (_trigger_sql) and recounts the table (rebuild_rollups' DELETE + backfill_sql).
+ROLLUP_SOURCES = {
+    'earthquakes': ('date_utc', "'Earthquake'", MAGNITUDE_BAND, '{row}magnitude'),
+    'events': ('date_utc', '{row}event_type', MAGNITUDE_BAND, '{row}magnitude'),
+    'disasters': ('date_utc', '{row}disaster_type', '{row}alert_level', '{row}population_affected'),
+    'conflicts': ('date', '{row}conflict_type', '{row}confidence', '{row}casualties'),
+    'worldbank_news': ('date', '{row}category', '{row}confidence', 'NULL'),
+    'economic_indicators': ('date', '{row}indicator_category', '{row}status', 'NULL'),
+}
+
+
+def rollup_expressions(source: str, row: str = '') -> Dict[str, str]:
+    """SQL expressions for a source row's week, category, band and value."""
+    date_column, category, band, value = ROLLUP_SOURCES[source]
+    return {
+        'week': week_expression(f"{row}{date_column}"),
+        'category': f"COALESCE({category.format(row=row)}, '')",
+        'band': f"COALESCE({band.format(row=row)}, '')",
+        'value': value.format(row=row),
+    }
+
+
+def _trigger_sql(source: str) -> str:
+    """Insert, update and delete triggers keeping one source's rollup rows exact."""
+    date_column, category, band, value = ROLLUP_SOURCES[source]
+    columns = [date_column] + sorted(set(re.findall(r'\{row\}(\w+)', category + band + value)))
+
+    def add(row: str) -> str:
+        e = rollup_expressions(source, row)
+        return f"""
+    INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+    SELECT '{source}', {e['week']}, {e['category']}, {e['band']}, 1, COALESCE({e['value']}, 0)
+    WHERE {e['week']} IS NOT NULL
+    ON CONFLICT (source, week_start, category, band) DO UPDATE SET
+        row_count = row_count + 1,
+        value_sum = value_sum + excluded.value_sum;"""
+
+    def remove(row: str) -> str:
+        e = rollup_expressions(source, row)
+        key = f"source = '{source}' AND week_start = {e['week']} AND category = {e['category']} AND band = {e['band']}"
+        return f"""
+    UPDATE weekly_rollups SET row_count = row_count - 1, value_sum = value_sum - COALESCE({e['value']}, 0)
+    WHERE {key};
+    DELETE FROM weekly_rollups WHERE {key} AND row_count <= 0;"""
+
+    return f"""
+CREATE TRIGGER IF NOT EXISTS {source}_rollup_insert AFTER INSERT ON {source}
+BEGIN{add('NEW.')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS {source}_rollup_update AFTER UPDATE OF {', '.join(columns)} ON {source}
+BEGIN{remove('OLD.')}{add('NEW.')}
+END;
+
+CREATE TRIGGER IF NOT EXISTS {source}_rollup_delete AFTER DELETE ON {source}
+BEGIN{remove('OLD.')}
+END;
+"""
+
+
+def backfill_sql(source: str) -> str:
+    """INSERT ... SELECT recounting one source's rollup rows from its table."""
+    e = rollup_expressions(source)
+    return f"""
+INSERT INTO weekly_rollups (source, week_start, category, band, row_count, value_sum)
+SELECT '{source}', week, category, band, COUNT(*), TOTAL(value)
+FROM (
+    SELECT {e['week']} AS week, {e['category']} AS category, {e['band']} AS band, {e['value']} AS value
+    FROM {source}
+)
+WHERE week IS NOT NULL
+GROUP BY week, category, band;
+"""
+
+
+def rollup_schema_sql() -> str:
+    """Table, triggers and initial backfill from the current definitions.
+
+    Migration 11 is this SQL as it stood when the rollups were added, stored as text.
+    """
+    parts = ["""
+CREATE TABLE IF NOT EXISTS weekly_rollups (
+    source TEXT NOT NULL,
+    week_start TEXT NOT NULL,
+    category TEXT NOT NULL,
+    band TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    value_sum REAL NOT NULL,
+    PRIMARY KEY (source, week_start, category, band)
+) WITHOUT ROWID;
+"""]
+    for source in ROLLUP_SOURCES:
+        parts.append(backfill_sql(source))
+        parts.append(_trigger_sql(source))
+    return ''.join(parts)
+
+
+def _raw_totals(conn: sqlite3.Connection, source: str, start: str, end: Optional[str]) -> List[tuple]:
+    """(category, band, count, value) from the source table for start <= date < end."""
+    if end is not None and start >= end:
+        return []
+    date_column = ROLLUP_SOURCES[source][0]
+    e = rollup_expressions(source)
+    cursor = conn.execute(f"""
+        SELECT {e['category']} AS category, {e['band']} AS band, COUNT(*), TOTAL({e['value']})
+        FROM {source}
+        WHERE {date_column} >= ? AND {date_column} < ?
+        GROUP BY category, band
+    """, (start, end or '9999-12-31'))
+    return cursor.fetchall()
+
+
+def rollup_totals(conn: sqlite3.Connection, source: str, since: str,
+                  until: Optional[str] = None) -> List[Dict]:
+    """Row count and value sum per category and band for since <= date < until (YYYY-MM-DD).
+
+    Returns [{'category', 'band', 'count', 'value'}]; the same numbers a
+    GROUP BY over the source table would give.
+    """
+    since = since[:10]
+    until = until[:10] if until else None
+
+    # Whole weeks in the range: from the first Monday on or after `since`
+    # to the last Monday on or before `until`
+    first_week = week_start(datetime.strptime(since, '%Y-%m-%d'))
+    if first_week < since:
+        first_week = (datetime.strptime(first_week, '%Y-%m-%d') + timedelta(weeks=1)).strftime('%Y-%m-%d')
+    last_week = week_start(datetime.strptime(until, '%Y-%m-%d')) if until else None
+
+    if last_week is not None and first_week >= last_week:
+        parts = [_raw_totals(conn, source, since, until)]
+    else:
+        cursor = conn.execute("""
+            SELECT category, band, SUM(row_count), TOTAL(value_sum)
+            FROM weekly_rollups
+            WHERE source = ? AND week_start >= ? AND week_start < ?
+            GROUP BY category, band
+        """, (source, first_week, last_week or '9999-12-31'))
+        parts = [_raw_totals(conn, source, since, first_week), cursor.fetchall()]
+        if last_week is not None:
+            parts.append(_raw_totals(conn, source, last_week, until))
+
+    totals: Dict[tuple, List] = {}
+    for rows in parts:
+        for category, band, count, value in rows:
+            total = totals.setdefault((category, band), [0, 0.0])
+            total[0] += count
+            total[1] += value
+    return [
+        {'category': category, 'band': band, 'count': count, 'value': value}
+        for (category, band), (count, value) in totals.items()
+    ]
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> int:
+    """Recount every rollup row from the source tables. Returns rows written."""
+    conn.execute("DELETE FROM weekly_rollups")
+    for source in ROLLUP_SOURCES:
+        conn.execute(backfill_sql(source))
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM weekly_rollups").fetchone()[0]
+
+
+def verify_rollups(conn: sqlite3.Connection) -> List[Dict]:
+    """Rollup rows that differ from a fresh count of the source tables."""
+    conn.execute("CREATE TEMP TABLE expected_rollups AS SELECT * FROM weekly_rollups WHERE 0")
+    try:
+        for source in ROLLUP_SOURCES:
+            conn.execute(backfill_sql(source).replace('INSERT INTO weekly_rollups', 'INSERT INTO expected_rollups'))
+        cursor = conn.execute("""
+            SELECT source, week_start, category, band, SUM(stored), SUM(expected)
+            FROM (
+                SELECT source, week_start, category, band, row_count AS stored, 0 AS expected FROM weekly_rollups
+                UNION ALL
+                SELECT source, week_start, category, band, 0, row_count FROM expected_rollups
+            )
+            GROUP BY source, week_start, category, band
+            HAVING SUM(stored) != SUM(expected)
+        """)
+        return [
+            {'source': source, 'week_start': week, 'category': category, 'band': band,
+             'stored': stored, 'expected': expected}
+            for source, week, category, band, stored, expected in cursor.fetchall()
+        ]
+    finally:
+        conn.execute("DROP TABLE expected_rollups")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show, verify or rebuild the weekly rollup tables.")
+    parser.add_argument("--weeks", type=int, default=8, help="Recent weeks to show (default: 8).")
+    parser.add_argument("--source", choices=sorted(ROLLUP_SOURCES), default=None, help="Only one source table.")
+    parser.add_argument("--verify", action="store_true", help="Compare the rollups with the source tables.")
+    parser.add_argument("--rebuild", action="store_true", help="Recount the rollups from the source tables.")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        if args.rebuild:
+            print(f"✅ Rebuilt {rebuild_rollups(conn):,} rollup rows")
+            return
+
+        if args.verify:
+            mismatches = verify_rollups(conn)
+            if not mismatches:
+                print("✅ Rollups match the source tables")
+                return
+            print(f"⚠️  {len(mismatches)} rollup row(s) out of step (fix with --rebuild)\n")
+            print("| Source | Week | Category | Band | Stored | Expected |")
+            print("|--------|------|----------|------|--------|----------|")
+            for row in mismatches[:50]:
+                print(f"| {row['source']} | {row['week_start']} | {row['category']} | {row['band']} | "
+                      f"{row['stored']} | {row['expected']} |")
+            sys.exit(1)
+
+        since = (datetime.strptime(week_start(datetime.utcnow()), '%Y-%m-%d')
+                 - timedelta(weeks=args.weeks - 1)).strftime('%Y-%m-%d')
+        sources = [args.source] if args.source else list(ROLLUP_SOURCES)
+        print(f"📅 Weekly rollups since {since}\n")
+        for source in sources:
+            rows = conn.execute("""
+                SELECT week_start, category, SUM(row_count) FROM weekly_rollups
+                WHERE source = ? AND week_start >= ?
+                GROUP BY week_start, category
+                ORDER BY week_start DESC, category
+            """, (source, since)).fetchall()
+            print(f"### {source}\n")
+            if not rows:
+                print("No rows in this period.\n")
+                continue
+            print("| Week | Category | Rows |")
+            print("|------|----------|------|")
+            for week, category, count in rows:
+                print(f"| {week} | {category or '—'} | {count:,} |")
+            print()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Full-Text Article Search
+Searches stored article text (World Bank news, UN conflict reports, GDACS
+disaster descriptions) through the `articles_fts` FTS5 index, ranked by BM25.
+
+The index is kept in step with its source tables by triggers and stems words
+(porter), so "famine" also finds "famines". FTS5 query syntax is supported:
+    famine OR drought        either word
+    "food crisis"            exact phrase
+    flood*                   prefix
+    title:earthquake         title only
+
+Usage:
+    python search_articles.py "famine OR drought" [--source worldbank_news] [--days 30] [--limit 20]
+"""
+
+import sys
+import io
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+
+# articles_fts rowid = source row id * ROWID_STRIDE + source code (see migration 8)
+ROWID_STRIDE = 8
+SOURCE_CODES = {
+    'worldbank_news': 1,
+    'conflicts': 2,
+    'disasters': 3,
+}
+
+# Title matches count five times as much as body matches
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+# Node J0 famine/poverty reports (used by intensity scoring and baselines)
+FAMINE_QUERY = 'famine OR poverty'
+
+
+def match_condition(source: str, query: str) -> str:
+    """SQL condition selecting rows of a source table whose text matches an FTS query.
+
+    Meant for fixed queries in metric definitions (the query is inlined as a
+    literal); use search() for user input.
+    """
+    literal = query.replace("'", "''")
+    return (
+        f"id IN (SELECT rowid / {ROWID_STRIDE} FROM articles_fts "
+        f"WHERE articles_fts MATCH '{literal}' AND rowid % {ROWID_STRIDE} = {SOURCE_CODES[source]})"
+    )
+
+
+def search(conn: sqlite3.Connection, query: str, source: Optional[str] = None,
+           since: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """Best-matching articles for an FTS5 query, most relevant first.
+
+    Raises sqlite3.OperationalError for malformed queries.
+    """
+    cursor = conn.execute(f"""
+        SELECT rowid, source, date, title,
+               snippet(articles_fts, 1, '**', '**', '…', 12),
+               bm25(articles_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score
+        FROM articles_fts
+        WHERE articles_fts MATCH ?
+          AND (? IS NULL OR source = ?)
+          AND (? IS NULL OR date >= ?)
+        ORDER BY score
+        LIMIT ?
+    """, (query, source, source, since, since, limit))
+
+    return [
+        {
+            'id': rowid // ROWID_STRIDE,
+            'source': row_source,
+            'date': date,
+            'title': title,
+            'snippet': snippet,
+            'score': -score  # bm25() is lower-is-better; report higher-is-better
+        }
+        for rowid, row_source, date, title, snippet, score in cursor.fetchall()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over stored articles (BM25 ranked).")
+    parser.add_argument("query", help="FTS5 query, e.g. 'famine OR drought' or '\"food crisis\"'.")
+    parser.add_argument("--source", choices=sorted(SOURCE_CODES), default=None,
+                        help="Only search one source table.")
+    parser.add_argument("--days", type=int, default=None, help="Only articles from the past N days.")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20).")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        since = (datetime.now() - timedelta(days=args.days)).strftime('%Y-%m-%d') if args.days else None
+
+        try:
+            results = search(conn, args.query, args.source, since, args.limit)
+        except sqlite3.OperationalError as e:
+            print(f"❌ Invalid search query: {e}")
+            sys.exit(1)
+
+        print(f"🔎 {len(results)} result(s) for: {args.query}\n")
+        if not results:
+            return
+
+        print("| Score | Date | Source | Title | Excerpt |")
+        print("|-------|------|--------|-------|---------|")
+        for r in results:
+            excerpt = ' '.join(r['snippet'].split()).replace('|', '/')
+            title = r['title'].replace('|', '/')
+            print(f"| {r['score']:.2f} | {r['date']} | {r['source']} | {title} | {excerpt} |")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
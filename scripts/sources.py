@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Source Registry & Ingest Engine
+Every feed the database ingests is a Source plugin with the same four steps:
+
+    urls(conn, days)                      -> URLs to download
+    parse(conn, url, content, days)       -> normalized item dicts
+    persist(conn, items)                  -> (rows inserted, earliest new date)
+    report(items, days)                   -> markdown for the weekly review
+
+`SOURCES` holds the registered plugins. run_sources() downloads every URL of
+every source concurrently (threads under asyncio, bounded by
+MAX_CONCURRENT_FETCHES), then parses and stores each source in one transaction
+as its downloads finish. All downloads go through fetch_url(), which keeps a
+shared on-disk cache (data/cache/http) and revalidates with ETag/Last-Modified,
+so a feed fetched by one run is not downloaded again minutes later.
+
+Adding a source (e.g. EMSC, ReliefWeb) means writing one Source subclass with
+@register_source; ingest_data.py picks it up automatically.
+
+Usage:
+    from sources import SOURCES, run_sources
+
+    results = asyncio.run(run_sources(conn, SOURCES.values(), days=7))
+
+    python sources.py                      # List registered sources
+    python sources.py --fetch [--days 7]   # Download and parse without storing (timing report)
+"""
+
+import sys
+import io
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import argparse
+import urllib.request
+import urllib.error
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import fetch_earthquakes
+import fetch_eff_news
+import fetch_fred_news
+import fetch_gdacs
+import fetch_un_peacekeeping
+from fetch_earthquakes import parse_earthquakes, parse_fdsn_geojson, parse_stored_date, select_feed
+from fetch_eff_news import EFF_RSS_URL, parse_rss
+from fetch_fred_news import FRED_NEWS_FEED, parse_announcements
+from fetch_gdacs import GDACS_FEED, parse_disasters
+from fetch_un_peacekeeping import UN_PKO_FEED, parse_news as parse_un_news
+from near_duplicates import NearDuplicateIndex
+from rate_limit import urlopen
+from tracing import span, traced
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+CACHE_DIR = Path("data/cache/http")
+
+# Cached responses younger than this are reused without asking the server
+CACHE_TTL_SECONDS = 300
+FETCH_TIMEOUT_SECONDS = 10
+MAX_CONCURRENT_FETCHES = 8
+
+USER_AGENT = "prophecy-tracking/1.0"
+
+
+class FetchError(Exception):
+    """A download failed (network error or HTTP error status)."""
+
+
+def _cache_paths(url: str) -> Tuple[Path, Path]:
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"{digest}.body", CACHE_DIR / f"{digest}.json"
+
+
+@traced('fetch_url', 'fetch')
+def fetch_url(url: str, ttl: float = CACHE_TTL_SECONDS) -> str:
+    """Download url as text through the shared HTTP cache.
+
+    Raises FetchError on network or HTTP errors.
+    """
+    body_path, meta_path = _cache_paths(url)
+    meta = None
+    if body_path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        if time.time() - meta['fetched_at'] < ttl:
+            return body_path.read_text(encoding='utf-8')
+
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    if meta is not None:
+        # Revalidate: the server answers 304 with no body if the feed is unchanged
+        if meta.get('etag'):
+            request.add_header('If-None-Match', meta['etag'])
+        if meta.get('last_modified'):
+            request.add_header('If-Modified-Since', meta['last_modified'])
+
+    try:
+        with urlopen(request, timeout=FETCH_TIMEOUT_SECONDS) as response:
+            content = response.read().decode(response.headers.get_content_charset() or 'utf-8')
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta is not None:
+            meta['fetched_at'] = time.time()
+            meta_path.write_text(json.dumps(meta), encoding='utf-8')
+            return body_path.read_text(encoding='utf-8')
+        raise FetchError(f"HTTP {e.code} for {url}") from e
+    except (urllib.error.URLError, OSError) as e:
+        raise FetchError(f"{e} for {url}") from e
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path.write_text(content, encoding='utf-8')
+    meta_path.write_text(json.dumps({
+        'url': url,
+        'fetched_at': time.time(),
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified')
+    }), encoding='utf-8')
+    return content
+
+
+class Source:
+    """A data source: where to download, how to parse, where to store.
+
+    Subclasses set the metadata attributes and implement urls() and parse();
+    sources with a database table also implement persist().
+    """
+
+    key = ''
+    name = ''
+    node = ''
+    table: Optional[str] = None  # Table persist() writes (None: parse only)
+
+    def enabled(self) -> bool:
+        """False when the source cannot run here (e.g. a missing API key)."""
+        return True
+
+    def urls(self, conn: sqlite3.Connection, days: int) -> List[str]:
+        raise NotImplementedError
+
+    def parse(self, conn: sqlite3.Connection, url: str, content: str, days: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def persist(self, conn: sqlite3.Connection, items: List[Dict]) -> Tuple[int, Optional[str]]:
+        """Store items (without committing); returns (rows inserted, earliest new date)."""
+        return 0, None
+
+    def report(self, items: List[Dict], days: int) -> str:
+        """Markdown for the weekly review (the fetcher script's own tables)."""
+        return f"{len(items)} item(s) in the past {days} days"
+
+
+def _review_tables(module, items: List[Dict]) -> str:
+    """A fetcher module's daily-review table followed by its classification rows."""
+    return f"{module.format_for_daily_review(items)}\n\n{'=' * 80}\n\n{module.format_for_classification_table(items)}"
+
+
+# Registered plugins by key, in registration order
+SOURCES: Dict[str, Source] = {}
+
+
+def register_source(cls):
+    """Class decorator adding a Source subclass to SOURCES."""
+    SOURCES[cls.key] = cls()
+    return cls
+
+
+def _insert_all(conn: sqlite3.Connection, sql: str, rows: Iterable[Tuple[str, tuple]]) -> Tuple[int, Optional[str]]:
+    """Run sql for each (date, params) row; returns (rows inserted, earliest inserted date)."""
+    inserted = 0
+    earliest = None
+    for date, params in rows:
+        if conn.execute(sql, params).rowcount > 0:
+            inserted += 1
+            if earliest is None or date < earliest:
+                earliest = date
+    return inserted, earliest
+
+
+@register_source
+class USGSEarthquakes(Source):
+    key = 'earthquakes'
+    name = 'USGS Earthquakes'
+    node = 'J0'
+    table = 'earthquakes'
+
+    min_magnitude = 4.0
+
+    def window(self, conn: sqlite3.Connection, days: int) -> timedelta:
+        """Time since the newest stored earthquake (incremental), else the requested days."""
+        newest = parse_stored_date(conn.execute("SELECT MAX(date_utc) FROM earthquakes").fetchone()[0])
+        if newest is None:
+            return timedelta(days=days)
+        return max(datetime.utcnow() - newest, timedelta(0))
+
+    def urls(self, conn, days):
+        return select_feed(self.window(conn, days), self.min_magnitude)[1]
+
+    def parse(self, conn, url, content, days):
+        days_back = self.window(conn, days).total_seconds() / 86400
+        if 'fdsnws' in url:
+            return parse_fdsn_geojson(content, self.min_magnitude, days_back)
+        return parse_earthquakes(content, self.min_magnitude, days_back)
+
+    def report(self, items, days):
+        return _review_tables(fetch_earthquakes, items)
+
+    def persist(self, conn, items):
+        def coordinate(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        return _insert_all(conn, """
+            INSERT OR IGNORE INTO earthquakes
+            (event_id, date_utc, magnitude, location, latitude, longitude, source_url, node_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, 'J0')
+        """, (
+            (eq['date'], (
+                eq.get('event_id') or eq['url'].rstrip('/').split('/')[-1],
+                eq['date'],
+                eq['magnitude'],
+                eq['location'],
+                coordinate(eq['latitude']),
+                coordinate(eq['longitude']),
+                eq['url']
+            ))
+            for eq in items
+        ))
+
+
+@register_source
+class GDACSDisasters(Source):
+    key = 'gdacs'
+    name = 'GDACS Multi-Hazard'
+    node = 'J0'
+    table = 'disasters'
+
+    def urls(self, conn, days):
+        return [GDACS_FEED]
+
+    def parse(self, conn, url, content, days):
+        return parse_disasters(content, 'Green', days)
+
+    def report(self, items, days):
+        return _review_tables(fetch_gdacs, items)
+
+    def persist(self, conn, items):
+        return _insert_all(conn, """
+            INSERT OR IGNORE INTO disasters
+            (event_id, date_utc, disaster_type, location, alert_level, severity_description,
+             latitude, longitude, source_url, node_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'J0')
+        """, (
+            (d['date'], (
+                d['event_id'], d['date'], d['type'], d['country'], d['alert_level'],
+                d['severity'], d['latitude'], d['longitude'], d['url']
+            ))
+            for d in items
+        ))
+
+
+@register_source
+class WorldBankNews(Source):
+    key = 'worldbank'
+    name = 'World Bank News'
+    node = 'J0/H0'
+    table = 'worldbank_news'
+
+    def enabled(self):
+        return bool(os.getenv('EINNEWS_RSS_KEY'))
+
+    # fetch_worldbank_news warns about the missing key on import, so it is only
+    # imported once the source is known to be enabled
+    def urls(self, conn, days):
+        from fetch_worldbank_news import WB_NEWS_FEED
+        return [WB_NEWS_FEED]
+
+    def parse(self, conn, url, content, days):
+        from fetch_worldbank_news import parse_news
+        # Persisted index: articles stored by earlier runs count as already seen
+        return parse_news(content, days, NearDuplicateIndex('worldbank_news', conn))
+
+    def report(self, items, days):
+        import fetch_worldbank_news
+        return _review_tables(fetch_worldbank_news, items)
+
+    def persist(self, conn, items):
+        return _insert_all(conn, """
+            INSERT INTO worldbank_news
+            (date, headline, description, category, keywords, confidence, source_url, node_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            (a['date'], (
+                a['date'],
+                a['title'],
+                a['description'],
+                'Economic' if a['nodes'] == ['H0'] else 'Disaster/Famine',
+                ', '.join(a['keywords']),
+                a['confidence'],
+                a['url'],
+                '/'.join(a['nodes'])
+            ))
+            for a in items
+        ))
+
+
+@register_source
+class UNPeacekeeping(Source):
+    key = 'un_peacekeeping'
+    name = 'UN Peacekeeping'
+    node = 'J0'
+    table = 'conflicts'
+
+    def urls(self, conn, days):
+        return [UN_PKO_FEED]
+
+    def parse(self, conn, url, content, days):
+        return parse_un_news(content, days, NearDuplicateIndex('conflicts', conn))
+
+    def report(self, items, days):
+        return _review_tables(fetch_un_peacekeeping, items)
+
+    def persist(self, conn, items):
+        return _insert_all(conn, """
+            INSERT INTO conflicts
+            (date, location, conflict_type, casualties, description, source_url, confidence, node_id)
+            VALUES (?, ?, ?, NULL, ?, ?, ?, 'J0')
+        """, (
+            (a['date'], (a['date'], a['title'], a['category'], a['description'], a['url'], a['confidence']))
+            for a in items
+        ))
+
+
+@register_source
+class FREDNews(Source):
+    key = 'fred_news'
+    name = 'FRED Economic News'
+    node = 'H0'
+
+    def urls(self, conn, days):
+        return [FRED_NEWS_FEED]
+
+    def parse(self, conn, url, content, days):
+        return [a for a in parse_announcements(content, days) if a['relevant']]
+
+    def report(self, items, days):
+        return fetch_fred_news.format_for_daily_review(items)
+
+
+@register_source
+class EFFNews(Source):
+    key = 'eff_news'
+    name = 'EFF Digital Rights'
+    node = 'B2'
+
+    def urls(self, conn, days):
+        return [EFF_RSS_URL]
+
+    def parse(self, conn, url, content, days):
+        return parse_rss(content, days)
+
+    def report(self, items, days):
+        if not items:
+            return f"No B2-relevant articles in the past {days} days."
+        return (f"{fetch_eff_news.format_for_daily_review(items, days)}\n\n{'=' * 80}\n\n"
+                f"{fetch_eff_news.format_for_classification_table(items)}")
+
+
+async def run_sources(conn: sqlite3.Connection, sources: Iterable[Source], days: int = 7,
+                      store: bool = True, concurrency: int = MAX_CONCURRENT_FETCHES) -> Dict[str, Dict]:
+    """Fetch, parse and (if store) persist sources concurrently.
+
+    Downloads run in threads; parsing and database writes stay on the calling
+    thread, one transaction per source. Each result holds the counts, the
+    parsed items ('parsed') and timings. A failing source is reported in its
+    result ('error') without stopping the others.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def download(url: str) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(fetch_url, url)
+
+    async def run(source: Source) -> Dict:
+        started = time.perf_counter()
+        result = {'items': 0, 'parsed': [], 'inserted': 0, 'earliest': None, 'error': None}
+        try:
+            urls = source.urls(conn, days)
+            contents = await asyncio.gather(*(download(url) for url in urls))
+            fetched = time.perf_counter()
+
+            # Fetches overlap on the event loop; parse and persist run one source at a time
+            with span(f"ingest:{source.key}", 'ingest'):
+                items = []
+                for url, content in zip(urls, contents):
+                    items.extend(source.parse(conn, url, content, days))
+                result['items'] = len(items)
+                result['parsed'] = items
+
+                if store:
+                    result['inserted'], result['earliest'] = source.persist(conn, items)
+                    conn.commit()
+                else:
+                    conn.rollback()  # Discard near-duplicate index entries written while parsing
+
+            result['fetch_seconds'] = fetched - started
+        except Exception as e:  # One broken feed must not stop the rest
+            conn.rollback()
+            result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    sources = [source for source in sources if source.enabled()]
+    results = await asyncio.gather(*(run(source) for source in sources))
+    return dict(zip((source.key for source in sources), results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List registered sources, or fetch them without storing.")
+    parser.add_argument("--fetch", action='store_true', help="Download and parse every enabled source.")
+    parser.add_argument("--days", type=int, default=7, help="Days of history to request (default: 7).")
+    args = parser.parse_args()
+
+    if not args.fetch:
+        print("| Source | Name | Node | Table | Enabled |")
+        print("|--------|------|------|-------|---------|")
+        for source in SOURCES.values():
+            print(f"| {source.key} | {source.name} | {source.node} | {source.table or '—'} | "
+                  f"{'✅' if source.enabled() else '❌'} |")
+        return
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        print(f"📡 Fetching {len(SOURCES)} sources (past {args.days} days, not stored)...\n")
+        started = time.perf_counter()
+        results = asyncio.run(run_sources(conn, SOURCES.values(), args.days, store=False))
+        elapsed = time.perf_counter() - started
+
+        print("| Source | Items | Time (s) | Status |")
+        print("|--------|-------|----------|--------|")
+        for key, r in results.items():
+            status = f"❌ {r['error']}" if r['error'] else '✅'
+            print(f"| {key} | {r['items']} | {r['seconds']:.2f} | {status} |")
+        print(f"\n⏱️  Total wall time: {elapsed:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Text Cleaning
+HTML tag stripping, entity decoding and whitespace normalization for feed text.
+
+The tag regex is compiled once at import; entities are decoded with html.unescape,
+so named (&hellip;, &rsquo;), decimal (&#8230;) and hex (&#x2019;) forms are all handled.
+
+Usage:
+    from text_cleaning import clean_html
+
+    description = clean_html(desc_elem.text)
+"""
+
+import re
+import html
+
+TAG_RE = re.compile(r'<[^>]*>')
+
+
+def clean_html(text: str) -> str:
+    """Remove HTML tags, decode entities and collapse whitespace."""
+    if not text:
+        return ""
+    # Remove HTML tags (skip the regex when there are none)
+    if '<' in text:
+        text = TAG_RE.sub('', text)
+    # Decode HTML entities
+    if '&' in text:
+        text = html.unescape(text)
+    # Normalize whitespace: str.split() covers all Unicode whitespace (incl. the
+    # U+00A0 that &nbsp; decodes to) and is much faster than re.sub(r'\s+', ...)
+    return ' '.join(text.split())
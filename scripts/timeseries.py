@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Weekly Time-Series Loader
+Loads several weekly metrics at once into one dense NumPy structured array,
+indexed by a gap-free calendar of week starts (Mondays).
+
+Weeks with no rows are real observations (zero quakes that week), so they are
+filled rather than dropped: counts and sums become 0, averages become NaN.
+Metrics that share a table and filter are computed in a single GROUP BY pass,
+and rows go straight into NumPy via np.fromiter.
+
+Usage:
+    from timeseries import EARTHQUAKE_METRICS, load_weekly_series
+
+    series = load_weekly_series(conn, EARTHQUAKE_METRICS)
+    series['week_start'], series['total'], series['major']
+"""
+
+import math
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from baselines import week_expression, week_start
+from rollups import MAJOR_BAND
+
+# Weekly metrics: name -> (table, date column, filter, SQL aggregate).
+# Earthquake metrics read the weekly rollups (one row per week and magnitude
+# band) rather than every event; see rollups.py.
+EARTHQUAKES = "source = 'events' AND category = 'Earthquake'"
+EARTHQUAKE_METRICS = {
+    'total': ('weekly_rollups', 'week_start', EARTHQUAKES, 'SUM(row_count)'),
+    'major': ('weekly_rollups', 'week_start', EARTHQUAKES,
+              f"SUM(CASE WHEN band >= '{MAJOR_BAND}' THEN row_count ELSE 0 END)"),
+    'avg_magnitude': ('weekly_rollups', 'week_start', EARTHQUAKES,
+                      "TOTAL(value_sum) / SUM(CASE WHEN band != '' THEN row_count END)"),
+}
+
+ONE_WEEK = np.timedelta64(7, 'D')
+
+
+def fill_value(aggregate: str) -> float:
+    """Value for a week with no rows: 0 for counts and sums, NaN for averages and ratios."""
+    if '/' in aggregate:
+        return math.nan
+    return 0.0 if aggregate.upper().startswith(('COUNT', 'SUM', 'TOTAL')) else math.nan
+
+
+def weekly_calendar(start: str, end: str) -> np.ndarray:
+    """Every week start from start to end inclusive (both Mondays, YYYY-MM-DD)."""
+    return np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + ONE_WEEK, ONE_WEEK)
+
+
+def _query_group(conn: sqlite3.Connection, table: str, date_column: str, condition: str,
+                 metrics: Dict[str, str], since: Optional[str]) -> np.ndarray:
+    """Run one GROUP BY for metrics sharing a table and filter; returns a structured array."""
+    week_expr = week_expression(date_column)
+    aggregates = ', '.join(metrics.values())
+    cursor = conn.execute(f"""
+        SELECT {week_expr} AS week, {aggregates}
+        FROM {table}
+        WHERE ({condition}) AND {date_column} >= ?
+        GROUP BY week
+        HAVING week IS NOT NULL
+        ORDER BY week
+    """, (since or '0000-00-00',))
+
+    dtype = [('week_start', 'datetime64[D]')] + [(name, 'f8') for name in metrics]
+    rows = (
+        (row[0], *(math.nan if value is None else value for value in row[1:]))
+        for row in cursor
+    )
+    return np.fromiter(rows, dtype=dtype)
+
+
+def load_weekly_series(conn: sqlite3.Connection, metrics: Dict[str, Tuple[str, str, str, str]],
+                       start: Optional[str] = None, end: Optional[str] = None,
+                       complete_only: bool = True) -> np.ndarray:
+    """Load weekly metrics into a dense, gap-filled structured array.
+
+    The calendar runs from `start` (default: first week with data) to `end`
+    (default: last week with data). With complete_only, the current
+    in-progress week is dropped so it doesn't look like a quiet week.
+    Returns an array with a 'week_start' field plus one float field per metric.
+    """
+    since = week_start(datetime.strptime(start[:10], '%Y-%m-%d')) if start else None
+
+    # Metrics over the same rows share one query
+    groups: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+    for name, (table, date_column, condition, aggregate) in metrics.items():
+        groups.setdefault((table, date_column, condition), {})[name] = aggregate
+
+    observed = [
+        _query_group(conn, table, date_column, condition, group_metrics, since)
+        for (table, date_column, condition), group_metrics in groups.items()
+    ]
+
+    first = since or min((str(part['week_start'][0]) for part in observed if len(part)), default=None)
+    last = end and week_start(datetime.strptime(end[:10], '%Y-%m-%d'))
+    last = last or max((str(part['week_start'][-1]) for part in observed if len(part)), default=None)
+
+    dtype = [('week_start', 'datetime64[D]')] + [(name, 'f8') for name in metrics]
+    if first is None or last is None or last < first:
+        return np.zeros(0, dtype=dtype)
+
+    if complete_only:
+        current = week_start(datetime.utcnow())
+        if last >= current:
+            last = (datetime.strptime(current, '%Y-%m-%d') - timedelta(weeks=1)).strftime('%Y-%m-%d')
+            if last < first:
+                return np.zeros(0, dtype=dtype)
+
+    calendar = weekly_calendar(first, last)
+    series = np.zeros(len(calendar), dtype=dtype)
+    series['week_start'] = calendar
+
+    for name, (_, _, _, aggregate) in metrics.items():
+        series[name] = fill_value(aggregate)
+
+    # Scatter each group's observed weeks into the calendar in one step
+    for part in observed:
+        in_range = (part['week_start'] >= calendar[0]) & (part['week_start'] <= calendar[-1])
+        part = part[in_range]
+        index = ((part['week_start'] - calendar[0]) // ONE_WEEK).astype(np.int64)
+        for name in part.dtype.names[1:]:
+            series[name][index] = part[name]
+
+    return series
+
+
+def week_labels(series: np.ndarray) -> list:
+    """Week starts of a loaded series as 'YYYY-MM-DD' strings."""
+    return np.datetime_as_string(series['week_start'], unit='D').tolist()
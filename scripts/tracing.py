@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline Tracing
+Lightweight timing spans across fetchers, ingest, analysis, forecasting and
+newsletter generation.
+
+    with span('parse', source='gdacs'):
+        ...
+
+    @traced('parse')
+    def parse_disasters(...):
+        ...
+
+Spans are timed with the monotonic perf counter and kept in memory (a list
+append per span). Scripts started by weekly_update.py (or anything run with
+PROPHECY_TRACE_DIR set) write their spans to that directory when they exit, so
+the parent collects one trace for the whole run. finish_run() then:
+
+    - prints a per-stage timing report (calls, total, max, share of the run)
+    - writes a Chrome trace JSON (chrome://tracing, Perfetto) to data/traces/
+    - stores per-stage durations in `pipeline_timings` for regression tracking
+
+Usage:
+    python tracing.py [--run weekly_update] [--runs 10]   # Latest run vs recent history
+"""
+
+import sys
+import io
+import os
+import json
+import time
+import atexit
+import sqlite3
+import argparse
+import threading
+import statistics
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Force UTF-8 encoding for stdout (Windows compatibility)
+if sys.stdout.encoding != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+DB_PATH = Path("data/prophecy_tracking.db")
+TRACES_DIR = Path("data/traces")
+
+# Directory where child processes leave their spans (set by the parent run)
+TRACE_DIR_ENV = 'PROPHECY_TRACE_DIR'
+
+# A stage is flagged when it is this much slower than its recent median...
+REGRESSION_THRESHOLD = 0.25
+# ...and slower by at least this many seconds (ignores noise in tiny stages)
+REGRESSION_MIN_SECONDS = 0.1
+
+# perf_counter is monotonic but has no fixed origin; shift it onto the epoch so
+# spans from different processes line up in one trace
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+_PROCESS_START_NS = time.perf_counter_ns()
+
+_events: List[Dict] = []
+_events_lock = threading.Lock()
+
+
+def _record(name: str, category: str, start_ns: int, end_ns: int, args: Dict):
+    event = {
+        'name': name,
+        'cat': category,
+        'ph': 'X',
+        'ts': (start_ns + _EPOCH_OFFSET_NS) / 1000,  # Trace format uses microseconds
+        'dur': (end_ns - start_ns) / 1000,
+        'pid': os.getpid(),
+        'tid': threading.get_native_id(),
+    }
+    if args:
+        event['args'] = {key: str(value) for key, value in args.items()}
+    with _events_lock:
+        _events.append(event)
+
+
+@contextmanager
+def span(name: str, category: str = 'stage', **args):
+    """Time the enclosed block as one span (recorded even if it raises)."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _record(name, category, start, time.perf_counter_ns(), args)
+
+
+def traced(name: Optional[str] = None, category: str = 'stage'):
+    """Decorator timing every call of a function as a span."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _process_name() -> str:
+    return Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else 'python'
+
+
+def _process_events() -> List[Dict]:
+    """This process's spans plus a whole-process span and a name for trace viewers."""
+    with _events_lock:
+        events = list(_events)
+    name = _process_name()
+    pid = os.getpid()
+    events.append({
+        'name': name, 'cat': 'process', 'ph': 'X', 'pid': pid, 'tid': threading.get_native_id(),
+        'ts': (_PROCESS_START_NS + _EPOCH_OFFSET_NS) / 1000,
+        'dur': (time.perf_counter_ns() - _PROCESS_START_NS) / 1000,
+    })
+    events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': name}})
+    return events
+
+
+def _write_child_trace():
+    trace_dir = Path(os.environ[TRACE_DIR_ENV])
+    if trace_dir.is_dir():
+        (trace_dir / f"{os.getpid()}.json").write_text(json.dumps(_process_events()), encoding='utf-8')
+
+
+if os.getenv(TRACE_DIR_ENV):
+    atexit.register(_write_child_trace)
+
+
+def collect_events(child_dir: Optional[Path] = None) -> List[Dict]:
+    """This process's spans plus those left in child_dir by child processes."""
+    events = _process_events()
+    if child_dir is not None:
+        for path in sorted(Path(child_dir).glob('*.json')):
+            if path.stem != str(os.getpid()):
+                events.extend(json.loads(path.read_text(encoding='utf-8')))
+    return events
+
+
+def stage_timings(events: List[Dict]) -> Dict[str, Dict]:
+    """Calls, total and max seconds per span name, plus this process as 'total'.
+
+    Child process spans only start once tracing is imported (after interpreter
+    start-up and heavy imports); the parent's span around each child is the
+    real cost, so child process spans stay in the trace but not in the report.
+    """
+    stages: Dict[str, Dict] = {}
+    for event in events:
+        if event['ph'] != 'X':
+            continue
+        if event['cat'] == 'process':
+            if event['pid'] != os.getpid():
+                continue
+            key = 'total'
+        else:
+            key = event['name']
+        stage = stages.setdefault(key, {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        seconds = event['dur'] / 1e6
+        stage['calls'] += 1
+        stage['total_seconds'] += seconds
+        stage['max_seconds'] = max(stage['max_seconds'], seconds)
+    return stages
+
+
+def format_report(stages: Dict[str, Dict], wall_seconds: float) -> str:
+    """Markdown table of stages, slowest first."""
+    lines = [
+        "| Stage | Calls | Total (s) | Max (s) | Share of Run |",
+        "|-------|-------|-----------|---------|--------------|",
+    ]
+    for name, stage in sorted(stages.items(), key=lambda item: item[1]['total_seconds'], reverse=True):
+        share = stage['total_seconds'] / wall_seconds if wall_seconds else 0
+        lines.append(f"| {name} | {stage['calls']} | {stage['total_seconds']:.2f} | "
+                     f"{stage['max_seconds']:.2f} | {share:.0%} |")
+    return '\n'.join(lines)
+
+
+def write_trace(events: List[Dict], path: Path) -> Path:
+    """Chrome trace JSON (open in chrome://tracing or ui.perfetto.dev)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}), encoding='utf-8')
+    return path
+
+
+def store_timings(conn: sqlite3.Connection, run_id: str, run_name: str, stages: Dict[str, Dict]):
+    """Persist per-stage durations for this run."""
+    conn.executemany("""
+        INSERT OR REPLACE INTO pipeline_timings (run_id, run_name, stage, calls, total_seconds, max_seconds)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [
+        (run_id, run_name, name, stage['calls'], stage['total_seconds'], stage['max_seconds'])
+        for name, stage in stages.items()
+    ])
+    conn.commit()
+
+
+def finish_run(run_name: str, child_dir: Optional[Path] = None, db_path: Path = DB_PATH) -> Dict[str, Dict]:
+    """Report, save and store the timings of the run that is ending in this process."""
+    events = collect_events(child_dir)
+    stages = stage_timings(events)
+    wall_seconds = (time.perf_counter_ns() - _PROCESS_START_NS) / 1e9
+    run_id = datetime.now().strftime('%Y-%m-%d_%H%M%S')
+
+    print("="*80)
+    print(f"TIMING REPORT — {run_name} ({wall_seconds:.1f}s)")
+    print("="*80)
+    print()
+    print(format_report(stages, wall_seconds))
+    print()
+
+    trace_path = write_trace(events, TRACES_DIR / f"{run_id}_{run_name}.json")
+    print(f"🧭 Trace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    if db_path.exists():
+        conn = sqlite3.connect(db_path)
+        try:
+            from init_database import apply_migrations
+            apply_migrations(conn)
+            store_timings(conn, run_id, run_name, stages)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not store timings: {e}", file=sys.stderr)
+        finally:
+            conn.close()
+
+    return stages
+
+
+def compare_runs(conn: sqlite3.Connection, run_name: str, runs: int) -> List[Dict]:
+    """Latest run's stages against the median of the previous runs."""
+    run_ids = [row[0] for row in conn.execute("""
+        SELECT DISTINCT run_id FROM pipeline_timings
+        WHERE run_name = ?
+        ORDER BY run_id DESC
+        LIMIT ?
+    """, (run_name, runs + 1))]
+    if not run_ids:
+        return []
+
+    latest = run_ids[0]
+    previous: Dict[str, List[float]] = {}
+    current: Dict[str, float] = {}
+    placeholders = ', '.join('?' for _ in run_ids)
+    for run_id, stage, seconds in conn.execute(f"""
+        SELECT run_id, stage, total_seconds FROM pipeline_timings
+        WHERE run_name = ? AND run_id IN ({placeholders})
+    """, (run_name, *run_ids)):
+        if run_id == latest:
+            current[stage] = seconds
+        else:
+            previous.setdefault(stage, []).append(seconds)
+
+    report = []
+    for stage, seconds in sorted(current.items(), key=lambda item: item[1], reverse=True):
+        median = statistics.median(previous[stage]) if stage in previous else None
+        regressed = (
+            median is not None
+            and seconds > median * (1 + REGRESSION_THRESHOLD)
+            and seconds - median >= REGRESSION_MIN_SECONDS
+        )
+        report.append({'stage': stage, 'latest': seconds, 'median': median,
+                       'runs': len(previous.get(stage, [])), 'regressed': regressed})
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the latest traced run with recent history.")
+    parser.add_argument("--run", default='weekly_update', help="Run name (default: weekly_update).")
+    parser.add_argument("--runs", type=int, default=10, help="Previous runs to compare against (default: 10).")
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print("❌ Database not found. Run: python scripts/init_database.py")
+        sys.exit(1)
+
+    conn = sqlite3.connect(DB_PATH)
+
+    try:
+        from init_database import apply_migrations
+        apply_migrations(conn)
+
+        report = compare_runs(conn, args.run, args.runs)
+        if not report:
+            print(f"ℹ️  No timings stored for {args.run} yet. Run: python scripts/weekly_update.py")
+            return
+
+        print(f"⏱️  {args.run}: latest run vs median of up to {args.runs} previous runs\n")
+        print("| Stage | Latest (s) | Median (s) | Runs | Change |")
+        print("|-------|------------|------------|------|--------|")
+        for row in report:
+            if row['median'] is None:
+                print(f"| {row['stage']} | {row['latest']:.2f} | — | 0 | new |")
+                continue
+            change = (row['latest'] - row['median']) / row['median'] if row['median'] else 0
+            flag = ' ⚠️' if row['regressed'] else ''
+            print(f"| {row['stage']} | {row['latest']:.2f} | {row['median']:.2f} | {row['runs']} | {change:+.0%}{flag} |")
+
+        regressions = [row['stage'] for row in report if row['regressed']]
+        if regressions:
+            print(f"\n⚠️  Slower than usual (>{REGRESSION_THRESHOLD:.0%}): {', '.join(regressions)}")
+        else:
+            print("\n✅ No stage regressions")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
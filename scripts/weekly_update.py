@@ -8,17 +8,28 @@ Usage:
     python weekly_update.py [--days 7]
     
 Output:
-    - Runs all 5 automation scripts
+    - Fetches every source at once: registered feeds (sources.py) in-process
+      and concurrently, the other fetch scripts as parallel subprocesses
     - Generates tracking/weekly-reviews/YYYY-MM-DD.md with compiled results
     - Shows summary statistics
+    - Prints a per-stage timing report and saves a trace to data/traces/
 """
 
 import sys
 import io
+import os
+import asyncio
+import sqlite3
+import tempfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from init_database import apply_migrations
+from sources import MAX_CONCURRENT_FETCHES, SOURCES, run_sources
+from tracing import TRACE_DIR_ENV, finish_run, span
+
 # Force UTF-8 encoding for stdout (Windows compatibility)
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -87,13 +98,14 @@ def run_script(script_key: str, days: int = 7) -> dict:
     print(f"Running {script_info['name']}...", flush=True)
     
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path), '--days', str(days)],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            timeout=30
-        )
+        with span(f"fetch:{script_key}", 'fetch'):
+            result = subprocess.run(
+                [sys.executable, str(script_path), '--days', str(days)],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                timeout=30
+            )
         
         return {
             'success': result.returncode == 0,
@@ -123,6 +135,69 @@ def run_script(script_key: str, days: int = 7) -> dict:
         }
 
 
+def source_result(key: str, result: dict, days: int) -> dict:
+    """A run_sources result in run_script's shape, with the fetcher's tables as output."""
+    script_info = SCRIPTS[key]
+    entry = {
+        'success': False,
+        'output': '',
+        'error': '',
+        'name': script_info['name'],
+        'node': script_info['node'],
+        'scripture': script_info['scripture']
+    }
+    if result is None:
+        entry['error'] = 'Source disabled (missing API key)'
+    elif result['error']:
+        entry['error'] = result['error']
+    else:
+        entry['success'] = True
+        entry['output'] = SOURCES[key].report(result['parsed'], days)
+    return entry
+
+
+def fetch_all(days: int = 7) -> dict:
+    """Run the whole fetch phase concurrently; returns results keyed and ordered like SCRIPTS.
+
+    Registered sources are downloaded together through sources.run_sources
+    (nothing is stored); scripts without a source plugin run as subprocesses
+    at the same time.
+    """
+    sources = [source for key, source in SOURCES.items() if key in SCRIPTS]
+    scripts = [key for key in SCRIPTS if key not in SOURCES]
+
+    # Empty in-memory database: the review lists what the feeds report for the
+    # period, not only what is newer than the stored rows
+    conn = sqlite3.connect(':memory:')
+    apply_migrations(conn)
+
+    async def gather():
+        # Room for every download plus the subprocess waits
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES + len(scripts)))
+        return await asyncio.gather(
+            run_sources(conn, sources, days, store=False),
+            *(asyncio.to_thread(run_script, key, days) for key in scripts)
+        )
+
+    print(f"Fetching {len(sources)} feeds and running {len(scripts)} scripts concurrently...", flush=True)
+    try:
+        with span('fetch_all', 'fetch'):
+            source_results, *script_results = asyncio.run(gather())
+    finally:
+        conn.close()
+
+    results = dict(zip(scripts, script_results))
+    for source in sources:
+        result = source_results.get(source.key)
+        results[source.key] = source_result(source.key, result, days)
+        if result is not None and not result['error']:
+            print(f"   ✅ {source.name}: {result['items']} item(s) in {result['seconds']:.1f}s")
+        else:
+            print(f"   ❌ {source.name}: {results[source.key]['error']}")
+    return {key: results[key] for key in SCRIPTS}
+
+
 def compile_weekly_review(results: dict, days: int) -> str:
     """Compile all results into a weekly review markdown."""
     today = datetime.now().strftime('%Y-%m-%d')
@@ -220,11 +295,13 @@ def main():
     print("="*80)
     print()
     
-    # Run all scripts
-    results = {}
-    for key in SCRIPTS.keys():
-        results[key] = run_script(key, days)
-        print()  # Blank line between scripts
+    # Child scripts leave their timing spans here for the run's trace
+    trace_dir = tempfile.TemporaryDirectory()
+    os.environ[TRACE_DIR_ENV] = trace_dir.name
+    
+    # Fetch every source at once
+    results = fetch_all(days)
+    print()
     
     print("="*80)
     print("COMPILATION COMPLETE")
@@ -233,7 +310,8 @@ def main():
     
     # Compile results
     print("Generating weekly review markdown...")
-    review_content = compile_weekly_review(results, days)
+    with span('compile_weekly_review'):
+        review_content = compile_weekly_review(results, days)
     
     # Save to file
     try:
@@ -266,12 +344,13 @@ def main():
         weeks = max(1, days // 7)  # Convert days to weeks (min 1)
         
         try:
-            result = subprocess.run(
-                [sys.executable, str(fig_tree_script), '--weeks', str(weeks)],
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
+            with span('fig_tree_analysis', 'analysis'):
+                result = subprocess.run(
+                    [sys.executable, str(fig_tree_script), '--weeks', str(weeks)],
+                    text=True,
+                    encoding='utf-8',
+                    timeout=30
+                )
             print()
             print("✅ Fig tree pattern analysis complete!")
         except Exception as e:
@@ -288,12 +367,13 @@ def main():
         newsletter_script = SCRIPTS_DIR / 'generate_newsletter.py'
         
         try:
-            result = subprocess.run(
-                [sys.executable, str(newsletter_script), '--days', str(days)],
-                text=True,
-                encoding='utf-8',
-                timeout=30
-            )
+            with span('newsletter', 'newsletter'):
+                result = subprocess.run(
+                    [sys.executable, str(newsletter_script), '--days', str(days)],
+                    text=True,
+                    encoding='utf-8',
+                    timeout=30
+                )
             print()
             print("✅ Newsletter generation complete!")
             print()
@@ -301,6 +381,30 @@ def main():
         except Exception as e:
             print(f"⚠️  Newsletter generation failed: {e}")
         
+        # Snapshot the database now that this week's data is in
+        print()
+        print("="*80)
+        print("BACKING UP DATABASE")
+        print("="*80)
+        print()
+        
+        backup_script = SCRIPTS_DIR / 'backup_database.py'
+        
+        try:
+            with span('backup', 'backup'):
+                subprocess.run(
+                    [sys.executable, str(backup_script)],
+                    text=True,
+                    encoding='utf-8',
+                    timeout=600
+                )
+        except Exception as e:
+            print(f"⚠️  Database backup failed: {e}")
+        
+        print()
+        finish_run('weekly_update', Path(trace_dir.name))
+        trace_dir.cleanup()
+        
     except Exception as e:
         print(f"❌ Error saving weekly review: {e}", file=sys.stderr)
         sys.exit(1)